@@ -0,0 +1,151 @@
+"""
+Concurrency benchmark for the SQLite engine settings.
+
+Starts several reader processes and a writer process (POST race guesses) against a copy of a database,
+once with SQLite's defaults (rollback journal, no read-only pool) and once with the configured settings (WAL, pragmas, read-only pool).
+Readers repeatedly read the tables a worker loads after a write (inside a GET request, so through the read-only pool),
+without building domain objects or rendering pages, so the results aren't dominated by Python.
+
+Usage: python benchmarks/sqlite_concurrency.py [--database instance/formula10.db] [--readers 4] [--seconds 10]
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+from urllib.parse import quote
+
+ROOT: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+READ_TABLES: List[str] = ["user", "race", "driver", "team", "raceguess", "raceresult", "raceresultentry", "seasonguess", "userracepoints"]
+
+CONFIGURATIONS: Dict[str, Dict[str, str]] = {
+    "defaults": {
+        "SQLITE_JOURNAL_MODE": "DELETE",
+        "SQLITE_SYNCHRONOUS": "FULL",
+        "SQLITE_CACHE_SIZE": "-2000",
+        "SQLITE_MMAP_SIZE": "0",
+        "DISABLE_READ_ONLY_POOL": "True",
+    },
+    "tuned": {},  # The defaults of formula10/__init__.py
+}
+
+
+def run_worker(role: str, seconds: float, start_at: float) -> None:
+    """
+    Runs inside a worker process and prints its results as a single json line.
+    """
+    sys.path.insert(0, ROOT)
+    from formula10 import app
+    from formula10.domain.domain_model import Model
+    from formula10 import db
+    from sqlalchemy import text
+
+    client = app.test_client()
+    with app.test_request_context():
+        users: List[str] = [user.name for user in Model.all_users()]
+        race_name: str = quote(Model.race_calendar().next_race().name)  # type: ignore
+
+    latencies: List[float] = []
+    errors: int = 0
+
+    while time.time() < start_at:
+        time.sleep(0.01)
+
+    while time.time() < start_at + seconds:
+        request_start: float = time.perf_counter()
+        if role == "reader":
+            with app.test_request_context(method="GET"):
+                try:
+                    for table in READ_TABLES:
+                        db.session.execute(text(f"SELECT * FROM {table}")).fetchall()
+                    db.session.commit()
+                    status: int = 200
+                except Exception as error:
+                    print(f"{type(error).__name__}: {error}", file=sys.stderr)
+                    status = 500
+        else:
+            user_name: str = users[len(latencies) % len(users)]
+            status = client.post(
+                f"/race-guess/{race_name}/{user_name}",
+                data={"pxxselect": str(1 + len(latencies) % 20), "dnfselect": "0"},
+            ).status_code
+
+        latencies.append(time.perf_counter() - request_start)
+        if status >= 500:
+            errors += 1
+
+    print(json.dumps({"role": role, "latencies": latencies, "errors": errors}))
+
+
+def run_configuration(name: str, database: str, readers: int, seconds: float) -> Dict[str, Any]:
+    directory: str = tempfile.mkdtemp(prefix="formula10-benchmark-")
+    shutil.copy(database, os.path.join(directory, "formula10.db"))
+
+    env: Dict[str, str] = {
+        **os.environ,
+        **CONFIGURATIONS[name],
+        "DATABASE_URI": f"sqlite:///{os.path.join(directory, 'formula10.db')}",
+        "DISABLE_TIMING": "True",
+    }
+
+    # Migrate once before the workers start
+    subprocess.run([sys.executable, "-c", f"import sys; sys.path.insert(0, {ROOT!r}); import formula10"], env=env, check=True, capture_output=True)
+
+    start_at: float = time.time() + 3  # Leave time for the imports
+    roles: List[str] = ["writer"] + ["reader"] * readers
+    processes = [
+        subprocess.Popen([sys.executable, __file__, "--worker", role, "--seconds", str(seconds), "--start-at", str(start_at)],
+                         env=env, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+        for role in roles
+    ]
+
+    results: List[Dict[str, Any]] = []
+    for process in processes:
+        stdout, _ = process.communicate()
+        results.append(json.loads(stdout.strip().splitlines()[-1]))
+
+    shutil.rmtree(directory)
+
+    def summary(role: str) -> Dict[str, Any]:
+        latencies: List[float] = sorted(latency for result in results if result["role"] == role for latency in result["latencies"])
+        errors: int = sum(result["errors"] for result in results if result["role"] == role)
+
+        return {
+            "requests_per_second": len(latencies) / seconds,
+            "p50_ms": 1000 * latencies[len(latencies) // 2] if len(latencies) > 0 else None,
+            "p95_ms": 1000 * latencies[int(len(latencies) * 0.95)] if len(latencies) > 0 else None,
+            "errors": errors,
+        }
+
+    return {"reads": summary("reader"), "writes": summary("writer")}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database", default=os.path.join(ROOT, "instance", "formula10.db"))
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--worker", choices=["reader", "writer"], help=argparse.SUPPRESS)
+    parser.add_argument("--start-at", type=float, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker is not None:
+        run_worker(args.worker, args.seconds, args.start_at)
+        return
+
+    print(f"{args.readers} readers + 1 writer for {args.seconds}s on {args.database}")
+    print(f"{'configuration':<14}{'reads/s':>10}{'read p50':>11}{'read p95':>11}{'writes/s':>10}{'write p95':>11}{'errors':>8}")
+    for name in CONFIGURATIONS:
+        result: Dict[str, Any] = run_configuration(name, args.database, args.readers, args.seconds)
+        reads, writes = result["reads"], result["writes"]
+        print(f"{name:<14}{reads['requests_per_second']:>10.1f}{reads['p50_ms'] or 0:>9.1f}ms{reads['p95_ms'] or 0:>9.1f}ms"
+              f"{writes['requests_per_second']:>10.1f}{writes['p95_ms'] or 0:>9.1f}ms{reads['errors'] + writes['errors']:>8}")
+
+
+if __name__ == "__main__":
+    main()
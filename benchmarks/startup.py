@@ -0,0 +1,127 @@
+"""
+Startup benchmark: measures "import formula10" and the time to the first response in fresh processes and fails if they exceed their budgets.
+
+Generates a throwaway SQLite league first (see "flask generate-data"), then starts --repeat processes, each one importing
+formula10 and requesting --url once. Heavy optional subsystems (OpenF1/requests, FastF1/pandas) have to be imported on first use,
+the benchmark fails as well, if importing formula10 loads any of them.
+
+Usage: python benchmarks/startup.py [--users 1000] [--races 24] [--repeat 5] [--import-budget 1500] [--first-response-budget 3000]
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+ROOT: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must not be loaded by "import formula10"
+LAZY_MODULES: List[str] = ["requests", "fastf1", "pandas"]
+
+
+def run_generate(users: int, races: int) -> None:
+    """
+    Runs inside a worker process and fills the (empty) database with a synthetic league.
+    """
+    sys.path.insert(0, ROOT)
+    from formula10 import app, db
+    from formula10.database.synthetic_data import LeagueSettings, generate_league
+
+    with app.app_context():
+        db.create_all()
+        generate_league(LeagueSettings(users=users, races=races, started_races=races // 2, teams=10, reserve_drivers=2, guess_rate=0.9, seed=1))
+
+
+def run_measure(url: str) -> None:
+    """
+    Runs inside a fresh worker process and prints the import and first response times as a json line.
+    """
+    sys.path.insert(0, ROOT)
+
+    start: float = time.perf_counter()
+    from formula10 import app
+    imported: float = time.perf_counter()
+
+    status: int = app.test_client().get(url).status_code
+    responded: float = time.perf_counter()
+
+    print(json.dumps({
+        "import_ms": 1000 * (imported - start),
+        "first_response_ms": 1000 * (responded - start),
+        "status": status,
+        "lazy_modules_loaded": [module for module in LAZY_MODULES if module in sys.modules],
+    }))
+
+
+def worker(args: List[str], env: Dict[str, str]) -> str:
+    process = subprocess.run([sys.executable, __file__, *args], env=env, stdout=subprocess.PIPE, text=True, check=True)
+
+    return process.stdout.strip().splitlines()[-1] if process.stdout.strip() != "" else ""
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--races", type=int, default=24)
+    parser.add_argument("--url", default="/race/Everyone", help="the first request")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--import-budget", type=float, default=1500, help="median ms of \"import formula10\"")
+    parser.add_argument("--first-response-budget", type=float, default=3000, help="median ms from the import to the end of the first response")
+    parser.add_argument("--generate", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--measure", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.generate:
+        run_generate(args.users, args.races)
+        return
+    if args.measure:
+        run_measure(args.url)
+        return
+
+    directory: str = tempfile.mkdtemp(prefix="formula10-startup-")
+    env: Dict[str, str] = {
+        **os.environ,
+        "DATABASE_URI": f"sqlite:///{os.path.join(directory, 'formula10.db')}",
+        "DISABLE_STATIC_FINGERPRINTS": "True",
+    }
+
+    try:
+        print(f"Generating {args.users} users and {args.races} races ...", file=sys.stderr)
+        worker(["--generate", "--users", str(args.users), "--races", str(args.races)], env)
+
+        # The first start migrates the generated database, it isn't measured
+        worker(["--measure", "--url", args.url], env)
+        results: List[Dict] = [json.loads(worker(["--measure", "--url", args.url], env)) for _ in range(args.repeat)]
+    finally:
+        shutil.rmtree(directory)
+
+    import_ms: float = statistics.median(result["import_ms"] for result in results)
+    first_response_ms: float = statistics.median(result["first_response_ms"] for result in results)
+    lazy_modules_loaded: List[str] = sorted({module for result in results for module in result["lazy_modules_loaded"]})
+
+    failures: List[str] = list()
+    if import_ms > args.import_budget:
+        failures.append(f"import formula10 took {import_ms:.0f}ms, the budget is {args.import_budget:.0f}ms")
+    if first_response_ms > args.first_response_budget:
+        failures.append(f"The first response took {first_response_ms:.0f}ms, the budget is {args.first_response_budget:.0f}ms")
+    if any(result["status"] >= 500 for result in results):
+        failures.append(f"GET {args.url} failed")
+    if len(lazy_modules_loaded) > 0:
+        failures.append(f"import formula10 loaded {', '.join(lazy_modules_loaded)}, they have to be imported on first use")
+
+    print(f"import formula10: {import_ms:.0f}ms (budget {args.import_budget:.0f}ms)")
+    print(f"first response:   {first_response_ms:.0f}ms (budget {args.first_response_budget:.0f}ms)")
+    for failure in failures:
+        print(f"- {failure}")
+
+    if len(failures) > 0:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
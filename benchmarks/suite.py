@@ -0,0 +1,313 @@
+"""
+Benchmark suite for the domain models and the routes.
+
+Generates a throwaway SQLite league per size (users x races, see "flask generate-data", with --guess-rate guesses
+per user and race, half of the races started) and times
+every public method of Model, PointsModel and TemplateModel and every GET route, cold (on a freshly built domain snapshot)
+and warm (called again on the same snapshot). Building the snapshot itself is reported as "snapshot".
+Every size runs in its own process, because the database is chosen when formula10 is imported.
+
+Usage: python benchmarks/suite.py [--sizes 10x24 50x24 200x24] [--guess-rate 0.9] [--repeat 3] [--json out.json] [--baseline old.json]
+"""
+import argparse
+import inspect
+import json
+import math
+import os
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+ROOT: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Routes that need state from a previous request
+SKIPPED_ENDPOINTS: List[str] = ["static", "error_root"]
+
+# Results are only compared to the baseline if they take at least this long (in ms), shorter ones are mostly noise
+MIN_COMPARED_MS: float = 0.5
+
+Timings = Dict[str, Dict[str, float]]
+
+
+def timed(f: Callable[[], Any]) -> float:
+    start: float = time.perf_counter()
+    f()
+    return 1000 * (time.perf_counter() - start)
+
+
+def method_arguments(f: Callable, samples: Dict[str, Any]) -> Tuple[List[Any], Dict[str, Any]] | None:
+    """
+    Returns the arguments to call a method with, by parameter name, or None, if a required parameter has no sample value.
+    """
+    args: List[Any] = list()
+    kwargs: Dict[str, Any] = dict()
+
+    for parameter in inspect.signature(f).parameters.values():
+        if parameter.name == "self":
+            continue
+
+        if parameter.name not in samples:
+            if parameter.default is inspect.Parameter.empty:
+                return None
+            continue
+
+        if parameter.kind == inspect.Parameter.KEYWORD_ONLY:
+            kwargs[parameter.name] = samples[parameter.name]
+        else:
+            args.append(samples[parameter.name])
+
+    return args, kwargs
+
+
+def run_worker(users: int, races: int, guess_rate: float, repeat: int) -> None:
+    """
+    Runs inside a worker process and prints the timings of a single size as a json line.
+    """
+    sys.path.insert(0, ROOT)
+    from flask import url_for
+    from formula10 import app
+    from formula10.controller.chart_controller import CHARTS, chart_data_version
+    from formula10.domain.domain_model import Model
+    from formula10.domain.domain_snapshot import discard_snapshot, pinned_snapshot
+    from formula10.domain.points_model import PointsModel
+    from formula10.domain.template_model import TemplateModel
+    from formula10.database.synthetic_data import LeagueSettings, generate_league
+    from formula10 import db
+
+    with app.app_context():
+        db.create_all()
+        generate_league(LeagueSettings(users=users, races=races, started_races=races // 2, teams=10, reserve_drivers=2, guess_rate=guess_rate, seed=1))
+        discard_snapshot()
+
+    timings: Timings = dict()
+
+    def measure(name: str, cold: Callable[[], float], warm: Callable[[], float]) -> None:
+        cold_times: List[float] = list()
+        warm_times: List[float] = list()
+        for _ in range(repeat):
+            try:
+                cold_times.append(cold())
+                warm_times.append(warm())
+            except Exception as error:
+                print(f"Skipping {name}, it failed with {type(error).__name__}: {error}", file=sys.stderr)
+                return
+
+        timings[name] = {"cold": statistics.median(cold_times), "warm": statistics.median(warm_times)}
+
+    # Snapshot
+    def build_snapshot() -> float:
+        discard_snapshot()
+        with app.test_request_context():
+            return timed(pinned_snapshot)
+
+    def pin_snapshot() -> float:
+        with app.test_request_context():
+            return timed(pinned_snapshot)
+
+    measure("snapshot", build_snapshot, pin_snapshot)
+
+    # Methods
+    with app.test_request_context():
+        model = Model()
+        # A race with a result, preferably one with a sprint
+        results: List[Any] = model.all_race_results()
+        race_name: str = next((result.race for result in results if result.race.has_sprint), results[0].race).name
+        # The generator disables a few users, the samples use the first enabled one
+        user_name: str = model.all_users()[0].name
+        samples: Dict[str, Any] = {
+            "user_name": user_name,
+            "race_name": race_name,
+            "driver_name": model.all_drivers(include_none=False, include_inactive=False)[0].name,
+            "team_name": model.all_teams(include_none=False)[0].name,
+            "driver": model.all_drivers(include_none=False, include_inactive=False)[0],
+            "race": model.race_by(race_name=race_name),
+            "include_none": False,
+            "include_inactive": True,
+            "include_season": True,
+        }
+
+    def instances() -> Dict[type, Any]:
+        return {
+            Model: Model(),
+            PointsModel: PointsModel(),
+            TemplateModel: TemplateModel(active_user_name=user_name, active_result_race_name=race_name),
+        }
+
+    for cls in (Model, PointsModel, TemplateModel):
+        for name, attribute in vars(cls).items():
+            function = attribute.__func__ if isinstance(attribute, (staticmethod, classmethod)) else attribute
+            # Updates modify the snapshot, they are measured by the write routes of the application instead
+            if name.startswith("_") or name.startswith("update_") or not inspect.isfunction(function):
+                continue
+
+            arguments = method_arguments(function, samples)
+            if arguments is None:
+                print(f"Skipping {cls.__name__}.{name}, no sample for its parameters", file=sys.stderr)
+                continue
+
+            def call(cls: type = cls, name: str = name, arguments: Tuple[List[Any], Dict[str, Any]] = arguments) -> float:
+                method = getattr(instances()[cls], name)
+                return timed(lambda: method(*arguments[0], **arguments[1]))
+
+            def cold_call(call: Callable[[], float] = call) -> float:
+                discard_snapshot()
+                with app.test_request_context():
+                    pinned_snapshot()
+                    return call()
+
+            def warm_call(call: Callable[[], float] = call) -> float:
+                with app.test_request_context():
+                    return call()
+
+            measure(f"{cls.__name__}.{name}", cold_call, warm_call)
+
+    # Routes
+    client = app.test_client()
+    with app.test_request_context():
+        parameters: Dict[str, List[str]] = {
+            "user_name": ["Everyone", user_name],
+            "race_name": ["Current", race_name],
+            "chart": list(CHARTS),
+        }
+        urls: List[str] = list()
+        for rule in app.url_map.iter_rules():
+            if "GET" not in (rule.methods or set()) or rule.endpoint in SKIPPED_ENDPOINTS:
+                continue
+
+            combinations: List[Dict[str, str]] = [dict()]
+            for argument in sorted(rule.arguments - {"version"}):
+                combinations = [{**combination, argument: value} for combination in combinations for value in parameters[argument]]
+            if "version" in rule.arguments:
+                # Chart urls are versioned by the content of their chart
+                combinations = [{**combination, "version": chart_data_version(combination["chart"])} for combination in combinations]
+
+            urls += [url_for(rule.endpoint, **combination) for combination in combinations]
+
+    def request(url: str) -> None:
+        status: int = client.get(url).status_code
+        if status >= 500:
+            print(f"GET {url} failed with {status}", file=sys.stderr)
+
+    for url in urls:
+        def cold_request(url: str = url) -> float:
+            discard_snapshot()
+            return timed(lambda: request(url))
+
+        def warm_request(url: str = url) -> float:
+            return timed(lambda: request(url))
+
+        # The chart version changes with the generated data, it isn't part of the name
+        measure(f"GET {re.sub(r'^/chart/[^/]+/', '/chart/<version>/', url)}", cold_request, warm_request)
+
+    print(json.dumps(timings))
+
+
+def run_size(size: str, guess_rate: float, repeat: int, no_page_cache: bool) -> Timings:
+    users, races = (int(value) for value in size.split("x"))
+    directory: str = tempfile.mkdtemp(prefix="formula10-benchmark-")
+
+    env: Dict[str, str] = {
+        **os.environ,
+        "DATABASE_URI": f"sqlite:///{os.path.join(directory, 'formula10.db')}",
+        "DISABLE_STATIC_FINGERPRINTS": "True",
+    }
+    if no_page_cache:
+        env["DISABLE_PAGE_CACHE"] = "True"
+
+    try:
+        process = subprocess.run(
+            [sys.executable, __file__, "--worker", "--users", str(users), "--races", str(races), "--guess-rate", str(guess_rate), "--repeat", str(repeat)],
+            env=env, stdout=subprocess.PIPE, text=True, check=True,
+        )
+    finally:
+        shutil.rmtree(directory)
+
+    return json.loads(process.stdout.strip().splitlines()[-1])
+
+
+def scaling_exponent(sizes: List[str], times: List[float]) -> float | None:
+    """
+    Returns the exponent k of time ~ users^k between the smallest and largest size, e.g. 1 for linear scaling.
+    """
+    first_users, last_users = int(sizes[0].split("x")[0]), int(sizes[-1].split("x")[0])
+    if first_users == last_users or times[0] <= 0 or times[-1] <= 0:
+        return None
+
+    return math.log(times[-1] / times[0]) / math.log(last_users / first_users)
+
+
+def print_report(results: Dict[str, Timings]) -> None:
+    sizes: List[str] = list(results)
+    names: List[str] = sorted(results[sizes[-1]], key=lambda name: -results[sizes[-1]][name]["cold"])
+    width: int = max(len(name) for name in names)
+
+    for mode in ["cold", "warm"]:
+        print(f"\n{mode} (median ms)")
+        print(f"{'':<{width}}" + "".join(f"{size:>12}" for size in sizes) + f"{'scaling':>10}")
+        for name in names:
+            times: List[float] = [results[size].get(name, {}).get(mode, float("nan")) for size in sizes]
+            exponent: float | None = scaling_exponent(sizes, times)
+            print(f"{name:<{width}}" + "".join(f"{time:>12.2f}" for time in times) + (f"{exponent:>10.2f}" if exponent is not None else f"{'':>10}"))
+
+
+def print_regressions(results: Dict[str, Timings], baseline: Dict[str, Timings], tolerance: float) -> bool:
+    """
+    Prints every result that got slower than tolerance times its baseline. Returns whether there were any.
+    """
+    regressions: List[str] = list()
+    for size, timings in results.items():
+        for name, modes in timings.items():
+            for mode, time in modes.items():
+                previous: float | None = baseline.get(size, {}).get(name, {}).get(mode)
+                if previous is not None and time >= MIN_COMPARED_MS and time > previous * tolerance:
+                    regressions.append(f"{size} {mode} {name}: {previous:.2f}ms -> {time:.2f}ms")
+
+    print(f"\n{len(regressions)} regressions (> {tolerance:.2f}x baseline)")
+    for regression in regressions:
+        print(f"- {regression}")
+
+    return len(regressions) > 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", nargs="+", default=["10x24", "50x24", "200x24"], help="users x races")
+    parser.add_argument("--guess-rate", type=float, default=0.9)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-page-cache", action="store_true", help="render every page, even if it was rendered before")
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--baseline", help="compare the results to the ones written by an earlier run")
+    parser.add_argument("--tolerance", type=float, default=1.25)
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--users", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--races", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.users, args.races, args.guess_rate, args.repeat)
+        return
+
+    results: Dict[str, Timings] = dict()
+    for size in args.sizes:
+        print(f"Running size {size} ...", file=sys.stderr)
+        results[size] = run_size(size, args.guess_rate, args.repeat, args.no_page_cache)
+
+    print_report(results)
+
+    if args.json is not None:
+        with open(args.json, "w") as file:
+            json.dump(results, file, indent=2)
+
+    if args.baseline is not None:
+        with open(args.baseline) as file:
+            if print_regressions(results, json.load(file), args.tolerance):
+                sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -84,7 +84,6 @@
           # Web
           flask
           flask-sqlalchemy
-          flask-caching
           sqlalchemy
           requests
 
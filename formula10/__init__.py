@@ -1,17 +1,54 @@
 import os
+from typing import List
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
-from flask_caching import Cache
-from werkzeug.middleware.profiler import ProfilerMiddleware
+
+from formula10.database.sqlite_engine import RoutingSession, SqliteSettings, configure_sqlite
 
 # Load local ENV variables (can be set when calling the executable)
 ENABLE_TIMING: bool = False if os.getenv("DISABLE_TIMING") == "True" else True
+ENABLE_PAGE_CACHE: bool = False if os.getenv("DISABLE_PAGE_CACHE") == "True" else True
+ENABLE_STATIC_FINGERPRINTS: bool = False if os.getenv("DISABLE_STATIC_FINGERPRINTS") == "True" else True
+ENABLE_SHARED_CACHE: bool = True if os.getenv("SHARED_CACHE") == "True" else False  # Required when running multiple workers
+DATABASE_URI: str = os.getenv("DATABASE_URI", "sqlite:///formula10.db")
+CACHE_WARMUP: str = os.getenv("CACHE_WARMUP", "off")  # "startup" or "background" warm up the caches, see /ready
+PROFILE_SAMPLE_RATE: float = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))  # Share of the requests that is profiled, see /profile
+QUERY_LOG_LEVEL: str = os.getenv("QUERY_LOG_LEVEL", "INFO").upper()  # Level of the per request query counts, "OFF" disables them, see /queries
+PROFILE_ROUTES: List[str] = [route for route in os.getenv("PROFILE_ROUTES", "").split(",") if route != ""]  # Url rules that are always profiled
+SQLITE_SETTINGS: SqliteSettings = SqliteSettings(
+    journal_mode=os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+    synchronous=os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+    cache_size=int(os.getenv("SQLITE_CACHE_SIZE", "-65536")),
+    mmap_size=int(os.getenv("SQLITE_MMAP_SIZE", "268435456")),
+    busy_timeout=int(os.getenv("SQLITE_BUSY_TIMEOUT", "5000")),
+    read_only_pool=False if os.getenv("DISABLE_READ_ONLY_POOL") == "True" else True,
+)
 print("Running Formula10 with:")
 if not ENABLE_TIMING:
     print("- Disabled timing constraints")
+if not ENABLE_PAGE_CACHE:
+    print("- Disabled page cache")
+if not ENABLE_STATIC_FINGERPRINTS:
+    print("- Disabled static asset fingerprints")
+if ENABLE_SHARED_CACHE:
+    print("- Enabled shared cache")
+if CACHE_WARMUP != "off":
+    print(f"- Enabled cache warm-up ({CACHE_WARMUP})")
+if PROFILE_SAMPLE_RATE > 0:
+    print(f"- Enabled profiling of {PROFILE_SAMPLE_RATE:.0%} of the requests")
+if QUERY_LOG_LEVEL == "OFF":
+    print("- Disabled query count logging")
+elif QUERY_LOG_LEVEL != "INFO":
+    print(f"- Query counts logged at {QUERY_LOG_LEVEL}")
+if len(PROFILE_ROUTES) > 0:
+    print(f"- Enabled profiling of {', '.join(PROFILE_ROUTES)}")
+if SQLITE_SETTINGS.journal_mode != "WAL":
+    print(f"- SQLite journal mode {SQLITE_SETTINGS.journal_mode}")
+if not SQLITE_SETTINGS.read_only_pool:
+    print("- Disabled read-only connection pool")
 
 app: Flask = Flask(__name__)
-app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///formula10.db"
+app.config["SQLALCHEMY_DATABASE_URI"] = DATABASE_URI
 app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
 
 # Session cookie is used to propagate message to error page
@@ -20,13 +57,10 @@ app.config["SECRET_KEY"] = "ich stinke nach maggi"
 
 app.url_map.strict_slashes = False
 
-db: SQLAlchemy = SQLAlchemy()
+db: SQLAlchemy = SQLAlchemy(session_options={"class_": RoutingSession})
 db.init_app(app)
-
-cache: Cache = Cache(config={"CACHE_TYPE": "SimpleCache"})
-cache.init_app(app)
-
-# app.wsgi_app = ProfilerMiddleware(app.wsgi_app, restrictions=("/formula10/*",), sort_by=("cumtime",))
+with app.app_context():
+    configure_sqlite(db.engine, SQLITE_SETTINGS)
 
 # NOTE: These imports are required to register the routes. They need to be imported after "app" is declared
 import formula10.controller.race_controller
@@ -35,7 +69,31 @@ import formula10.controller.leaderboard_controller
 import formula10.controller.statistics_controller
 import formula10.controller.rules_controller
 import formula10.controller.admin_controller
+import formula10.controller.chart_controller
 import formula10.controller.error_controller
+import formula10.controller.static_controller
+import formula10.controller.profiling_controller
+import formula10.controller.query_stats_controller
+import formula10.controller.metrics_controller
+import formula10.controller.warmup_controller
+
+# NOTE: This import registers the flask CLI commands
+import formula10.commands
+
+# NOTE: Static assets are fingerprinted and compressed by "flask build-static" before the start, the app only reads the build
+from formula10.controller.static_controller import load_static_assets, static_build_directory
+if ENABLE_STATIC_FINGERPRINTS and load_static_assets(static_build_directory()) == 0:
+    print("- Static assets aren't built, they are served without fingerprints (run \"flask --app formula10 build-static\")")
+
+# NOTE: Existing databases are upgraded to the current schema before any request is served
+from formula10.database.migrations import migrate_database
+with app.app_context():
+    migrate_database()
+
+# NOTE: The caches are warmed up last, so the warm-up reads the migrated database. CLI commands don't serve requests, they skip it.
+from formula10.controller.warmup_controller import serves_requests, start_warm_up
+if serves_requests():
+    start_warm_up(CACHE_WARMUP)
 
 
 # TODO
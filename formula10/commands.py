@@ -0,0 +1,46 @@
+import time
+import click
+
+from formula10.controller.static_controller import build_static_assets, load_static_assets, static_build_directory
+from formula10.database.model.db_race import DbRace
+from formula10.database.model.db_user import DbUser
+from formula10.database.synthetic_data import LeagueSettings, generate_league
+from formula10 import app, db
+
+
+@app.cli.command("generate-data")
+@click.option("--users", default=1000, show_default=True)
+@click.option("--races", default=24, show_default=True)
+@click.option("--started-races", type=int, help="Races that already started [default: half of the races]")
+@click.option("--teams", default=10, show_default=True)
+@click.option("--reserve-drivers", default=2, show_default=True, help="Inactive drivers in addition to the field of 20 (at most 4)")
+@click.option("--guess-rate", default=0.9, show_default=True, help="Average share of races a user guessed")
+@click.option("--seed", default=1, show_default=True)
+@click.option("--replace", is_flag=True, help="Drop all existing data first")
+def generate_data(users: int, races: int, started_races: int | None, teams: int, reserve_drivers: int, guess_rate: float, seed: int, replace: bool) -> None:
+    """
+    Fills the database (DATABASE_URI) with a synthetic league for load tests.
+    """
+    if replace:
+        db.drop_all()
+    db.create_all()
+
+    if db.session.query(DbUser).first() is not None or db.session.query(DbRace).first() is not None:
+        raise click.ClickException("The database already contains data, use --replace to drop it")
+
+    start: float = time.perf_counter()
+    generate_league(LeagueSettings(users=users, races=races, started_races=started_races if started_races is not None else races // 2,
+                                   teams=teams, reserve_drivers=reserve_drivers, guess_rate=guess_rate, seed=seed))
+
+    click.echo(f"Generated {users} users and {races} races in {time.perf_counter() - start:.1f}s")
+
+
+@app.cli.command("build-static")
+def build_static() -> None:
+    """
+    Fingerprints and compresses the static assets into the instance folder, run it before starting the app after a deployment.
+    """
+    start: float = time.perf_counter()
+    build_static_assets(static_build_directory())
+
+    click.echo(f"Built {load_static_assets(static_build_directory())} static assets in {time.perf_counter() - start:.1f}s")
@@ -0,0 +1,62 @@
+import hashlib
+from typing import Callable, Dict, List, Tuple
+from flask import make_response, redirect, url_for
+from werkzeug import Response
+
+from formula10.controller.compression import accepted_encoding, compress
+from formula10.domain.cache_dependencies import DRIVERS, RACE_GUESSES, RACE_RESULTS, RACES, TEAMS, USERS, cached_value
+from formula10.domain.points_model import PointsModel
+from formula10 import app
+
+# The chart data is served under a hash of its content, so a url always returns the same data and browsers can cache it forever.
+# The url only changes with the series of its chart, and all workers (and restarts) agree on it.
+# Requests for an outdated version are redirected to the current one.
+CHART_CACHE_CONTROL: str = "public, max-age=31536000, immutable"
+
+# The series of each chart and the entities they are computed from
+CHARTS: Dict[str, Tuple[Callable[[PointsModel], str], List[str]]] = {
+    "points": (PointsModel.cumulative_points_data, [RACE_RESULTS, RACE_GUESSES, USERS, RACES, DRIVERS, TEAMS]),
+    "driver-points": (PointsModel.cumulative_driver_points_data, [RACE_RESULTS, RACES, DRIVERS, TEAMS]),
+    "team-points": (PointsModel.cumulative_team_points_data, [RACE_RESULTS, RACES, DRIVERS, TEAMS]),
+}
+
+
+@app.template_global()
+def chart_data_version(chart: str) -> str:
+    version, _, _ = chart_json(chart)
+
+    return version
+
+
+def chart_json(chart: str) -> Tuple[str, bytes, Dict[str, bytes]]:
+    """
+    Returns the content hash and the json of a chart, uncompressed and by content encoding.
+    They are kept in the snapshot until the chart data changes.
+    """
+    data, depends_on = CHARTS[chart]
+
+    def compute() -> Tuple[str, bytes, Dict[str, bytes]]:
+        raw: bytes = data(PointsModel()).encode()
+        return hashlib.sha1(raw).hexdigest()[:16], raw, compress(raw)
+
+    return cached_value(("chart", chart), compute, depends_on=depends_on)
+
+
+@app.route("/chart/<version>/<chart>.json")
+def chart_data(version: str, chart: str) -> Response:
+    if chart not in CHARTS:
+        return make_response(f"Unknown chart \"{chart}\"", 404)
+
+    current_version, raw, compressed = chart_json(chart)
+    if version != current_version:
+        return redirect(url_for("chart_data", version=current_version, chart=chart))
+
+    encoding: str | None = accepted_encoding(list(compressed))
+
+    response: Response = make_response(compressed[encoding] if encoding is not None else raw)
+    response.content_encoding = encoding
+    response.mimetype = "application/json"
+    response.headers["Cache-Control"] = CHART_CACHE_CONTROL
+    response.vary.add("Accept-Encoding")
+
+    return response
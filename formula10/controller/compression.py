@@ -0,0 +1,37 @@
+import gzip
+from typing import Dict, List
+from flask import request
+
+# Brotli is optional, without it only gzip variants are produced
+try:
+    import brotli  # type: ignore
+except ImportError:
+    brotli = None
+
+# Content encodings in order of preference
+ENCODINGS: List[str] = ["br", "gzip"] if brotli is not None else ["gzip"]
+
+# File extensions of static assets, that are worth compressing
+COMPRESSIBLE_EXTENSIONS: List[str] = [".css", ".js", ".map", ".svg", ".scss", ".json", ".html", ".txt"]
+
+
+def compress(raw: bytes) -> Dict[str, bytes]:
+    """
+    Returns the compressed variants of some data by content encoding.
+    """
+    variants: Dict[str, bytes] = {"gzip": gzip.compress(raw, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants["br"] = brotli.compress(raw, quality=11)
+
+    return variants
+
+
+def accepted_encoding(available: List[str]) -> str | None:
+    """
+    Returns the preferred encoding the client accepts among the available ones, or None, if it should get the raw data.
+    """
+    for encoding in ENCODINGS:
+        if encoding in available and encoding in request.accept_encodings:
+            return encoding
+
+    return None
@@ -1,9 +1,12 @@
 from flask import render_template
+from formula10.controller.page_cache import cached_page, conditional_page
 from formula10 import app
 from formula10.domain.points_model import PointsModel
 from formula10.domain.template_model import TemplateModel
 
 @app.route("/graphs")
+@conditional_page
+@cached_page
 def graphs_root() -> str:
     model = TemplateModel(active_user_name=None, active_result_race_name=None)
     points = PointsModel()
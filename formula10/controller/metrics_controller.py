@@ -0,0 +1,106 @@
+from typing import Any, Dict, List, Tuple
+from flask import jsonify, make_response, redirect
+from werkzeug import Response
+
+from formula10.domain.cache_metrics import CacheMetrics, entry_sizes, metrics_snapshot, reset_metrics
+from formula10.domain.domain_snapshot import DomainSnapshot, pinned_snapshot
+from formula10 import app
+
+# The metrics of /metrics: name, type, help and the value of a single cache name
+PROMETHEUS_METRICS: List[Tuple[str, str, str]] = [
+    ("formula10_cache_hits_total", "counter", "Values returned from the domain snapshot"),
+    ("formula10_cache_misses_total", "counter", "Values computed because they were missing from the domain snapshot"),
+    ("formula10_cache_recompute_seconds_total", "counter", "Time spent computing missing values, including nested cached methods"),
+    ("formula10_cache_recompute_seconds_max", "gauge", "Longest single computation of a missing value"),
+    ("formula10_cache_invalidations_total", "counter", "Values dropped from the domain snapshot by writes"),
+    ("formula10_cache_entries", "gauge", "Values stored in the current domain snapshot"),
+    ("formula10_cache_entry_bytes", "gauge", "Approximate size of the values stored in the current domain snapshot"),
+]
+
+
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    Returns the metrics of every cache name, combined with the entries of the pinned snapshot.
+    """
+    snapshot: DomainSnapshot = pinned_snapshot()
+    metrics: Dict[str, CacheMetrics] = metrics_snapshot()
+    sizes: Dict[str, Tuple[int, int]] = entry_sizes(snapshot.entries())
+
+    stats: Dict[str, Dict[str, Any]] = dict()
+    for name in sorted(set(metrics) | set(sizes)):
+        name_metrics: CacheMetrics = metrics.get(name, CacheMetrics())
+        entries, size = sizes.get(name, (0, 0))
+        stats[name] = {
+            "formula10_cache_hits_total": name_metrics.hits,
+            "formula10_cache_misses_total": name_metrics.misses,
+            "formula10_cache_recompute_seconds_total": name_metrics.recompute_seconds,
+            "formula10_cache_recompute_seconds_max": name_metrics.max_recompute_seconds,
+            "formula10_cache_invalidations_total": name_metrics.invalidations,
+            "formula10_cache_entries": entries,
+            "formula10_cache_entry_bytes": size,
+        }
+
+    return stats
+
+
+def label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+@app.route("/cache-stats")
+def cache_stats_json() -> Response:
+    """
+    Returns the cache metrics as json, with the hit rate and the mean recompute time, sorted by the total recompute time.
+    """
+    stats: Dict[str, Dict[str, Any]] = cache_stats()
+    snapshot: DomainSnapshot = pinned_snapshot()
+
+    return jsonify({
+        "snapshot_version": snapshot.version,
+        "caches": [
+            {
+                "name": name,
+                "hits": values["formula10_cache_hits_total"],
+                "misses": values["formula10_cache_misses_total"],
+                "hit_rate": round(values["formula10_cache_hits_total"] / max(1, values["formula10_cache_hits_total"] + values["formula10_cache_misses_total"]), 4),
+                "recompute_ms": round(1000 * values["formula10_cache_recompute_seconds_total"], 3),
+                "mean_recompute_ms": round(1000 * values["formula10_cache_recompute_seconds_total"] / max(1, values["formula10_cache_misses_total"]), 3),
+                "max_recompute_ms": round(1000 * values["formula10_cache_recompute_seconds_max"], 3),
+                "invalidations": values["formula10_cache_invalidations_total"],
+                "entries": values["formula10_cache_entries"],
+                "entry_bytes": values["formula10_cache_entry_bytes"],
+            }
+            for name, values in sorted(stats.items(), key=lambda item: -item[1]["formula10_cache_recompute_seconds_total"])
+        ],
+    })
+
+
+@app.route("/metrics")
+def metrics_prometheus() -> Response:
+    """
+    Returns the cache metrics of this process in the Prometheus text format.
+    """
+    stats: Dict[str, Dict[str, Any]] = cache_stats()
+
+    lines: List[str] = list()
+    for metric, metric_type, description in PROMETHEUS_METRICS:
+        lines.append(f"# HELP {metric} {description}")
+        lines.append(f"# TYPE {metric} {metric_type}")
+        for name, values in stats.items():
+            lines.append(f"{metric}{{name=\"{label_value(name)}\"}} {values[metric]}")
+
+    lines.append("# HELP formula10_snapshot_version Version of the current domain snapshot, it increases with every write")
+    lines.append("# TYPE formula10_snapshot_version gauge")
+    lines.append(f"formula10_snapshot_version {pinned_snapshot().version}")
+
+    response: Response = make_response("\n".join(lines) + "\n")
+    response.headers["Content-Type"] = "text/plain; version=0.0.4; charset=utf-8"
+
+    return response
+
+
+@app.route("/cache-stats-reset", methods=["POST"])
+def cache_stats_reset() -> Response:
+    reset_metrics()
+
+    return redirect("/cache-stats")
@@ -0,0 +1,103 @@
+import functools
+import hashlib
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Hashable, List, TypeVar
+from flask import make_response, request
+from markupsafe import Markup
+from werkzeug import Response
+
+from formula10.domain.cache_dependencies import ENTITIES, cached_value
+from formula10.domain.domain_model import Model
+from formula10.domain.domain_snapshot import data_version, pinned_snapshot
+from formula10.domain.model.race import Race
+from formula10.domain.race_calendar import RaceCalendar
+from formula10 import app, ENABLE_PAGE_CACHE
+
+_F = TypeVar("_F", bound=Callable)
+
+# Rendered html is stored in the pinned snapshot, so it lives exactly as long as the data it was rendered from.
+# The number of started races is part of every key, because the open/closed guesses change when a race starts.
+
+
+def page_key(name: str, kwargs: Dict[str, Any]) -> Hashable:
+    return name, tuple(sorted(kwargs.items())), Model.race_calendar().started_count()
+
+
+def cached_page(f: _F) -> _F:
+    """
+    Caches the html returned by a route per route parameters. Any write drops all cached pages.
+    """
+
+    @functools.wraps(f)
+    def cached_f(**kwargs: Any) -> Any:
+        if not ENABLE_PAGE_CACHE or request.method != "GET":
+            return f(**kwargs)
+
+        return cached_value(("page", page_key(f.__name__, kwargs)), lambda: f(**kwargs), depends_on=ENTITIES)
+
+    return cached_f  # type: ignore
+
+
+def conditional_page(f: _F) -> _F:
+    """
+    Sends a strong ETag (from the data version and the route parameters) and a Last-Modified date with the html of a route.
+    Requests with a matching If-None-Match (or a later If-Modified-Since) are answered with 304, without calling the route.
+    """
+
+    @functools.wraps(f)
+    def conditional_f(**kwargs: Any) -> Any:
+        if request.method not in ["GET", "HEAD"]:
+            return f(**kwargs)
+
+        etag: str = hashlib.sha1(repr((data_version(), page_key(f.__name__, kwargs))).encode()).hexdigest()
+        modified: datetime | None = last_modified()
+
+        response: Response = make_response() if is_unmodified(etag, modified) else make_response(f(**kwargs))
+        response.set_etag(etag)
+        response.last_modified = modified
+        response.cache_control.no_cache = True  # Browsers have to revalidate, the page changes with every write
+
+        return response.make_conditional(request)
+
+    return conditional_f  # type: ignore
+
+
+def is_unmodified(etag: str, modified: datetime | None) -> bool:
+    # Only checked here to skip rendering, make_conditional builds the actual 304 response (If-None-Match takes precedence)
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+
+    return request.if_modified_since is not None and modified is not None and modified <= request.if_modified_since
+
+
+def last_modified() -> datetime | None:
+    """
+    Returns the time the data of the pinned snapshot last changed: the later of its creation and the start of the current race.
+    It is only returned once its second is over, so a write in the same second can't be hidden behind an equal date.
+    """
+    calendar: RaceCalendar = Model.race_calendar()
+    current_race: Race | None = calendar.current_race()
+    now: datetime = datetime.now()
+
+    modified: datetime = pinned_snapshot().created_at
+    if current_race is not None and current_race.date > modified:
+        modified = current_race.date
+
+    if modified.replace(microsecond=0) >= now.replace(microsecond=0):
+        return None
+
+    return modified.astimezone(timezone.utc).replace(microsecond=0)
+
+
+@app.template_global()
+def cached_fragment(name: str, *key: Hashable, depends_on: List[str] | None = None, caller: Callable[[], str]) -> Markup:
+    """
+    Caches the html of a template fragment per name and key. Use it as {% call cached_fragment("name", key...) %}...{% endcall %}.
+    The fragment must only depend on the key and the given entities (all entities by default).
+    """
+    if not ENABLE_PAGE_CACHE:
+        return Markup(caller())
+
+    fragment_key: Hashable = ("fragment", name, key, Model.race_calendar().started_count())
+
+    return Markup(cached_value(fragment_key, caller, depends_on=depends_on if depends_on is not None else ENTITIES))
@@ -0,0 +1,162 @@
+import cProfile
+import os
+import pstats
+import random
+import threading
+from typing import Any, Dict, List, Tuple
+from flask import g, jsonify, make_response, redirect, request
+from werkzeug import Response
+
+from formula10 import PROFILE_ROUTES, PROFILE_SAMPLE_RATE, app
+
+# Functions are attributed to a group by the file they are defined in, compiled templates carry the file name of their template
+PROFILE_GROUPS: Dict[str, str] = {
+    os.path.join("domain", "points_model.py"): "PointsModel",
+    os.path.join("domain", "domain_model.py"): "Model",
+    ".jinja": "Jinja",
+}
+
+# The orders /profile can return the functions in, by the index of the value in the aggregated entry
+PROFILE_SORTS: Dict[str, int] = {"calls": 0, "total": 1, "cumulative": 2}
+
+ROOT: str = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+FunctionKey = Tuple[str, int, str]
+
+
+class RouteProfile:
+    """
+    The cProfile stats of all profiled requests of a single route, merged.
+    """
+
+    def __init__(self):
+        self.requests: int = 0
+        self.stats: pstats.Stats | None = None
+
+
+_route_profiles: Dict[str, RouteProfile] = dict()
+_route_profiles_lock: threading.Lock = threading.Lock()
+
+# Only a single request is profiled at a time, requests arriving while it runs are not sampled
+_profiler_lock: threading.Lock = threading.Lock()
+
+
+def profiling_enabled() -> bool:
+    return PROFILE_SAMPLE_RATE > 0 or len(PROFILE_ROUTES) > 0
+
+
+def route_name() -> str:
+    return request.url_rule.rule if request.url_rule is not None else "<unmatched>"
+
+
+def group_of(filename: str) -> str | None:
+    for suffix, group in PROFILE_GROUPS.items():
+        if filename.endswith(suffix):
+            return group
+
+    return None
+
+
+@app.before_request
+def start_profiler() -> None:
+    if not profiling_enabled() or request.endpoint in ["profile", "profile_reset"]:
+        return
+
+    if route_name() not in PROFILE_ROUTES and random.random() >= PROFILE_SAMPLE_RATE:
+        return
+
+    if not _profiler_lock.acquire(blocking=False):
+        return
+
+    g.profiler = cProfile.Profile()
+    g.profiler.enable()
+
+
+@app.teardown_request
+def stop_profiler(_: BaseException | None) -> None:
+    profiler: cProfile.Profile | None = g.pop("profiler", None)
+    if profiler is None:
+        return
+
+    profiler.disable()
+    _profiler_lock.release()
+
+    with _route_profiles_lock:
+        route_profile: RouteProfile = _route_profiles.setdefault(route_name(), RouteProfile())
+        route_profile.requests += 1
+        if route_profile.stats is None:
+            route_profile.stats = pstats.Stats(profiler)
+        else:
+            route_profile.stats.add(profiler)
+
+
+def hottest_functions(*, route: str | None, group: str | None, sort: str, limit: int) -> List[Dict[str, Any]]:
+    """
+    Returns the hottest functions of a single route (or of all routes, if route is None), merged over all profiled requests.
+    Only functions of the group are returned, or functions of any of the PROFILE_GROUPS, if group is None.
+    """
+    totals: Dict[FunctionKey, List[float]] = dict()
+    with _route_profiles_lock:
+        for name, route_profile in _route_profiles.items():
+            if (route is not None and name != route) or route_profile.stats is None:
+                continue
+
+            for function, (_, calls, total, cumulative, _) in route_profile.stats.stats.items():  # type: ignore
+                function_group: str | None = group_of(function[0])
+                if function_group is None or (group is not None and function_group != group):
+                    continue
+
+                entry: List[float] = totals.setdefault(function, [0, 0.0, 0.0])
+                entry[0] += calls
+                entry[1] += total
+                entry[2] += cumulative
+
+    hottest: List[Tuple[FunctionKey, List[float]]] = sorted(totals.items(), key=lambda item: -item[1][PROFILE_SORTS[sort]])[:limit]
+
+    return [
+        {
+            "function": function[2],
+            "file": os.path.relpath(function[0], ROOT) if function[0].startswith(ROOT) else function[0],
+            "line": function[1],
+            "group": group_of(function[0]),
+            "calls": int(calls),
+            "total_ms": round(1000 * total, 3),
+            "cumulative_ms": round(1000 * cumulative, 3),
+        }
+        for function, (calls, total, cumulative) in hottest
+    ]
+
+
+@app.route("/profile")
+def profile() -> Response:
+    """
+    Returns the hottest functions of the profiled requests, e.g. /profile?route=/race/<user_name>&group=PointsModel&sort=total.
+    """
+    route: str | None = request.args.get("route")
+    group: str | None = request.args.get("group")
+    sort: str = request.args.get("sort", "cumulative")
+    limit: int = request.args.get("limit", 30, type=int)
+
+    if group is not None and group not in PROFILE_GROUPS.values():
+        return make_response(f"Unknown group \"{group}\", use one of {', '.join(PROFILE_GROUPS.values())}", 400)
+    if sort not in PROFILE_SORTS:
+        return make_response(f"Unknown sort \"{sort}\", use one of {', '.join(PROFILE_SORTS)}", 400)
+
+    with _route_profiles_lock:
+        requests: Dict[str, int] = {name: route_profile.requests for name, route_profile in _route_profiles.items()}
+
+    return jsonify({
+        "enabled": profiling_enabled(),
+        "sample_rate": PROFILE_SAMPLE_RATE,
+        "routes": PROFILE_ROUTES,
+        "requests": requests,
+        "functions": hottest_functions(route=route, group=group, sort=sort, limit=limit),
+    })
+
+
+@app.route("/profile-reset", methods=["POST"])
+def profile_reset() -> Response:
+    with _route_profiles_lock:
+        _route_profiles.clear()
+
+    return redirect("/profile")
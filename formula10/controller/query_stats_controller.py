@@ -0,0 +1,100 @@
+import logging
+import threading
+from typing import Any, Dict
+from flask import jsonify, redirect, request
+from werkzeug import Response
+
+from formula10.database.query_stats import QueryStats, request_query_stats
+from formula10 import QUERY_LOG_LEVEL, app
+
+
+class RouteQueryStats:
+    """
+    The query counts of all requests of a single route, merged.
+    """
+
+    def __init__(self):
+        self.requests: int = 0
+        self.queries: int = 0
+        self.max_queries: int = 0
+        self.duration: float = 0.0  # Seconds
+        self.repeated_statements: Dict[str, int] = dict()  # The most repetitions seen in a single request
+
+
+def query_log_level() -> int | None:
+    """
+    Returns the level the query counts are logged at, or None, if they aren't logged.
+    """
+    if QUERY_LOG_LEVEL == "OFF":
+        return None
+
+    level: int | str = logging.getLevelName(QUERY_LOG_LEVEL)
+    if not isinstance(level, int):
+        raise Exception(f"Unknown QUERY_LOG_LEVEL \"{QUERY_LOG_LEVEL}\"")
+
+    return level
+
+
+_query_log_level: int | None = query_log_level()
+
+# Flask's logger only emits warnings outside of debug mode, the query counts have to reach the production logs
+if _query_log_level is not None and app.logger.getEffectiveLevel() > _query_log_level:
+    app.logger.setLevel(_query_log_level)
+
+_route_query_stats: Dict[str, RouteQueryStats] = dict()
+_route_query_stats_lock: threading.Lock = threading.Lock()
+
+
+@app.teardown_request
+def log_query_stats(_: BaseException | None) -> None:
+    stats: QueryStats | None = request_query_stats()
+    if stats is None:
+        return
+
+    route: str = request.url_rule.rule if request.url_rule is not None else "<unmatched>"
+    repeated: Dict[str, int] = stats.repeated_statements()
+
+    if _query_log_level is not None:
+        app.logger.log(_query_log_level, f"{request.method} {request.path}: {stats.count} queries in {1000 * stats.duration:.1f}ms")
+    for statement, count in repeated.items():
+        app.logger.warning(f"{request.method} {request.path}: Possible N+1, {count}x {' '.join(statement.split())}")
+
+    with _route_query_stats_lock:
+        route_stats: RouteQueryStats = _route_query_stats.setdefault(f"{request.method} {route}", RouteQueryStats())
+        route_stats.requests += 1
+        route_stats.queries += stats.count
+        route_stats.max_queries = max(route_stats.max_queries, stats.count)
+        route_stats.duration += stats.duration
+        for statement, count in repeated.items():
+            route_stats.repeated_statements[statement] = max(route_stats.repeated_statements.get(statement, 0), count)
+
+
+@app.route("/queries")
+def queries() -> Response:
+    """
+    Returns the query counts per route, requests that were answered without any query are not counted.
+    """
+    with _route_query_stats_lock:
+        routes: Dict[str, Any] = {
+            route: {
+                "requests": route_stats.requests,
+                "queries": route_stats.queries,
+                "max_queries": route_stats.max_queries,
+                "query_ms": round(1000 * route_stats.duration, 3),
+                "repeated_statements": [
+                    {"statement": " ".join(statement.split()), "count": count}
+                    for statement, count in route_stats.repeated_statements.items()
+                ],
+            }
+            for route, route_stats in sorted(_route_query_stats.items(), key=lambda item: -item[1].queries)
+        }
+
+    return jsonify(routes)
+
+
+@app.route("/queries-reset", methods=["POST"])
+def queries_reset() -> Response:
+    with _route_query_stats_lock:
+        _route_query_stats.clear()
+
+    return redirect("/queries")
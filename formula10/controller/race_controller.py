@@ -3,8 +3,8 @@ from urllib.parse import unquote
 from flask import redirect, render_template, request
 from werkzeug import Response
 
+from formula10.controller.page_cache import cached_page, conditional_page
 from formula10.database.update_queries import delete_race_guess, update_race_guess
-from formula10.domain.cache_invalidator import cache_invalidate_race_guess_updated
 from formula10.domain.domain_model import Model
 from formula10.domain.points_model import PointsModel
 from formula10.domain.template_model import TemplateModel
@@ -22,6 +22,8 @@ def race_root() -> Response:
 
 
 @app.route("/race/<user_name>")
+@conditional_page
+@cached_page
 def race_active_user(user_name: str) -> str:
     user_name = unquote(user_name)
     model = TemplateModel(active_user_name=user_name,
@@ -39,12 +41,13 @@ def race_guess_post(race_name: str, user_name: str) -> Response:
     pxx: str | None = request.form.get("pxxselect")
     dnf: str | None = request.form.get("dnfselect")
 
-    cache_invalidate_race_guess_updated()
     race_id: int = Model().race_by(race_name=race_name).id
     user_id: int = Model().user_by(user_name=user_name).id
-    return update_race_guess(race_id, user_id,
-                             int(pxx) if pxx is not None else None,
-                             int(dnf) if dnf is not None else None)
+    response: Response = update_race_guess(race_id, user_id,
+                                           int(pxx) if pxx is not None else None,
+                                           int(dnf) if dnf is not None else None)
+
+    return response
 
 
 @app.route("/race-guess-delete/<race_name>/<user_name>", methods=["POST"])
@@ -52,7 +55,8 @@ def race_guess_delete_post(race_name: str, user_name: str) -> Response:
     race_name = unquote(race_name)
     user_name = unquote(user_name)
 
-    cache_invalidate_race_guess_updated()
     race_id: int = Model().race_by(race_name=race_name).id
     user_id: int = Model().user_by(user_name=user_name).id
-    return delete_race_guess(race_id, user_id)
+    response: Response = delete_race_guess(race_id, user_id)
+
+    return response
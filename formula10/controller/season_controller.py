@@ -3,9 +3,9 @@ from urllib.parse import unquote
 from flask import redirect, render_template, request
 from werkzeug import Response
 
+from formula10.controller.page_cache import cached_page, conditional_page
 from formula10.database.model.db_team import DbTeam
 from formula10.database.update_queries import update_season_guess
-from formula10.domain.cache_invalidator import cache_invalidate_season_guess_updated
 from formula10.domain.domain_model import Model
 from formula10.domain.model.team import NONE_TEAM
 from formula10.domain.points_model import PointsModel
@@ -19,6 +19,8 @@ def season_root() -> Response:
 
 
 @app.route("/season/<user_name>")
+@conditional_page
+@cached_page
 def season_active_user(user_name: str) -> str:
     user_name = unquote(user_name)
     model = TemplateModel(active_user_name=user_name,
@@ -45,6 +47,6 @@ def season_guess_post(user_name: str) -> Response:
     ]
     podium_driver_guesses: List[str] = request.form.getlist("podiumdrivers")
 
-    cache_invalidate_season_guess_updated()
     user_id: int = Model().user_by(user_name=user_name).id
-    return update_season_guess(user_id, guesses, team_winner_guesses, podium_driver_guesses)
\ No newline at end of file
+    response: Response = update_season_guess(user_id, guesses, team_winner_guesses, podium_driver_guesses)
+    return response
\ No newline at end of file
@@ -0,0 +1,147 @@
+import hashlib
+import mimetypes
+import os
+from typing import Any, Dict, Iterator, List, Tuple
+from flask import send_file
+from werkzeug import Response
+
+from formula10.controller.compression import COMPRESSIBLE_EXTENSIONS, accepted_encoding, compress
+from formula10 import app
+
+# Fingerprinted assets never change, browsers may keep them for a year without revalidating
+STATIC_ASSET_MAX_AGE: int = 31536000
+
+# File name suffixes of the precompressed variants, by content encoding
+ENCODING_SUFFIXES: Dict[str, str] = {"br": ".br", "gzip": ".gz"}
+
+
+class StaticAsset:
+    """
+    A file of the static folder, copied to the build directory under a name containing its content hash.
+    """
+
+    def __init__(self, *, filename: str, fingerprinted_name: str, path: str, encodings: List[str]):
+        self.filename = filename
+        self.fingerprinted_name = fingerprinted_name
+        self.path = path  # Of the uncompressed copy, the variants append the encoding suffix
+        self.encodings = encodings  # The precompressed variants
+        self.mimetype: str = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+
+
+# The built assets, by their original and by their fingerprinted filename (relative to the static folder)
+_assets_by_filename: Dict[str, StaticAsset] = dict()
+_assets_by_fingerprinted_name: Dict[str, StaticAsset] = dict()
+
+
+def fingerprinted_filename(filename: str, content: bytes) -> str:
+    """
+    Inserts the content hash before the extension, e.g. "style/grid.css" becomes "style/grid.1a2b3c4d5e6f.css".
+    """
+    root, extension = os.path.splitext(filename)
+
+    return f"{root}.{hashlib.sha256(content).hexdigest()[:12]}{extension}"
+
+
+def write_file(path: str, content: bytes) -> None:
+    """
+    Writes a file atomically, so workers starting at the same time never serve a partially written asset.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporary_path: str = f"{path}.{os.getpid()}.tmp"
+    with open(temporary_path, "wb") as file:
+        file.write(content)
+    os.replace(temporary_path, path)
+
+
+def static_build_directory() -> str:
+    return os.path.join(app.instance_path, "static")
+
+
+def static_files() -> Iterator[Tuple[str, bytes]]:
+    """
+    Yields the filename (relative to the static folder) and the content of every file of the static folder.
+    """
+    static_folder: str = str(app.static_folder)
+
+    for directory, _, filenames in os.walk(static_folder):
+        for name in filenames:
+            filename: str = os.path.relpath(os.path.join(directory, name), static_folder).replace(os.sep, "/")
+            with open(os.path.join(directory, name), "rb") as file:
+                yield filename, file.read()
+
+
+def build_static_assets(build_directory: str) -> None:
+    """
+    Copies every file of the static folder to the build directory under its fingerprinted name and writes its compressed variants.
+    Assets that were already built (with the same content) are kept, so this is cheap if only some files changed.
+    This is a deployment step (see "flask build-static"), importing the app never writes to the build directory.
+    """
+    for filename, content in static_files():
+        path: str = os.path.join(build_directory, fingerprinted_filename(filename, content))
+        if not os.path.exists(path):
+            write_file(path, content)
+
+        if os.path.splitext(filename)[1] in COMPRESSIBLE_EXTENSIONS:
+            variants: Dict[str, bytes] | None = None
+            for encoding, suffix in ENCODING_SUFFIXES.items():
+                if not os.path.exists(path + suffix):
+                    variants = variants if variants is not None else compress(content)
+                    if encoding in variants:
+                        write_file(path + suffix, variants[encoding])
+
+
+def load_static_assets(build_directory: str) -> int:
+    """
+    Registers the assets of the build directory that match the current content of the static folder, without writing anything.
+    Files that weren't built (yet) are served from the static folder under their unversioned name.
+    Returns the number of registered assets.
+    """
+    _assets_by_filename.clear()
+    _assets_by_fingerprinted_name.clear()
+
+    for filename, content in static_files():
+        fingerprinted_name: str = fingerprinted_filename(filename, content)
+        path: str = os.path.join(build_directory, fingerprinted_name)
+        if not os.path.exists(path):
+            continue
+
+        encodings: List[str] = [encoding for encoding, suffix in ENCODING_SUFFIXES.items() if os.path.exists(path + suffix)]
+        asset: StaticAsset = StaticAsset(filename=filename, fingerprinted_name=fingerprinted_name, path=path, encodings=encodings)
+        _assets_by_filename[filename] = asset
+        _assets_by_fingerprinted_name[fingerprinted_name] = asset
+
+    return len(_assets_by_filename)
+
+
+@app.url_defaults
+def fingerprint_static_url(endpoint: str, values: Dict[str, Any]) -> None:
+    """
+    Makes url_for("static", filename=...) return the fingerprinted url of built assets.
+    """
+    if endpoint == "static" and values.get("filename") in _assets_by_filename:
+        values["filename"] = _assets_by_filename[values["filename"]].fingerprinted_name
+
+
+def static_asset(filename: str) -> Response:
+    """
+    Serves fingerprinted assets from the build directory, in the best precompressed variant the client accepts.
+    Other urls (e.g. the unversioned names) are served from the static folder as before.
+    """
+    asset: StaticAsset | None = _assets_by_fingerprinted_name.get(filename)
+    if asset is None:
+        return app.send_static_file(filename)
+
+    encoding: str | None = accepted_encoding(asset.encodings)
+    path: str = asset.path + ENCODING_SUFFIXES[encoding] if encoding is not None else asset.path
+
+    response: Response = send_file(path, mimetype=asset.mimetype, max_age=STATIC_ASSET_MAX_AGE, conditional=True)
+    response.content_encoding = encoding
+    response.vary.add("Accept-Encoding")
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+
+    return response
+
+
+# Replaces Flask's view of the "static" endpoint, the url rule stays the same
+app.view_functions["static"] = static_asset
@@ -0,0 +1,97 @@
+import threading
+import time
+from typing import Any, Dict, List
+import click
+from flask import jsonify, make_response, url_for
+from werkzeug import Response
+
+from formula10.controller.chart_controller import CHARTS
+from formula10 import app
+
+# The ways the caches can be warmed up: not at all (the first visitors fill them), before the app is imported completely
+# (so no request is served cold) or in a background thread (the app starts right away, /ready reports when it's done)
+WARMUP_MODES: List[str] = ["off", "startup", "background"]
+
+# Pages that are requested to warm up the domain snapshot, the points and standings they read and the page cache.
+# The pages of single users are left out, their data is shared with the pages of everyone.
+WARMUP_URLS: List[str] = ["/race/Everyone", "/season/Everyone", "/graphs", "/stats", "/result/Current", "/rules"]
+
+
+class WarmupState:
+    def __init__(self):
+        self.ready: bool = False
+        self.started_at: float | None = None
+        self.duration: float | None = None  # Seconds
+        self.errors: List[str] = list()
+
+
+_state: WarmupState = WarmupState()
+
+
+def warm_up() -> None:
+    """
+    Requests the pages (and the chart data) everyone sees first, so they are rendered from warm caches afterwards.
+    Failing pages are reported, but don't prevent the instance from becoming ready, visitors would hit the same errors.
+    """
+    _state.started_at = time.perf_counter()
+    client = app.test_client()
+
+    try:
+        urls: List[str] = list(WARMUP_URLS)
+        with app.test_request_context():
+            # The version is resolved by the redirect, if a write happens in between
+            urls += [url_for("chart_data", version="latest", chart=chart) for chart in CHARTS]
+
+        for url in urls:
+            status: int = client.get(url, follow_redirects=True).status_code
+            if status >= 500:
+                _state.errors.append(f"GET {url} failed with {status}")
+    except Exception as error:
+        _state.errors.append(f"Warm-up failed with {type(error).__name__}: {error}")
+
+    _state.duration = time.perf_counter() - _state.started_at
+    _state.ready = True
+
+    print(f"Warmed up the caches in {_state.duration:.1f}s" + (f" ({len(_state.errors)} errors)" if len(_state.errors) > 0 else ""))
+    for error in _state.errors:
+        print(f"- {error}")
+
+
+def serves_requests() -> bool:
+    """
+    Returns whether this process serves requests: it's a WSGI server (without a click context) or "flask run".
+    Other CLI commands (e.g. "flask build-static" or "flask generate-data") import the app without serving it, they skip the warm-up.
+    """
+    context: click.Context | None = click.get_current_context(silent=True)
+
+    return context is None or context.command.name == "run"
+
+
+def start_warm_up(mode: str) -> None:
+    """
+    Warms up the caches in the given mode. Call this in every worker process, after the database was migrated.
+    With a preloading server (e.g. gunicorn --preload), the background thread doesn't survive the fork, use "startup" then.
+    """
+    if mode not in WARMUP_MODES:
+        raise Exception(f"Unknown warm-up mode \"{mode}\", use one of {', '.join(WARMUP_MODES)}")
+
+    if mode == "off":
+        _state.ready = True
+    elif mode == "startup":
+        warm_up()
+    else:
+        threading.Thread(target=warm_up, name="formula10-warmup", daemon=True).start()
+
+
+@app.route("/ready")
+def ready() -> Response:
+    """
+    Readiness check for load balancers: 200 once the caches are warm, 503 while they are warmed up.
+    """
+    status: Dict[str, Any] = {
+        "ready": _state.ready,
+        "warmup_seconds": round(_state.duration, 3) if _state.duration is not None else None,
+        "errors": _state.errors,
+    }
+
+    return make_response(jsonify(status), 200 if _state.ready else 503)
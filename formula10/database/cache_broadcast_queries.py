@@ -0,0 +1,52 @@
+import json
+from typing import Any, List, Tuple
+from sqlalchemy import func
+
+from formula10.database.model.db_cache_broadcast import DbCacheBroadcast
+from formula10 import db
+
+# Only the most recent broadcasts are kept. Workers that missed older ones rebuild their snapshot from scratch.
+KEPT_BROADCASTS: int = 1000
+
+Broadcast = Tuple[int, List[str], str | None, List[Any]]
+
+
+def add_broadcast(entities: List[str], update_name: str | None, update_args: List[Any]) -> None:
+    """
+    Adds a broadcast to the session without committing it, it's committed together with the write it describes.
+    """
+    db.session.add(DbCacheBroadcast(
+        entities_json=json.dumps(entities),
+        update_name=update_name,
+        update_args_json=json.dumps(update_args),
+    ))
+    db.session.flush()
+
+    db.session.query(DbCacheBroadcast).filter(
+        DbCacheBroadcast.id <= db.session.query(func.max(DbCacheBroadcast.id)).scalar_subquery() - KEPT_BROADCASTS
+    ).delete(synchronize_session=False)
+
+
+def latest_broadcast_id() -> int:
+    return db.session.query(func.max(DbCacheBroadcast.id)).scalar() or 0
+
+
+def broadcasts_after(broadcast_id: int) -> List[Broadcast] | None:
+    """
+    Returns the broadcasts following broadcast_id in order, or None, if some of them were already deleted.
+    """
+    rows: List[DbCacheBroadcast] = (
+        db.session.query(DbCacheBroadcast)
+        .filter(DbCacheBroadcast.id > broadcast_id)
+        .order_by(DbCacheBroadcast.id)
+        .all()
+    )
+
+    # Ids are consecutive, the newest broadcast is never deleted
+    if len(rows) > 0 and rows[0].id != broadcast_id + 1:
+        return None
+
+    return [
+        (row.id, json.loads(row.entities_json), row.update_name, json.loads(row.update_args_json))
+        for row in rows
+    ]
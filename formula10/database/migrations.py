@@ -0,0 +1,92 @@
+import json
+from typing import Dict, List
+from sqlalchemy import inspect, text
+
+from formula10.database.model.db_cache_broadcast import DbCacheBroadcast
+from formula10.database.model.db_driver_race_points import DbDriverRacePoints
+from formula10.database.model.db_race_result import DbRaceResult
+from formula10.database.model.db_race_result_entry import DbRaceResultEntry
+from formula10.database.model.db_team_race_points import DbTeamRacePoints
+from formula10.database.model.db_user_race_points import DbUserRacePoints
+from formula10.database.points_update_queries import materialize_race_points
+from formula10.database.update_queries import race_result_entries
+from formula10 import db
+
+RACE_RESULT_JSON_COLUMNS: List[str] = [
+    "pxx_driver_ids_json",
+    "first_dnf_driver_ids_json",
+    "dnf_driver_ids_json",
+    "excluded_driver_ids_json",
+    "sprint_dnf_driver_ids_json",
+    "sprint_points_json",
+]
+
+
+def migrate_database() -> None:
+    """
+    Upgrades the schema of an existing database. Every migration checks if it is required, so this can run on every startup.
+    """
+    migrate_race_result_entries()
+    migrate_cache_broadcast()
+    migrate_race_points()
+
+
+def migrate_race_result_entries() -> None:
+    """
+    Moves the race result standings from the json columns of "raceresult" into the "raceresultentry" table.
+    """
+    table_names: List[str] = inspect(db.engine).get_table_names()
+    if "raceresult" not in table_names:
+        return
+
+    columns: List[str] = [column["name"] for column in inspect(db.engine).get_columns("raceresult")]
+    if "pxx_driver_ids_json" not in columns:
+        return
+
+    print("Migrating race result standings to table \"raceresultentry\"")
+    DbRaceResultEntry.__table__.create(db.engine, checkfirst=True)  # type: ignore
+
+    rows = db.session.execute(text(f"SELECT race_id, {', '.join(RACE_RESULT_JSON_COLUMNS)} FROM raceresult")).all()
+    for race_id, pxx_json, first_dnf_json, dnf_json, excluded_json, sprint_dnf_json, sprint_pxx_json in rows:
+        pxx: Dict[str, str] = json.loads(pxx_json)
+        sprint_pxx: Dict[str, str] = json.loads(sprint_pxx_json)
+
+        db.session.add_all(race_result_entries(
+            race_id,
+            [pxx[position] for position in sorted(pxx, key=int)],
+            json.loads(first_dnf_json),
+            json.loads(dnf_json),
+            json.loads(excluded_json),
+            [sprint_pxx[position] for position in sorted(sprint_pxx, key=int)],
+            json.loads(sprint_dnf_json),
+        ))
+
+    for column in RACE_RESULT_JSON_COLUMNS:
+        db.session.execute(text(f"ALTER TABLE raceresult DROP COLUMN {column}"))
+
+    db.session.commit()
+
+
+def migrate_cache_broadcast() -> None:
+    """
+    Creates the "cachebroadcast" table, which is used to share writes between workers.
+    """
+    DbCacheBroadcast.__table__.create(db.engine, checkfirst=True)  # type: ignore
+
+
+def migrate_race_points() -> None:
+    """
+    Creates the materialized points tables and fills them from the existing race results.
+    """
+    table_names: List[str] = inspect(db.engine).get_table_names()
+    if "raceresult" not in table_names or "userracepoints" in table_names:
+        return
+
+    print("Materializing race points to tables \"userracepoints\", \"driverracepoints\" and \"teamracepoints\"")
+    for table in (DbUserRacePoints, DbDriverRacePoints, DbTeamRacePoints):
+        table.__table__.create(db.engine, checkfirst=True)  # type: ignore
+
+    for (race_id,) in db.session.query(DbRaceResult.race_id).all():
+        materialize_race_points(race_id)
+
+    db.session.commit()
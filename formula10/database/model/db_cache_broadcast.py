@@ -0,0 +1,25 @@
+from datetime import datetime
+from sqlalchemy import DateTime, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from formula10 import db
+
+
+class DbCacheBroadcast(db.Model):
+    """
+    A write that every worker has to apply to its domain snapshot.
+    It stores the invalidated entities and the in place update (with its arguments) that keeps the points matrices current.
+    """
+    __tablename__ = "cachebroadcast"
+
+    def __init__(self, *, entities_json: str, update_name: str | None, update_args_json: str):
+        self.entities_json = entities_json
+        self.update_name = update_name
+        self.update_args_json = update_args_json
+        self.created = datetime.now()
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    entities_json: Mapped[str] = mapped_column(String(256), nullable=False)
+    update_name: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    update_args_json: Mapped[str] = mapped_column(String(512), nullable=False)
+    created: Mapped[datetime] = mapped_column(DateTime, nullable=False)
@@ -0,0 +1,24 @@
+from sqlalchemy import ForeignKey, Index, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from formula10 import db
+
+
+class DbDriverRacePoints(db.Model):
+    """
+    The points a driver scored in a single race (including fastest lap and sprint).
+    It is derived from the race result, and is updated with it in the same transaction.
+    """
+    __tablename__ = "driverracepoints"
+    __table_args__ = (
+        Index("ix_driverracepoints_race", "race_id"),
+    )
+
+    def __init__(self, *, driver_id: int, race_id: int, points: int):
+        self.driver_id = driver_id  # Primary key
+        self.race_id = race_id  # Primary key
+        self.points = points
+
+    driver_id: Mapped[int] = mapped_column(ForeignKey("driver.id"), primary_key=True)
+    race_id: Mapped[int] = mapped_column(ForeignKey("race.id"), primary_key=True)
+    points: Mapped[int] = mapped_column(Integer, nullable=False)
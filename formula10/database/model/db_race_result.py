@@ -1,14 +1,16 @@
-from sqlalchemy import ForeignKey, String
+from typing import List
+from sqlalchemy import ForeignKey
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from formula10.database.model.db_driver import DbDriver
 
 from formula10.database.model.db_race import DbRace
+from formula10.database.model.db_race_result_entry import DbRaceResultEntry
 from formula10 import db
 
 class DbRaceResult(db.Model):
     """
     The result of a past race.
-    It stores the corresponding race and dictionaries of place-/dnf-order and a list of drivers that are excluded from the standings for this race.
+    It stores the corresponding race and the fastest lap, the standings are stored as DbRaceResultEntry rows (one per driver).
     """
     __tablename__ = "raceresult"
 
@@ -16,15 +18,9 @@ class DbRaceResult(db.Model):
         self.race_id = race_id  # Primary key
 
     race_id: Mapped[int] = mapped_column(ForeignKey("race.id"), primary_key=True)
-    pxx_driver_ids_json: Mapped[str] = mapped_column(String(1024), nullable=False)
-    first_dnf_driver_ids_json: Mapped[str] = mapped_column(String(1024), nullable=False)
-    dnf_driver_ids_json: Mapped[str] = mapped_column(String(1024), nullable=False)
-    excluded_driver_ids_json: Mapped[str] = mapped_column(String(1024), nullable=False)
-
     fastest_lap_id: Mapped[int] = mapped_column(ForeignKey("driver.id"), nullable=False)
-    sprint_dnf_driver_ids_json: Mapped[str] = mapped_column(String(1024), nullable=False)
-    sprint_points_json: Mapped[str] = mapped_column(String(1024), nullable=False)
 
     # Relationships
     race: Mapped[DbRace] = relationship("DbRace", foreign_keys=[race_id])
-    fastest_lap_driver: Mapped[DbDriver] = relationship("DbDriver", foreign_keys=[fastest_lap_id])
\ No newline at end of file
+    fastest_lap_driver: Mapped[DbDriver] = relationship("DbDriver", foreign_keys=[fastest_lap_id])
+    entries: Mapped[List[DbRaceResultEntry]] = relationship("DbRaceResultEntry", cascade="all, delete-orphan")
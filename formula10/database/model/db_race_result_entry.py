@@ -0,0 +1,39 @@
+from sqlalchemy import Boolean, ForeignKey, Index, Integer
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from formula10.database.model.db_driver import DbDriver
+from formula10 import db
+
+
+class DbRaceResultEntry(db.Model):
+    """
+    The placement of a single driver in a past race (and sprint).
+    It stores the race-/sprint-position and the DNF/exclusion flags of this driver.
+    """
+    __tablename__ = "raceresultentry"
+    __table_args__ = (
+        Index("ix_raceresultentry_race_position", "race_id", "position"),
+        Index("ix_raceresultentry_driver_position", "driver_id", "position"),
+    )
+
+    def __init__(self, *, race_id: int, driver_id: int):
+        self.race_id = race_id  # Primary key
+        self.driver_id = driver_id  # Primary key
+        self.position = None
+        self.sprint_position = None
+        self.initial_dnf = False
+        self.dnf = False
+        self.excluded = False
+        self.sprint_dnf = False
+
+    race_id: Mapped[int] = mapped_column(ForeignKey("raceresult.race_id"), primary_key=True)
+    driver_id: Mapped[int] = mapped_column(ForeignKey("driver.id"), primary_key=True)
+    position: Mapped[int | None] = mapped_column(Integer, nullable=True)  # None if the driver isn't in the standing
+    sprint_position: Mapped[int | None] = mapped_column(Integer, nullable=True)  # None if there was no sprint
+    initial_dnf: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    dnf: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    excluded: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    sprint_dnf: Mapped[bool] = mapped_column(Boolean, nullable=False)
+
+    # Relationships
+    driver: Mapped[DbDriver] = relationship("DbDriver", foreign_keys=[driver_id])
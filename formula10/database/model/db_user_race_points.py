@@ -0,0 +1,24 @@
+from sqlalchemy import ForeignKey, Index, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from formula10 import db
+
+
+class DbUserRacePoints(db.Model):
+    """
+    The points a user scored with the guess for a single race.
+    It is derived from the race guess and the race result, and is updated with them in the same transaction.
+    """
+    __tablename__ = "userracepoints"
+    __table_args__ = (
+        Index("ix_userracepoints_race", "race_id"),
+    )
+
+    def __init__(self, *, user_id: int, race_id: int, points: int):
+        self.user_id = user_id  # Primary key
+        self.race_id = race_id  # Primary key
+        self.points = points
+
+    user_id: Mapped[int] = mapped_column(ForeignKey("user.id"), primary_key=True)
+    race_id: Mapped[int] = mapped_column(ForeignKey("race.id"), primary_key=True)
+    points: Mapped[int] = mapped_column(Integer, nullable=False)
@@ -0,0 +1,57 @@
+from typing import List, Tuple
+
+from formula10.database.model.db_driver import DbDriver
+from formula10.database.model.db_driver_race_points import DbDriverRacePoints
+from formula10.database.model.db_race import DbRace
+from formula10.database.model.db_team import DbTeam
+from formula10.database.model.db_team_race_points import DbTeamRacePoints
+from formula10.database.model.db_user import DbUser
+from formula10.database.model.db_user_race_points import DbUserRacePoints
+from formula10 import db
+
+# Reads of the points materialized by points_update_queries.py, these are plain indexed lookups.
+
+
+def stored_user_points(*, race_id: int | None = None, user_id: int | None = None) -> List[Tuple[str, int, int]]:
+    """
+    Returns the stored points of enabled users as (user name, race number, points), optionally only for a single race/user.
+    """
+    query = (db.session.query(DbUser.name, DbRace.number, DbUserRacePoints.points)
+             .join(DbUser, DbUser.id == DbUserRacePoints.user_id)
+             .join(DbRace, DbRace.id == DbUserRacePoints.race_id)
+             .filter(DbUser.enabled == True))
+
+    if race_id is not None:
+        query = query.filter(DbUserRacePoints.race_id == race_id)
+    if user_id is not None:
+        query = query.filter(DbUserRacePoints.user_id == user_id)
+
+    return [(name, number, points) for name, number, points in query.all()]
+
+
+def stored_driver_points(*, race_id: int | None = None) -> List[Tuple[str, int, int]]:
+    """
+    Returns the stored points of drivers as (driver name, race number, points), optionally only for a single race.
+    """
+    query = (db.session.query(DbDriver.name, DbRace.number, DbDriverRacePoints.points)
+             .join(DbDriver, DbDriver.id == DbDriverRacePoints.driver_id)
+             .join(DbRace, DbRace.id == DbDriverRacePoints.race_id))
+
+    if race_id is not None:
+        query = query.filter(DbDriverRacePoints.race_id == race_id)
+
+    return [(name, number, points) for name, number, points in query.all()]
+
+
+def stored_team_points(*, race_id: int | None = None) -> List[Tuple[str, int, int]]:
+    """
+    Returns the stored points of teams as (team name, race number, points), optionally only for a single race.
+    """
+    query = (db.session.query(DbTeam.name, DbRace.number, DbTeamRacePoints.points)
+             .join(DbTeam, DbTeam.id == DbTeamRacePoints.team_id)
+             .join(DbRace, DbRace.id == DbTeamRacePoints.race_id))
+
+    if race_id is not None:
+        query = query.filter(DbTeamRacePoints.race_id == race_id)
+
+    return [(name, number, points) for name, number, points in query.all()]
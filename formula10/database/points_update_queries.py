@@ -0,0 +1,132 @@
+from typing import Any, Dict, List, Tuple
+from sqlalchemy import insert
+from sqlalchemy.orm import selectinload
+
+from formula10.database.model.db_driver_race_points import DbDriverRacePoints
+from formula10.database.model.db_race_guess import DbRaceGuess
+from formula10.database.model.db_race_result import DbRaceResult
+from formula10.database.model.db_team_race_points import DbTeamRacePoints
+from formula10.database.model.db_user_race_points import DbUserRacePoints
+from formula10.domain.domain_registry import DomainRegistry
+from formula10.domain.model.race_guess import RaceGuess
+from formula10.domain.model.race_result import RaceResult
+from formula10.domain.points_model import driver_race_points, race_guess_points, team_race_points
+from formula10 import db
+
+# The points of users, drivers and teams are materialized per race.
+# Writes replace the affected rows before they commit, so the stored points never disagree with the guesses/results.
+
+
+def race_results_by_race_id(race_ids: List[int], registry: DomainRegistry) -> Dict[int, RaceResult]:
+    db_race_results = (db.session.query(DbRaceResult)
+                       .filter(DbRaceResult.race_id.in_(race_ids))
+                       .options(selectinload(DbRaceResult.race), selectinload(DbRaceResult.entries))
+                       .all())
+    return {
+        db_race_result.race_id: RaceResult.from_db_race_result(db_race_result, registry)
+        for db_race_result in db_race_results
+    }
+
+
+def race_guess_rows(**filters: int) -> List[Tuple[int, int, int, int]]:
+    """
+    Returns the race guesses matching the filters as (user_id, race_id, pxx_driver_id, dnf_driver_id) tuples.
+    Scoring only needs the ids, loading full ORM objects (and their users/races) dominated the time of large writes.
+    """
+    return [
+        tuple(row) for row in
+        db.session.query(DbRaceGuess.user_id, DbRaceGuess.race_id, DbRaceGuess.pxx_driver_id, DbRaceGuess.dnf_driver_id)
+        .filter_by(**filters)
+        .all()
+    ]
+
+
+def user_race_points_rows(race_guesses: List[Tuple[int, int, int, int]], registry: DomainRegistry) -> List[Dict[str, int]]:
+    """
+    Scores the race guesses against the results of their races. Guesses for races without result are skipped.
+    The points only depend on the race and the guessed drivers, so every combination is scored once.
+    """
+    race_results: Dict[int, RaceResult] = race_results_by_race_id(
+        list({race_id for _, race_id, _, _ in race_guesses}), registry
+    )
+
+    points_by_guess: Dict[Tuple[int, int, int], int] = dict()
+    rows: List[Dict[str, int]] = list()
+    for user_id, race_id, pxx_driver_id, dnf_driver_id in race_guesses:
+        if race_id not in race_results:
+            continue
+
+        guess: Tuple[int, int, int] = (race_id, pxx_driver_id, dnf_driver_id)
+        if guess not in points_by_guess:
+            # Only the fields used for scoring are set
+            race_guess: RaceGuess = RaceGuess()
+            race_guess.race = race_results[race_id].race
+            race_guess.pxx_guess = registry.driver(pxx_driver_id)
+            race_guess.dnf_guess = registry.driver(dnf_driver_id)
+            points_by_guess[guess] = race_guess_points(race_guess, race_results[race_id])
+
+        rows.append({"user_id": user_id, "race_id": race_id, "points": points_by_guess[guess]})
+
+    return rows
+
+
+def insert_rows(model: Any, rows: List[Dict[str, int]]) -> None:
+    """
+    Inserts the rows as a single executemany statement, without creating ORM objects.
+    """
+    if len(rows) > 0:
+        db.session.execute(insert(model), rows)
+
+
+def materialize_race_points(race_id: int) -> None:
+    """
+    Replaces the stored user, driver and team points of a single race after its result was added/updated.
+    This doesn't commit, so it happens in the same transaction as the write.
+    """
+    db.session.flush()
+    db.session.query(DbUserRacePoints).filter_by(race_id=race_id).delete()
+    db.session.query(DbDriverRacePoints).filter_by(race_id=race_id).delete()
+    db.session.query(DbTeamRacePoints).filter_by(race_id=race_id).delete()
+
+    registry: DomainRegistry = DomainRegistry.from_db()
+    race_result: RaceResult | None = race_results_by_race_id([race_id], registry).get(race_id)
+    if race_result is None:
+        return
+
+    # Guesses of disabled users are scored as well, so their points are present if they are enabled again
+    insert_rows(DbUserRacePoints, user_race_points_rows(race_guess_rows(race_id=race_id), registry))
+
+    driver_ids: Dict[str, int] = {driver.name: driver.id for driver in registry.drivers.values()}
+    driver_points: Dict[str, int] = driver_race_points(race_result)
+    insert_rows(DbDriverRacePoints, [
+        {"driver_id": driver_ids[driver_name], "race_id": race_id, "points": points}
+        for driver_name, points in driver_points.items()
+    ])
+
+    team_ids: Dict[str, int] = {team.name: team.id for team in registry.teams.values()}
+    insert_rows(DbTeamRacePoints, [
+        {"team_id": team_ids[team_name], "race_id": race_id, "points": points}
+        for team_name, points in team_race_points(race_result, driver_points).items()
+    ])
+
+
+def materialize_race_guess_points(race_id: int, user_id: int) -> None:
+    """
+    Replaces the stored points of a single race guess after it was added/updated/deleted.
+    This doesn't commit, so it happens in the same transaction as the write.
+    """
+    db.session.flush()
+    db.session.query(DbUserRacePoints).filter_by(race_id=race_id, user_id=user_id).delete()
+
+    insert_rows(DbUserRacePoints, user_race_points_rows(race_guess_rows(race_id=race_id, user_id=user_id), DomainRegistry.from_db()))
+
+
+def materialize_user_points(user_id: int) -> None:
+    """
+    Replaces the stored points of all race guesses of a single user after it was added/enabled.
+    This doesn't commit, so it happens in the same transaction as the write.
+    """
+    db.session.flush()
+    db.session.query(DbUserRacePoints).filter_by(user_id=user_id).delete()
+
+    insert_rows(DbUserRacePoints, user_race_points_rows(race_guess_rows(user_id=user_id), DomainRegistry.from_db()))
@@ -0,0 +1,123 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List
+from flask import g, has_request_context
+from sqlalchemy import Engine, event
+
+# A statement executed this often within a single request is reported as a possible N+1 pattern,
+# e.g. a lazy relationship load inside a loop over the results of another query
+N_PLUS_ONE_THRESHOLD: int = 5
+
+# The most queries a page may issue when it's rendered on a freshly built domain snapshot (10 of them build the snapshot).
+# Warm requests are answered from the snapshot without any query.
+QUERY_BUDGETS: Dict[str, int] = {
+    "/race/Everyone": 12,
+    "/season/Everyone": 14,
+    "/graphs": 15,
+    "/stats": 13,
+    "/rules": 11,
+    "/result/Current": 11,
+    "/user": 11,
+}
+
+
+class QueryStats:
+    """
+    The queries issued by a single request (or inside recorded_queries), grouped by their statement.
+    Statements only differ in their parameters if the same query is repeated, so repeated statements point to N+1 patterns.
+    """
+
+    def __init__(self):
+        self.count: int = 0
+        self.duration: float = 0.0  # Seconds
+        self.statements: Dict[str, int] = dict()
+
+    def record(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.duration += duration
+        self.statements[statement] = self.statements.get(statement, 0) + 1
+
+    def repeated_statements(self, threshold: int = N_PLUS_ONE_THRESHOLD) -> Dict[str, int]:
+        return {statement: count for statement, count in self.statements.items() if count >= threshold}
+
+    def summary(self) -> str:
+        lines: List[str] = [f"{self.count} queries in {1000 * self.duration:.1f}ms"]
+        for statement, count in sorted(self.statements.items(), key=lambda item: -item[1]):
+            lines.append(f"{count:>5}x {' '.join(statement.split())}")
+
+        return "\n".join(lines)
+
+
+# The stats of recorded_queries blocks, per thread (a test client handles its requests in the calling thread)
+_recorders: threading.local = threading.local()
+
+
+def request_query_stats() -> QueryStats | None:
+    """
+    Returns the stats of the current request, None if it didn't issue any query (or if there is no request).
+    """
+    return g.get("query_stats") if has_request_context() else None
+
+
+def active_query_stats() -> List[QueryStats]:
+    active: List[QueryStats] = list(getattr(_recorders, "stats", []))
+    if has_request_context():
+        active.append(g.setdefault("query_stats", QueryStats()))
+
+    return active
+
+
+# Listens on the Engine class, so the writing and the read-only engine are both counted
+@event.listens_for(Engine, "before_cursor_execute")
+def start_query_timer(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+    conn.info["query_start"] = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def record_query(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+    duration: float = time.perf_counter() - conn.info.pop("query_start", time.perf_counter())
+    for stats in active_query_stats():
+        stats.record(statement, duration)
+
+
+@contextmanager
+def recorded_queries() -> Iterator[QueryStats]:
+    """
+    Records every query issued by the current thread inside the block, including those of test client requests.
+    """
+    stats: QueryStats = QueryStats()
+    if not hasattr(_recorders, "stats"):
+        _recorders.stats = list()
+
+    _recorders.stats.append(stats)
+    try:
+        yield stats
+    finally:
+        _recorders.stats.remove(stats)
+
+
+def assert_query_budget(client: Any, url: str, budget: int) -> QueryStats:
+    """
+    Pytest helper: Requests the url with the flask test client and fails if it issued more than budget queries
+    or repeated a statement at least N_PLUS_ONE_THRESHOLD times.
+    The domain snapshot should be discarded before, otherwise the page is rendered from cached data without any query.
+    """
+    with recorded_queries() as stats:
+        status: int = client.get(url).status_code
+
+    assert status < 500, f"GET {url} failed with {status}"
+    assert stats.count <= budget, f"GET {url} issued more queries than its budget of {budget}: {stats.summary()}"
+    assert len(stats.repeated_statements()) == 0, f"GET {url} repeated statements (N+1): {stats.summary()}"
+
+    return stats
+
+
+def assert_query_budgets(client: Any, budgets: Dict[str, int], before_each: Callable[[], None] | None = None) -> None:
+    """
+    Pytest helper: Asserts the budget of every url, e.g. assert_query_budgets(app.test_client(), QUERY_BUDGETS, discard_snapshot).
+    """
+    for url, budget in budgets.items():
+        if before_each is not None:
+            before_each()
+        assert_query_budget(client, url, budget)
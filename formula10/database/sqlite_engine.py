@@ -0,0 +1,71 @@
+from typing import Any, List
+from flask import has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import Engine, create_engine, event
+
+# Requests with these methods only read, their queries are routed to the read-only engine
+READ_ONLY_METHODS: List[str] = ["GET", "HEAD"]
+
+
+class SqliteSettings:
+    """
+    Connection settings applied to every SQLite connection (see https://www.sqlite.org/pragma.html).
+    """
+
+    def __init__(self, *, journal_mode: str, synchronous: str, cache_size: int, mmap_size: int, busy_timeout: int, read_only_pool: bool):
+        self.journal_mode = journal_mode  # WAL allows readers and a single writer at the same time
+        self.synchronous = synchronous  # NORMAL is safe in WAL mode, FULL syncs on every commit
+        self.cache_size = cache_size  # Pages if positive, KiB if negative
+        self.mmap_size = mmap_size  # Bytes
+        self.busy_timeout = busy_timeout  # Milliseconds to wait for a lock before failing with "database is locked"
+        self.read_only_pool = read_only_pool
+
+
+# The engine GET/HEAD requests read from, None if the read-only pool is disabled
+_read_only_engine: Engine | None = None
+
+
+class RoutingSession(Session):
+    """
+    Session that sends the queries of read-only requests to a separate read-only connection pool,
+    so readers never wait for a pooled connection that is busy writing.
+    """
+
+    def get_bind(self, mapper: Any | None = None, clause: Any | None = None, bind: Any | None = None, **kwargs: Any):
+        if bind is None and _read_only_engine is not None and has_request_context() and request.method in READ_ONLY_METHODS:
+            return _read_only_engine
+
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def apply_pragmas(engine: Engine, settings: SqliteSettings, *, read_only: bool) -> None:
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection: Any, connection_record: Any) -> None:
+        cursor = dbapi_connection.cursor()
+        if not read_only:
+            cursor.execute(f"PRAGMA journal_mode={settings.journal_mode}")  # Persistent, so read-only connections use it as well
+        cursor.execute(f"PRAGMA synchronous={settings.synchronous}")
+        cursor.execute(f"PRAGMA cache_size={settings.cache_size}")
+        cursor.execute(f"PRAGMA mmap_size={settings.mmap_size}")
+        cursor.execute(f"PRAGMA busy_timeout={settings.busy_timeout}")
+        cursor.close()
+
+
+def configure_sqlite(engine: Engine, settings: SqliteSettings) -> None:
+    """
+    Applies the settings to the (writing) engine and creates the read-only engine for the same database file.
+    """
+    global _read_only_engine
+
+    if engine.dialect.name != "sqlite":
+        return
+
+    apply_pragmas(engine, settings, read_only=False)
+
+    # Switch the journal mode right away, the read-only connections can't do it
+    with engine.connect():
+        pass
+
+    if settings.read_only_pool and engine.url.database not in (None, "", ":memory:"):
+        _read_only_engine = create_engine(f"sqlite:///file:{engine.url.database}?mode=ro&uri=true")
+        apply_pragmas(_read_only_engine, settings, read_only=True)
@@ -0,0 +1,232 @@
+import itertools
+import json
+import math
+import random
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Tuple
+from sqlalchemy import insert
+
+from formula10.database.model.db_driver import DbDriver
+from formula10.database.model.db_race import DbRace
+from formula10.database.model.db_race_guess import DbRaceGuess
+from formula10.database.model.db_race_result import DbRaceResult
+from formula10.database.model.db_season_guess import DbSeasonGuess
+from formula10.database.model.db_season_guess_result import DbSeasonGuessResult
+from formula10.database.model.db_team import DbTeam
+from formula10.database.model.db_user import DbUser
+from formula10.database.points_update_queries import materialize_race_points
+from formula10.database.update_queries import race_result_entries
+from formula10 import db
+
+# Generates a synthetic league (for load tests and benchmarks), that satisfies the same invariants as the data entered through the UI.
+
+# Race standings have a fixed number of places (RaceResult.ordered_standing_list and the exclusion check of update_race_result)
+FIELD_SIZE: int = 20
+
+TEAM_NAMES: List[str] = ["Red Bull", "Mercedes", "Ferrari", "McLaren", "Aston Martin", "Alpine", "Williams", "VCARB", "Sauber", "Haas"]
+DRIVER_NAMES: List[Tuple[str, str, str]] = [
+    ("Max Verstappen", "VER", "NL"), ("Sergio Perez", "PER", "MX"), ("Lewis Hamilton", "HAM", "GB"), ("George Russell", "RUS", "GB"),
+    ("Charles Leclerc", "LEC", "MC"), ("Carlos Sainz", "SAI", "ES"), ("Lando Norris", "NOR", "GB"), ("Oscar Piastri", "PIA", "AU"),
+    ("Fernando Alonso", "ALO", "ES"), ("Lance Stroll", "STR", "CA"), ("Pierre Gasly", "GAS", "FR"), ("Esteban Ocon", "OCO", "FR"),
+    ("Alexander Albon", "ALB", "TH"), ("Logan Sargeant", "SAR", "US"), ("Yuki Tsunoda", "TSU", "JP"), ("Daniel Ricciardo", "RIC", "AU"),
+    ("Valtteri Bottas", "BOT", "FI"), ("Zhou Guanyu", "ZHO", "CN"), ("Nico Hulkenberg", "HUL", "DE"), ("Kevin Magnussen", "MAG", "DK"),
+]
+
+# The season standing is fixed to the 2024 championship, so reserve drivers have to be part of it
+RESERVE_DRIVER_NAMES: List[Tuple[str, str, str]] = [
+    ("Oliver Bearman", "BEA", "GB"), ("Franco Colapinto", "COL", "AR"), ("Liam Lawson", "LAW", "NZ"), ("Jack Doohan", "DOO", "AU"),
+]
+
+# Places to guess, with their relative frequency
+PXX_WEIGHTS: Dict[int, int] = {7: 2, 10: 6, 12: 2}
+
+# Number of DNFs in a race, with their relative frequency
+DNF_COUNT_WEIGHTS: Dict[int, int] = {0: 20, 1: 30, 2: 25, 3: 15, 4: 10}
+
+# Rows are inserted in chunks of this size
+INSERT_CHUNK_SIZE: int = 10000
+
+
+class LeagueSettings:
+    """
+    The size of a generated league. The first started_races races lie in the past, all of them except the most recent one have a result.
+    """
+
+    def __init__(self, *, users: int, races: int, started_races: int, teams: int, reserve_drivers: int, guess_rate: float, seed: int):
+        if not 1 <= teams <= FIELD_SIZE:
+            raise Exception(f"The number of teams must be between 1 and {FIELD_SIZE}, the field always has {FIELD_SIZE} drivers")
+        if not 0 <= started_races <= races:
+            raise Exception(f"The number of started races must be between 0 and {races}")
+        if not 0 <= reserve_drivers <= len(RESERVE_DRIVER_NAMES):
+            raise Exception(f"The number of reserve drivers must be between 0 and {len(RESERVE_DRIVER_NAMES)}")
+
+        self.users = users
+        self.races = races
+        self.started_races = started_races
+        self.teams = teams
+        self.reserve_drivers = reserve_drivers
+        self.guess_rate = guess_rate
+        self.seed = seed
+
+
+def bulk_insert(model: Any, rows: List[Dict[str, Any]]) -> None:
+    for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+        db.session.execute(insert(model), rows[start:start + INSERT_CHUNK_SIZE])
+
+
+def weighted_choice(rnd: random.Random, items: List[Any], weights: List[float]) -> Any:
+    return rnd.choices(items, weights=weights, k=1)[0]
+
+
+def generate_league(settings: LeagueSettings) -> None:
+    """
+    Fills an empty database with a synthetic league and materializes its points. This doesn't check the timing constraints of the UI,
+    guesses of started races are generated as if they were entered in time.
+    """
+    rnd: random.Random = random.Random(settings.seed)
+
+    # Teams and drivers. The field is spread over the teams, the strength of a driver is its expected position.
+    team_names: List[str] = [TEAM_NAMES[index] if index < len(TEAM_NAMES) else f"Team {index + 1}" for index in range(settings.teams)]
+    bulk_insert(DbTeam, [{"id": 0, "name": "None"}] + [{"id": index + 1, "name": name} for index, name in enumerate(team_names)])
+
+    driver_rows: List[Dict[str, Any]] = [{"id": 0, "name": "None", "abbr": "None", "team_id": 0, "country_code": "NO", "active": True}]
+    for index in range(FIELD_SIZE + settings.reserve_drivers):
+        name, abbr, country_code = (DRIVER_NAMES + RESERVE_DRIVER_NAMES)[index]
+        driver_rows.append({
+            "id": index + 1,
+            "name": name,
+            "abbr": abbr,
+            "team_id": (index * settings.teams // FIELD_SIZE if index < FIELD_SIZE else index % settings.teams) + 1,
+            "country_code": country_code,
+            "active": index < FIELD_SIZE,
+        })
+    bulk_insert(DbDriver, driver_rows)
+
+    field: List[int] = list(range(1, FIELD_SIZE + 1))
+    team_drivers: Dict[int, List[int]] = {team_id: [row["id"] for row in driver_rows[1:FIELD_SIZE + 1] if row["team_id"] == team_id]
+                                          for team_id in range(1, settings.teams + 1)}
+    strength: Dict[int, float] = {driver_id: driver_id + rnd.gauss(0, 2) for driver_id in field}
+    expected_position: Dict[int, int] = {driver_id: position + 1 for position, driver_id in enumerate(sorted(field, key=lambda driver_id: strength[driver_id]))}
+
+    # Users, some of them were deleted (disabled)
+    bulk_insert(DbUser, [{"id": user_id, "name": f"User{user_id}", "enabled": rnd.random() >= 0.02} for user_id in range(1, settings.users + 1)])
+
+    # Races, one to three weeks apart with a sprint in every fourth race on average. The last started race was three days ago.
+    offsets: List[int] = list(itertools.accumulate([0] + [rnd.choice([7, 14, 14, 21]) for _ in range(settings.races - 1)]))
+    now: datetime = datetime.now().replace(minute=0, second=0, microsecond=0)
+    first_date: datetime = now - timedelta(days=3 + offsets[settings.started_races - 1]) if settings.started_races > 0 else now + timedelta(days=7)
+
+    race_rows: List[Dict[str, Any]] = list()
+    for number in range(1, settings.races + 1):
+        date: datetime = first_date + timedelta(days=offsets[number - 1])
+        race_rows.append({
+            "id": number,
+            "name": f"Race {number}",
+            "number": number,
+            "date": date,
+            "quali_date": date - timedelta(days=1),
+            "pxx": weighted_choice(rnd, list(PXX_WEIGHTS), list(PXX_WEIGHTS.values())),
+            "has_sprint": rnd.random() < 0.25,
+        })
+    bulk_insert(DbRace, race_rows)
+
+    # Race results, the result of the most recent race is still missing (unless the season is over)
+    result_race_ids: List[int] = list(range(1, settings.started_races + (1 if settings.started_races == settings.races else 0)))
+    for race_id in result_race_ids:
+        add_race_result(rnd, race_id, race_rows[race_id - 1]["has_sprint"], field, strength)
+
+    # Race guesses for the started races and the next one. Picks are drawn around the drivers expected at the place to guess.
+    guess_race_ids: List[int] = list(range(1, min(settings.started_races + 1, settings.races) + 1))
+    pxx_weights: Dict[int, List[float]] = {
+        pxx: list(itertools.accumulate(math.exp(-abs(expected_position[driver_id] - pxx) / 2) for driver_id in field)) for pxx in PXX_WEIGHTS
+    }
+    dnf_candidates: List[int] = [0] + field  # The None driver is a valid DNF pick
+    dnf_weights: List[float] = list(itertools.accumulate([3.0] + [0.5 + expected_position[driver_id] / FIELD_SIZE for driver_id in field]))
+
+    race_guess_rows: List[Dict[str, Any]] = list()
+    for user_id in range(1, settings.users + 1):
+        participation: float = min(1.0, settings.guess_rate * rnd.uniform(0.7, 1.3))
+        for race_id in guess_race_ids:
+            if rnd.random() < participation:
+                race_guess_rows.append({
+                    "user_id": user_id,
+                    "race_id": race_id,
+                    "pxx_driver_id": rnd.choices(field, cum_weights=pxx_weights[race_rows[race_id - 1]["pxx"]], k=1)[0],
+                    "dnf_driver_id": rnd.choices(dnf_candidates, cum_weights=dnf_weights, k=1)[0],
+                })
+    bulk_insert(DbRaceGuess, race_guess_rows)
+
+    # Season guesses (entered before the first race) and their manually evaluated results (after the season)
+    add_season_guesses(rnd, settings, field, team_drivers, expected_position)
+
+    for race_id in result_race_ids:
+        materialize_race_points(race_id)
+
+    db.session.commit()
+
+
+def add_race_result(rnd: random.Random, race_id: int, has_sprint: bool, field: List[int], strength: Dict[int, float]) -> None:
+    """
+    Adds a result that update_race_result would accept: DNFs drop to the back of the classified drivers, the first DNFs are contained in the DNFs
+    and excluded drivers (DSQ/DNS) take the last places.
+    """
+    standing: List[int] = sorted(field, key=lambda driver_id: strength[driver_id] + rnd.gauss(0, 4))
+
+    excluded: List[int] = standing[-rnd.choice([1, 2]):] if rnd.random() < 0.05 else list()
+    classified: List[int] = [driver_id for driver_id in standing if driver_id not in excluded]
+
+    dnfs: List[int] = rnd.sample(classified, weighted_choice(rnd, list(DNF_COUNT_WEIGHTS), list(DNF_COUNT_WEIGHTS.values())))
+    first_dnfs: List[int] = dnfs[:2 if len(dnfs) >= 2 and rnd.random() < 0.1 else 1]
+    standing = [driver_id for driver_id in classified if driver_id not in dnfs] + dnfs + excluded
+
+    sprint_standing: List[int] = list()
+    sprint_dnfs: List[int] = list()
+    if has_sprint:
+        sprint_standing = sorted(field, key=lambda driver_id: strength[driver_id] + rnd.gauss(0, 4))
+        sprint_dnfs = sprint_standing[FIELD_SIZE - rnd.choice([0, 1, 1, 2]):]
+
+    race_result: DbRaceResult = DbRaceResult(race_id=race_id)
+    race_result.fastest_lap_id = rnd.choice(standing[:10])
+    db.session.add(race_result)
+    db.session.add_all(race_result_entries(race_id, [str(driver_id) for driver_id in standing], [str(driver_id) for driver_id in first_dnfs],
+                                           [str(driver_id) for driver_id in dnfs], [str(driver_id) for driver_id in excluded],
+                                           [str(driver_id) for driver_id in sprint_standing], [str(driver_id) for driver_id in sprint_dnfs]))
+
+
+def add_season_guesses(rnd: random.Random, settings: LeagueSettings, field: List[int], team_drivers: Dict[int, List[int]], expected_position: Dict[int, int]) -> None:
+    front_weights: List[float] = [1 / expected_position[driver_id] for driver_id in field]
+    back_weights: List[float] = [expected_position[driver_id] for driver_id in field]
+    team_ids: List[int] = list(team_drivers)
+    team_weights: List[float] = [1 / team_id for team_id in team_ids]
+
+    season_guess_rows: List[Dict[str, Any]] = list()
+    for user_id in range(1, settings.users + 1):
+        if rnd.random() >= 0.95:
+            continue
+
+        podiums: List[int] = list()
+        podium_count: int = rnd.randint(3, 6)
+        while len(podiums) < podium_count:
+            driver_id: int = rnd.choices(field, weights=front_weights, k=1)[0]
+            if driver_id not in podiums:
+                podiums.append(driver_id)
+
+        season_guess_rows.append({
+            "user_id": user_id,
+            "hot_take": f"Hot take of User{user_id}",
+            "p2_team_id": rnd.choices(team_ids, weights=team_weights, k=1)[0],
+            "overtake_driver_id": rnd.choice(field),
+            "dnf_driver_id": rnd.choices(field, weights=back_weights, k=1)[0],
+            "gained_driver_id": rnd.choices(field, weights=back_weights, k=1)[0],
+            "lost_driver_id": rnd.choices(field, weights=front_weights, k=1)[0],
+            "team_winners_driver_ids_json": json.dumps([str(min(drivers, key=lambda driver_id: expected_position[driver_id] + rnd.gauss(0, 3)))
+                                                        for drivers in team_drivers.values()]),
+            "podium_drivers_driver_ids_json": json.dumps([str(driver_id) for driver_id in podiums]),
+        })
+    bulk_insert(DbSeasonGuess, season_guess_rows)
+
+    if settings.started_races == settings.races:
+        bulk_insert(DbSeasonGuessResult, [
+            {"user_id": row["user_id"], "hot_take_correct": rnd.random() < 0.2, "overtakes_correct": rnd.random() < 0.1}
+            for row in season_guess_rows
+        ])
@@ -9,9 +9,14 @@ from formula10.database.common_queries import race_has_result, user_exists_and_d
 from formula10.database.model.db_race import DbRace
 from formula10.database.model.db_race_guess import DbRaceGuess
 from formula10.database.model.db_race_result import DbRaceResult
+from formula10.database.model.db_race_result_entry import DbRaceResultEntry
 from formula10.database.model.db_season_guess import DbSeasonGuess
 from formula10.database.model.db_user import DbUser
-from formula10.database.validation import any_is_none, positions_are_contiguous, race_has_started
+from formula10.database.points_update_queries import materialize_race_guess_points, materialize_race_points, materialize_user_points
+from formula10.database.validation import any_is_none, positions_are_contiguous
+from formula10.domain.cache_invalidator import cache_invalidate_race_guess_updated, cache_invalidate_race_result_updated, cache_invalidate_season_guess_updated, cache_invalidate_user_updated
+from formula10.domain.domain_model import Model
+from formula10.domain.domain_snapshot import commit_writes
 from formula10 import ENABLE_TIMING, db
 
 
@@ -26,7 +31,7 @@ def find_or_create_race_guess(user_id: int, race_id: int) -> DbRaceGuess:
     race_guess.pxx_driver_id = 9999
     race_guess.dnf_driver_id = 9999
     db.session.add(race_guess)
-    db.session.commit()
+    db.session.flush()
 
     # Double check if database insertion worked and obtain any values set by the database
     race_guess = db.session.query(DbRaceGuess).filter_by(user_id=user_id, race_id=race_id).first()
@@ -40,7 +45,7 @@ def update_race_guess(race_id: int, user_id: int, pxx_select_id: int | None, dnf
     if any_is_none(pxx_select_id, dnf_select_id):
         return error_redirect(f"Picks for race \"{race_id}\" were not saved, because you did not fill all the fields.")
 
-    if ENABLE_TIMING and race_has_started(race_id=race_id):
+    if ENABLE_TIMING and Model.race_calendar().has_started(race_id=race_id):
         return error_redirect(f"No picks for race \"{race_id}\" can be entered, as this race has already started.")
 
     if race_has_result(race_id):
@@ -52,15 +57,17 @@ def update_race_guess(race_id: int, user_id: int, pxx_select_id: int | None, dnf
     race_guess: DbRaceGuess = find_or_create_race_guess(user_id, race_id)
     race_guess.pxx_driver_id = pxx_driver_id
     race_guess.dnf_driver_id = dnf_driver_id
+    materialize_race_guess_points(race_id, user_id)
 
-    db.session.commit()
+    cache_invalidate_race_guess_updated(race_guess.race.name, race_guess.user.name)
+    commit_writes()
 
     return redirect("/race/Everyone")
 
 
 def delete_race_guess(race_id: int, user_id: int) -> Response:
     # Don't change guesses that are already over
-    if ENABLE_TIMING and race_has_started(race_id=race_id):
+    if ENABLE_TIMING and Model.race_calendar().has_started(race_id=race_id):
         return error_redirect(f"No picks for race with id \"{race_id}\" can be deleted, as this race has already started.")
 
     if race_has_result(race_id):
@@ -68,7 +75,10 @@ def delete_race_guess(race_id: int, user_id: int) -> Response:
 
     # Does not throw if row doesn't exist
     db.session.query(DbRaceGuess).filter_by(race_id=race_id, user_id=user_id).delete()
-    db.session.commit()
+    materialize_race_guess_points(race_id, user_id)
+
+    cache_invalidate_race_guess_updated(db.session.get_one(DbRace, race_id).name, db.session.get_one(DbUser, user_id).name)
+    commit_writes()
 
     return redirect("/race/Everyone")
 
@@ -84,7 +94,7 @@ def find_or_create_season_guess(user_id: int) -> DbSeasonGuess:
     season_guess.team_winners_driver_ids_json=json.dumps(["9999"])
     season_guess.podium_drivers_driver_ids_json=json.dumps(["9999"])
     db.session.add(season_guess)
-    db.session.commit()
+    db.session.flush()
 
     # Double check if database insertion worked and obtain any values set by the database
     season_guess = db.session.query(DbSeasonGuess).filter_by(user_id=user_id).first()
@@ -97,7 +107,7 @@ def find_or_create_season_guess(user_id: int) -> DbSeasonGuess:
 def update_season_guess(user_id: int, guesses: List[str | None], team_winner_guesses: List[str | None], podium_driver_guesses: List[str]) -> Response:
     # Pylance marks type errors here, but those are intended. Columns are marked nullable.
 
-    if ENABLE_TIMING and race_has_started(race_id=1):
+    if ENABLE_TIMING and Model.race_calendar().has_started(race_id=1):
         return error_redirect("No season picks can be entered, as the season has already begun!")
 
     season_guess: DbSeasonGuess = find_or_create_season_guess(user_id)
@@ -110,7 +120,8 @@ def update_season_guess(user_id: int, guesses: List[str | None], team_winner_gue
     season_guess.team_winners_driver_ids_json = json.dumps(team_winner_guesses)
     season_guess.podium_drivers_driver_ids_json = json.dumps(podium_driver_guesses)
 
-    db.session.commit()
+    cache_invalidate_season_guess_updated()
+    commit_writes()
 
     return redirect(f"/season/Everyone")
 
@@ -122,17 +133,10 @@ def find_or_create_race_result(race_id: int) -> DbRaceResult:
         return race_result
 
     race_result = DbRaceResult(race_id=race_id)
-    race_result.pxx_driver_ids_json = json.dumps(["9999"])
-    race_result.first_dnf_driver_ids_json = json.dumps(["9999"])
-    race_result.dnf_driver_ids_json = json.dumps(["9999"])
-    race_result.excluded_driver_ids_json = json.dumps(["9999"])
-
     race_result.fastest_lap_id = 9999
-    race_result.sprint_dnf_driver_ids_json = json.dumps([])
-    race_result.sprint_points_json = json.dumps({})
 
     db.session.add(race_result)
-    db.session.commit()
+    db.session.flush()
 
     # Double check if database insertion worked and obtain any values set by the database
     race_result = db.session.query(DbRaceResult).filter_by(race_id=race_id).first()
@@ -142,16 +146,46 @@ def find_or_create_race_result(race_id: int) -> DbRaceResult:
     return race_result
 
 
+def race_result_entries(race_id: int, pxx_driver_ids_list: List[str], first_dnf_driver_ids_list: List[str], dnf_driver_ids_list: List[str], excluded_driver_ids_list: List[str],
+                        sprint_pxx_driver_ids_list: List[str], sprint_dnf_driver_ids_list: List[str]) -> List[DbRaceResultEntry]:
+    """
+    Builds a DbRaceResultEntry for every driver that is mentioned in any of the lists.
+    Positions are given by the order of the standing lists.
+    """
+    entries: Dict[int, DbRaceResultEntry] = dict()
+
+    def entry(driver_id: str) -> DbRaceResultEntry:
+        if int(driver_id) not in entries:
+            entries[int(driver_id)] = DbRaceResultEntry(race_id=race_id, driver_id=int(driver_id))
+
+        return entries[int(driver_id)]
+
+    for position, driver_id in enumerate(pxx_driver_ids_list):
+        entry(driver_id).position = position + 1
+
+    for position, driver_id in enumerate(sprint_pxx_driver_ids_list):
+        entry(driver_id).sprint_position = position + 1
+
+    for driver_id in first_dnf_driver_ids_list:
+        entry(driver_id).initial_dnf = True
+
+    for driver_id in dnf_driver_ids_list:
+        entry(driver_id).dnf = True
+
+    for driver_id in excluded_driver_ids_list:
+        entry(driver_id).excluded = True
+
+    for driver_id in sprint_dnf_driver_ids_list:
+        entry(driver_id).sprint_dnf = True
+
+    return list(entries.values())
+
+
 def update_race_result(race_id: int, pxx_driver_ids_list: List[str], first_dnf_driver_ids_list: List[str], dnf_driver_ids_list: List[str], excluded_driver_ids_list: List[str],
                        fastest_lap_driver_id: int, sprint_pxx_driver_ids_list: List[str], sprint_dnf_driver_ids_list: List[str]) -> Response:
-    if ENABLE_TIMING and not race_has_started(race_id=race_id):
+    if ENABLE_TIMING and not Model.race_calendar().has_started(race_id=race_id):
         return error_redirect("No race result can be entered, as the race has not begun!")
 
-    # Use strings as keys, as these dicts will be serialized to json
-    pxx_driver_ids: Dict[str, str] = {
-        str(position + 1): driver_id for position, driver_id in enumerate(pxx_driver_ids_list)
-    }
-
     # Not counted drivers have to be at the end
     excluded_driver_ids: Dict[str, str] = {
         str(position + 1): driver_id for position, driver_id in enumerate(pxx_driver_ids_list)
@@ -170,26 +204,22 @@ def update_race_result(race_id: int, pxx_driver_ids_list: List[str], first_dnf_d
         return error_redirect("Race result was not saved, as there cannot be DNFs without (an) initial DNF(s)!")
 
     race_result: DbRaceResult = find_or_create_race_result(race_id)
-    race_result.pxx_driver_ids_json = json.dumps(pxx_driver_ids)
-    race_result.first_dnf_driver_ids_json = json.dumps(first_dnf_driver_ids_list)
-    race_result.dnf_driver_ids_json = json.dumps(dnf_driver_ids_list)
-    race_result.excluded_driver_ids_json = json.dumps(excluded_driver_ids_list)
-
-    # Extra stats for points calculation
-    sprint_pxx_driver_ids: Dict[str, str] = {
-        str(position + 1): driver_id for position, driver_id in enumerate(sprint_pxx_driver_ids_list)
-    }
-
     race_result.fastest_lap_id = fastest_lap_driver_id
-    race_result.sprint_dnf_driver_ids_json = json.dumps(sprint_dnf_driver_ids_list)
-    race_result.sprint_points_json = json.dumps(sprint_pxx_driver_ids)
 
-    db.session.commit()
+    # Replace the previous standing. Flush the deletions first, as the new rows reuse the primary keys.
+    race_result.entries.clear()
+    db.session.flush()
+    race_result.entries.extend(race_result_entries(race_id, pxx_driver_ids_list, first_dnf_driver_ids_list, dnf_driver_ids_list,
+                                                   excluded_driver_ids_list, sprint_pxx_driver_ids_list, sprint_dnf_driver_ids_list))
+    materialize_race_points(race_id)
 
     race: DbRace | None = db.session.query(DbRace).filter_by(id=race_id).first()
     if race is None:
         raise Exception(f"Could not find DbRace with id {race_id}")
 
+    cache_invalidate_race_result_updated(race.name)
+    commit_writes()
+
     return redirect(f"/result/{quote(race.name)}")
 
 
@@ -216,14 +246,18 @@ def update_user(user_name: str | None, add: bool = False, delete: bool = False)
                 raise Exception("update_user couldn't reenable user")
 
             disabled_user.enabled = True
+            materialize_user_points(disabled_user.id)
 
         else:
             user: DbUser = DbUser(id=None)
             user.name = user_name
             user.enabled = True
             db.session.add(user)
+            db.session.flush()
+            materialize_user_points(user.id)
 
-        db.session.commit()
+        cache_invalidate_user_updated(user_name)
+        commit_writes()
 
         return redirect("/user")
 
@@ -237,7 +271,9 @@ def update_user(user_name: str | None, add: bool = False, delete: bool = False)
                 raise Exception("update_user couldn't disable user")
 
             enabled_user.enabled = False
-            db.session.commit()
+
+            cache_invalidate_user_updated(user_name)
+            commit_writes()
 
         else:
             return error_redirect(f"User \"{user_name}\" was not deleted, because it does not exist!")
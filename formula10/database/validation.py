@@ -1,11 +1,7 @@
-from datetime import datetime
-from typing import Any, Callable, Iterable, List, TypeVar, overload
-
-from formula10.database.model.db_race import DbRace
-from formula10 import db
-from formula10.domain.model.race import Race
+from typing import Any, Callable, Dict, Iterable, List, TypeVar
 
 _T = TypeVar("_T")
+_K = TypeVar("_K")
 
 
 def any_is_none(*args: Any) -> bool:
@@ -26,28 +22,6 @@ def positions_are_contiguous(positions: List[str]) -> bool:
     # [2, 3, 4, 5]: 2 + 3 == 5
     return positions_sorted[0] + len(positions_sorted) - 1 == positions_sorted[-1]
 
-@overload
-def race_has_started(*, race: Race) -> bool:
-    return race_has_started(race=race)
-
-@overload
-def race_has_started(*, race_id: int) -> bool:
-    return race_has_started(race_id=race_id)
-
-def race_has_started(*, race: Race | None = None, race_id: int | None = None) -> bool:
-    if race is None and race_id is not None:
-        _race: DbRace | None = db.session.query(DbRace).filter_by(id=race_id).first()
-
-        if _race is None:
-            raise Exception(f"Couldn't obtain race with id {race_id} to check date")
-
-        return datetime.now() > _race.date
-
-    if race is not None and race_id is None:
-        return datetime.now() > race.date
-
-    raise Exception("race_has_started received illegal arguments")
-
 
 def find_first_else_none(predicate: Callable[[_T], bool], iterable: Iterable[_T]) -> _T | None:
     """
@@ -112,4 +86,34 @@ def find_single_or_none_strict(predicate: Callable[[_T], bool], iterable: Iterab
     if len(filtered) > 1:
         raise Exception(f"find_single_or_none found {len(list(filtered))} matching elements but expected 0 or 1")
 
-    return filtered[0] if len(filtered) == 1 else None
\ No newline at end of file
+    return filtered[0] if len(filtered) == 1 else None
+
+
+def index_single_strict(key: Callable[[_T], _K], iterable: Iterable[_T]) -> Dict[_K, _T]:
+    """
+    Maps the elements of a sequence to their keys.
+    Throws exception if more than a single element is found for a key.
+    """
+    index: Dict[_K, _T] = dict()
+
+    for element in iterable:
+        _key: _K = key(element)
+        if _key in index:
+            raise Exception(f"index_single found multiple elements for key {_key} but expected 1")
+
+        index[_key] = element
+
+    return index
+
+
+def index_multiple(key: Callable[[_T], _K], iterable: Iterable[_T]) -> Dict[_K, List[_T]]:
+    """
+    Maps the elements of a sequence to their keys, multiple elements can share a key.
+    The order of the sequence is kept for each key.
+    """
+    index: Dict[_K, List[_T]] = dict()
+
+    for element in iterable:
+        index.setdefault(key(element), []).append(element)
+
+    return index
\ No newline at end of file
@@ -0,0 +1,138 @@
+import functools
+import inspect
+from typing import Any, Callable, Dict, Hashable, List, TypeVar
+
+from formula10.domain.cache_metrics import metric_name, record_hit, timed_miss
+from formula10.domain.domain_snapshot import CacheDependency, DomainSnapshot, pinned_snapshot, preload, register_update, stage_write
+
+_F = TypeVar("_F", bound=Callable)
+
+# Entities that cached methods can depend on. Writes invalidate them by calling invalidate(...).
+USERS: str = "users"
+RACES: str = "races"
+DRIVERS: str = "drivers"
+TEAMS: str = "teams"
+RACE_GUESSES: str = "race_guesses"
+RACE_RESULTS: str = "race_results"
+SEASON_GUESSES: str = "season_guesses"
+SEASON_GUESS_RESULTS: str = "season_guess_results"
+
+ENTITIES: List[str] = [USERS, RACES, DRIVERS, TEAMS, RACE_GUESSES, RACE_RESULTS, SEASON_GUESSES, SEASON_GUESS_RESULTS]
+
+# Registered cached methods, by (decorated) function
+_dependencies: Dict[Callable, CacheDependency] = dict()
+
+
+def validate_entities(entities: List[str]) -> None:
+    for entity in entities:
+        if entity not in ENTITIES:
+            raise Exception(f"Unknown cache dependency \"{entity}\"")
+
+
+def snapshot_lookup(key: Hashable, dependency: CacheDependency, compute: Callable[[], Any]) -> Any:
+    """
+    Returns the value stored under the key in the pinned snapshot, computing and storing it first if it's missing.
+    Hits and misses are counted in the cache metrics.
+    """
+    snapshot: DomainSnapshot = pinned_snapshot()
+    entry = snapshot.values.get(key)
+    if entry is not None:
+        record_hit(metric_name(key))
+        return entry[1]
+
+    value: Any = timed_miss(metric_name(key), compute)
+    snapshot.store(key, dependency, value)
+
+    return value
+
+
+def cached(key_prefix: str, *, depends_on: List[str], updated_in_place: bool = False, preloaded: bool = False) -> Callable[[_F], _F]:
+    """
+    Stores the return value of a method without arguments in the pinned snapshot and registers the entities it reads.
+    Preloaded methods are called whenever a snapshot is built (this is used for the methods loading entities from the database).
+    """
+    validate_entities(depends_on)
+
+    def decorator(f: _F) -> _F:
+        dependency: CacheDependency = CacheDependency(f.__qualname__, depends_on, updated_in_place)
+
+        @functools.wraps(f)
+        def cached_f(*args: Any) -> Any:
+            return snapshot_lookup(key_prefix, dependency, lambda: f(*args))
+
+        _dependencies[cached_f] = dependency
+        if preloaded:
+            preload(cached_f)
+
+        return cached_f  # type: ignore
+
+    return decorator
+
+
+def memoized(*, depends_on: List[str]) -> Callable[[_F], _F]:
+    """
+    Stores the return value of a method per argument combination in the pinned snapshot and registers the entities it reads.
+    """
+    validate_entities(depends_on)
+
+    def decorator(f: _F) -> _F:
+        dependency: CacheDependency = CacheDependency(f.__qualname__, depends_on, False)
+        ignore_self: bool = next(iter(inspect.signature(f).parameters), None) == "self"
+
+        @functools.wraps(f)
+        def memoized_f(*args: Any, **kwargs: Any) -> Any:
+            key: Hashable = (f.__qualname__, args[1:] if ignore_self else args, tuple(sorted(kwargs.items())))
+
+            return snapshot_lookup(key, dependency, lambda: f(*args, **kwargs))
+
+        _dependencies[memoized_f] = dependency
+
+        return memoized_f  # type: ignore
+
+    return decorator
+
+
+# Dependencies of the values stored by cached_value, by entities
+_value_dependencies: Dict[str, CacheDependency] = dict()
+
+
+def cached_value(key: Hashable, compute: Callable[[], Any], *, depends_on: List[str]) -> Any:
+    """
+    Stores a value that isn't computed by a method (e.g. rendered html) in the pinned snapshot under an explicit key.
+    """
+    name: str = ",".join(depends_on)
+    if name not in _value_dependencies:
+        validate_entities(depends_on)
+        _value_dependencies[name] = CacheDependency(f"cached_value({name})", depends_on, False)
+
+    return snapshot_lookup(key, _value_dependencies[name], compute)
+
+
+def snapshot_value(key_prefix: str) -> Any | None:
+    """
+    Returns the value a cached method stored in the pinned snapshot, or None, if it wasn't computed yet.
+    """
+    entry = pinned_snapshot().values.get(key_prefix)
+
+    return entry[1] if entry is not None else None
+
+
+def snapshot_update(f: _F) -> _F:
+    """
+    Registers a function that updates the values of a new snapshot in place, so it can be passed to invalidate.
+    """
+    register_update(f)
+
+    return f
+
+
+def invalidate(*entities: str, update: Callable[..., None] | None = None, args: List[Any] | None = None) -> None:
+    """
+    Replaces the current snapshot by a new one, that doesn't contain the values depending on any of the entities.
+    Values that are updated in place are copied and can be modified by update(*args), before the new snapshot is swapped in.
+    The arguments have to be JSON serializable, because the write may be broadcast to other workers.
+    It's called before the write is committed, the snapshot is replaced once commit_writes committed it.
+    """
+    validate_entities(list(entities))
+
+    stage_write(list(entities), update.__name__ if update is not None else None, args if args is not None else list())
@@ -0,0 +1,119 @@
+import sys
+import time
+from typing import Any, Callable, Dict, Hashable, List, Set, Tuple
+
+# Counters are updated without a lock, a rarely lost increment under concurrent requests is acceptable for metrics.
+
+
+class CacheMetrics:
+    """
+    Hits, misses, recompute time and invalidations of a single cached method, memoized method or kind of cached value.
+    """
+
+    def __init__(self):
+        self.hits: int = 0
+        self.misses: int = 0
+        self.recompute_seconds: float = 0.0  # Includes the time of the cached methods called while recomputing
+        self.max_recompute_seconds: float = 0.0
+        self.invalidations: int = 0
+
+
+# Metrics by name, see metric_name
+_metrics: Dict[str, CacheMetrics] = dict()
+
+
+def metric_name(key: Hashable) -> str:
+    """
+    Returns the name a snapshot value is counted under: the key prefix of cached methods,
+    the qualified name of memoized methods and the kind ("page", "fragment", "chart") of cached values.
+    """
+    if isinstance(key, tuple) and len(key) > 0:
+        return str(key[0])
+
+    return str(key)
+
+
+def metrics(name: str) -> CacheMetrics:
+    if name not in _metrics:
+        _metrics[name] = CacheMetrics()
+
+    return _metrics[name]
+
+
+def record_hit(name: str) -> None:
+    metrics(name).hits += 1
+
+
+def timed_miss(name: str, compute: Callable[[], Any]) -> Any:
+    """
+    Computes a missing value and records the miss with the time it took.
+    """
+    start: float = time.perf_counter()
+    value: Any = compute()
+    duration: float = time.perf_counter() - start
+
+    name_metrics: CacheMetrics = metrics(name)
+    name_metrics.misses += 1
+    name_metrics.recompute_seconds += duration
+    name_metrics.max_recompute_seconds = max(name_metrics.max_recompute_seconds, duration)
+
+    return value
+
+
+def record_invalidation(key: Hashable) -> None:
+    metrics(metric_name(key)).invalidations += 1
+
+
+def reset_metrics() -> None:
+    _metrics.clear()
+
+
+def deep_size(value: Any, seen: Set[int]) -> int:
+    """
+    Returns the approximate memory size of a value in bytes, including the containers and formula10 objects it references.
+    Objects already in seen are not counted again, so objects shared by several values are counted once.
+    """
+    size: int = 0
+    stack: List[Any] = [value]
+
+    while len(stack) > 0:
+        current: Any = stack.pop()
+        if id(current) in seen:
+            continue
+
+        seen.add(id(current))
+        size += sys.getsizeof(current)
+
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            stack.extend(current)
+        elif type(current).__module__.startswith("formula10"):
+            if hasattr(current, "__dict__"):
+                stack.append(current.__dict__)
+            for slot in getattr(type(current), "__slots__", ()):
+                if hasattr(current, slot):
+                    stack.append(getattr(current, slot))
+
+    return size
+
+
+def entry_sizes(entries: List[Tuple[Hashable, Tuple[Any, Any]]]) -> Dict[str, Tuple[int, int]]:
+    """
+    Returns the number of entries and their approximate size in bytes by name, for the entries of a snapshot (see DomainSnapshot.entries).
+    Objects shared by several entries (e.g. the domain entities) are counted for the first one only.
+    """
+    sizes: Dict[str, Tuple[int, int]] = dict()
+    seen: Set[int] = set()
+
+    for key, (_, value) in entries:
+        name: str = metric_name(key)
+        entries, size = sizes.get(name, (0, 0))
+        sizes[name] = (entries + 1, size + deep_size(value, seen))
+
+    return sizes
+
+
+def metrics_snapshot() -> Dict[str, CacheMetrics]:
+    return dict(_metrics)
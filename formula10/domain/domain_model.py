@@ -1,15 +1,16 @@
-from typing import Callable, Dict, List, overload
-from sqlalchemy import desc
+from typing import Callable, Dict, List, Set, overload
+from sqlalchemy import Integer, cast, desc, func
+from sqlalchemy.orm import contains_eager, selectinload
 
-from formula10.database.model.db_driver import DbDriver
 from formula10.database.model.db_race import DbRace
 from formula10.database.model.db_race_guess import DbRaceGuess
 from formula10.database.model.db_race_result import DbRaceResult
+from formula10.database.model.db_race_result_entry import DbRaceResultEntry
 from formula10.database.model.db_season_guess import DbSeasonGuess
 from formula10.database.model.db_season_guess_result import DbSeasonGuessResult
-from formula10.database.model.db_team import DbTeam
 from formula10.database.model.db_user import DbUser
-from formula10.database.validation import find_multiple_strict, find_single_or_none_strict, find_single_strict, find_atleast_strict
+from formula10.database.validation import find_multiple_strict, find_atleast_strict, index_multiple, index_single_strict
+from formula10.domain.domain_registry import DomainRegistry
 from formula10.domain.model.driver import NONE_DRIVER, Driver
 from formula10.domain.model.race import Race
 from formula10.domain.model.race_guess import RaceGuess
@@ -18,12 +19,22 @@ from formula10.domain.model.season_guess import SeasonGuess
 from formula10.domain.model.season_guess_result import SeasonGuessResult
 from formula10.domain.model.team import NONE_TEAM, Team
 from formula10.domain.model.user import User
-from formula10 import db, cache
+from formula10.domain.race_calendar import RaceCalendar
+from formula10.domain.cache_dependencies import DRIVERS, RACE_GUESSES, RACE_RESULTS, RACES, SEASON_GUESS_RESULTS, SEASON_GUESSES, TEAMS, USERS, cached, memoized
+from formula10 import db
 
 
 class Model:
     @staticmethod
-    @cache.cached(timeout=None, key_prefix="domain_all_users") # Clear when adding/deleting users
+    @cached("domain_registry", depends_on=[DRIVERS, TEAMS], preloaded=True)
+    def registry() -> DomainRegistry:
+        """
+        Returns the preloaded driver/team registry, which is used to resolve ids when building the other domain objects.
+        """
+        return DomainRegistry.from_db()
+
+    @staticmethod
+    @cached("domain_all_users", depends_on=[USERS], preloaded=True)
     def all_users() -> List[User]:
         """
         Returns a list of all enabled users.
@@ -32,43 +43,67 @@ class Model:
         return [User.from_db_user(db_user) for db_user in db_users]
 
     @staticmethod
-    @cache.cached(timeout=None, key_prefix="domain_all_race_results") # Clear when adding/updating results
+    @cached("domain_all_race_results", depends_on=[RACE_RESULTS, RACES, DRIVERS, TEAMS], preloaded=True)
     def all_race_results() -> List[RaceResult]:
         """
         Returns a list of all race results, in descending order (most recent first).
         """
-        db_race_results = db.session.query(DbRaceResult).join(DbRaceResult.race).order_by(desc("number")).all()
-        return [RaceResult.from_db_race_result(db_race_result) for db_race_result in db_race_results]
+        # 1:1 with races, so populate the race relationship from the join that is needed for ordering anyway.
+        # The standings of all results are loaded by a single additional IN-query.
+        db_race_results = (db.session.query(DbRaceResult)
+                           .join(DbRaceResult.race)
+                           .options(contains_eager(DbRaceResult.race), selectinload(DbRaceResult.entries))
+                           .order_by(desc("number"))
+                           .all())
+        registry: DomainRegistry = Model.registry()
+        return [RaceResult.from_db_race_result(db_race_result, registry) for db_race_result in db_race_results]
 
     @staticmethod
-    @cache.cached(timeout=None, key_prefix="domain_all_race_guesses") # Clear when adding/updating race guesses or users
+    @cached("domain_all_race_guesses", depends_on=[RACE_GUESSES, USERS, RACES, DRIVERS, TEAMS], preloaded=True)
     def all_race_guesses() -> List[RaceGuess]:
         """
         Returns a list of all race guesses (of enabled users).
         """
-        db_race_guesses = db.session.query(DbRaceGuess).join(DbRaceGuess.user).filter_by(enabled=True).all()
-        return [RaceGuess.from_db_race_guess(db_race_guess) for db_race_guess in db_race_guesses]
+        # Users come from the filtering join, the few distinct races are loaded by a single additional IN-query.
+        # Drivers are resolved using the registry.
+        db_race_guesses = (db.session.query(DbRaceGuess)
+                           .join(DbRaceGuess.user)
+                           .filter_by(enabled=True)
+                           .options(contains_eager(DbRaceGuess.user), selectinload(DbRaceGuess.race))
+                           .all())
+        registry: DomainRegistry = Model.registry()
+        return [RaceGuess.from_db_race_guess(db_race_guess, registry) for db_race_guess in db_race_guesses]
 
     @staticmethod
-    @cache.cached(timeout=None, key_prefix="domain_all_season_guesses") # Clear when adding/updating season guesses or users
+    @cached("domain_all_season_guesses", depends_on=[SEASON_GUESSES, USERS, DRIVERS, TEAMS], preloaded=True)
     def all_season_guesses() -> List[SeasonGuess]:
         """
         Returns a list of all season guesses (of enabled users).
         """
-        db_season_guesses = db.session.query(DbSeasonGuess).join(DbSeasonGuess.user).filter_by(enabled=True).all()
-        return [SeasonGuess.from_db_season_guess(db_season_guess) for db_season_guess in db_season_guesses]
+        # Users come from the filtering join, drivers + teams are resolved using the registry
+        db_season_guesses = (db.session.query(DbSeasonGuess)
+                             .join(DbSeasonGuess.user)
+                             .filter_by(enabled=True)
+                             .options(contains_eager(DbSeasonGuess.user))
+                             .all())
+        registry: DomainRegistry = Model.registry()
+        return [SeasonGuess.from_db_season_guess(db_season_guess, registry) for db_season_guess in db_season_guesses]
 
     @staticmethod
-    @cache.cached(timeout=None, key_prefix="domain_all_season_guess_results") # No cleanup, bc entered manually
+    @cached("domain_all_season_guess_results", depends_on=[SEASON_GUESS_RESULTS, USERS], preloaded=True)
     def all_season_guess_results() -> List[SeasonGuessResult]:
         """
         Returns a list of all season guess results (of enabled users).
         """
-        db_season_guess_results = db.session.query(DbSeasonGuessResult).join(DbSeasonGuessResult.user).filter_by(enabled=True).all()
+        db_season_guess_results = (db.session.query(DbSeasonGuessResult)
+                                   .join(DbSeasonGuessResult.user)
+                                   .filter_by(enabled=True)
+                                   .options(contains_eager(DbSeasonGuessResult.user))
+                                   .all())
         return [SeasonGuessResult.from_db_season_guess_result(db_season_guess_result) for db_season_guess_result in db_season_guess_results]
 
     @staticmethod
-    @cache.cached(timeout=None, key_prefix="domain_all_races") # No cleanup, bc entered manually
+    @cached("domain_all_races", depends_on=[RACES], preloaded=True)
     def all_races() -> List[Race]:
         """
         Returns a list of all races, in descending order (last race first).
@@ -77,13 +112,12 @@ class Model:
         return [Race.from_db_race(db_race) for db_race in db_races]
 
     @staticmethod
-    @cache.memoize(timeout=None) # No cleanup, bc entered manually
+    @memoized(depends_on=[DRIVERS, TEAMS])
     def all_drivers(*, include_none: bool, include_inactive: bool) -> List[Driver]:
         """
         Returns a list of all active drivers.
         """
-        db_drivers = db.session.query(DbDriver).all()
-        drivers = [Driver.from_db_driver(db_driver) for db_driver in db_drivers]
+        drivers = list(Model.registry().drivers.values())
 
         if not include_inactive:
             predicate: Callable[[Driver], bool] = lambda driver: driver.active
@@ -96,13 +130,12 @@ class Model:
         return drivers
 
     @staticmethod
-    @cache.memoize(timeout=None) # No cleanup, bc entered manually
+    @memoized(depends_on=[TEAMS])
     def all_teams(*, include_none: bool) -> List[Team]:
         """
         Returns a list of all teams.
         """
-        db_teams = db.session.query(DbTeam).all()
-        teams = [Team.from_db_team(db_team) for db_team in db_teams]
+        teams = list(Model.registry().teams.values())
 
         if not include_none:
             predicate: Callable[[Team], bool] = lambda team: team != NONE_TEAM
@@ -135,8 +168,16 @@ class Model:
         if len(ignore) > 0 and user_name in ignore:
             return None
 
-        predicate: Callable[[User], bool] = lambda user: user.name == user_name
-        return find_single_strict(predicate, self.all_users())
+        user: User | None = self.users_by_name().get(user_name)
+        if user is None:
+            raise Exception(f"Couldn't find user {user_name}")
+
+        return user
+
+    @staticmethod
+    @cached("domain_users_by_name", depends_on=[USERS])
+    def users_by_name() -> Dict[str, User]:
+        return index_single_strict(lambda user: user.name, Model.all_users())
 
     #
     # Race result queries
@@ -146,8 +187,36 @@ class Model:
         """
         Tries to obtain the race result corresponding to a race name.
         """
-        predicate: Callable[[RaceResult], bool] = lambda result: result.race.name == race_name
-        return find_single_or_none_strict(predicate, self.all_race_results())
+        return self.race_results_by_race_name().get(race_name)
+
+    @staticmethod
+    @cached("domain_race_results_by_race_name", depends_on=[RACE_RESULTS, RACES])
+    def race_results_by_race_name() -> Dict[str, RaceResult]:
+        return index_single_strict(lambda result: result.race.name, Model.all_race_results())
+
+    @staticmethod
+    @cached("domain_dnf_counts", depends_on=[RACE_RESULTS])
+    def dnf_counts() -> Dict[int, int]:
+        """
+        Returns a dictionary of race + sprint DNF counts mapped to driver ids (drivers without results are missing).
+        """
+        dnfs = (db.session.query(DbRaceResultEntry.driver_id,
+                                 func.sum(cast(DbRaceResultEntry.dnf, Integer) + cast(DbRaceResultEntry.sprint_dnf, Integer)))
+                .group_by(DbRaceResultEntry.driver_id)
+                .all())
+        return {driver_id: int(count) for driver_id, count in dnfs}
+
+    @staticmethod
+    @cached("domain_podium_driver_ids", depends_on=[RACE_RESULTS])
+    def podium_driver_ids() -> Set[int]:
+        """
+        Returns the ids of all drivers that finished on the podium at least once (excluded drivers don't count).
+        """
+        podiums = (db.session.query(DbRaceResultEntry.driver_id)
+                   .filter(DbRaceResultEntry.position <= 3, DbRaceResultEntry.excluded == False)
+                   .distinct()
+                   .all())
+        return {driver_id for driver_id, in podiums}
 
     #
     # Race guess queries
@@ -181,37 +250,39 @@ class Model:
         """
         return self.race_guesses_by()
 
-    @cache.memoize(timeout=None, args_to_ignore=["self"]) # Cleanup when adding/updating race guesses or users
     def race_guesses_by(self, *, user_name: str | None = None, race_name: str | None = None) -> RaceGuess | List[RaceGuess] | Dict[str, Dict[str, RaceGuess]] | None:
         # List of all guesses by a single user
         if user_name is not None and race_name is None:
-            predicate: Callable[[RaceGuess], bool] = lambda guess: guess.user.name == user_name
-            return find_multiple_strict(predicate, self.all_race_guesses())
+            return list(self.race_guesses_by_user_name().get(user_name, []))
 
         # List of all guesses for a single race
         if user_name is None and race_name is not None:
-            predicate: Callable[[RaceGuess], bool] = lambda guess: guess.race.name == race_name
-            return find_multiple_strict(predicate, self.all_race_guesses())
+            return list(self.race_guesses_by_race_and_user_name().get(race_name, dict()).values())
 
         # Guess for a single race by a single user
         if user_name is not None and race_name is not None:
-            predicate: Callable[[RaceGuess], bool] = lambda guess: guess.user.name == user_name and guess.race.name == race_name
-            return find_single_or_none_strict(predicate, self.all_race_guesses())
+            return self.race_guesses_by_race_and_user_name().get(race_name, dict()).get(user_name)
 
         # Dict with all guesses
         if user_name is None and race_name is None:
-            guesses_by: Dict[str, Dict[str, RaceGuess]] = dict()
-            guess: RaceGuess
+            return self.race_guesses_by_race_and_user_name()
 
-            for guess in self.all_race_guesses():
-                if guess.race.name not in guesses_by:
-                    guesses_by[guess.race.name] = dict()
+        raise Exception("race_guesses_by encountered illegal combination of arguments")
 
-                guesses_by[guess.race.name][guess.user.name] = guess
+    @staticmethod
+    @cached("domain_race_guesses_by_user_name", depends_on=[RACE_GUESSES, USERS])
+    def race_guesses_by_user_name() -> Dict[str, List[RaceGuess]]:
+        return index_multiple(lambda guess: guess.user.name, Model.all_race_guesses())
 
-            return guesses_by
+    @staticmethod
+    @cached("domain_race_guesses_by_race_and_user_name", depends_on=[RACE_GUESSES, USERS, RACES])
+    def race_guesses_by_race_and_user_name() -> Dict[str, Dict[str, RaceGuess]]:
+        guesses_by: Dict[str, Dict[str, RaceGuess]] = dict()
 
-        raise Exception("race_guesses_by encountered illegal combination of arguments")
+        for race_name, guesses in index_multiple(lambda guess: guess.race.name, Model.all_race_guesses()).items():
+            guesses_by[race_name] = index_single_strict(lambda guess: guess.user.name, guesses)
+
+        return guesses_by
 
     #
     # Season guess queries
@@ -231,30 +302,31 @@ class Model:
         """
         return self.season_guesses_by()
 
-    @cache.memoize(timeout=None, args_to_ignore=["self"]) # Cleanup when adding/updating season guesses or users
     def season_guesses_by(self, *, user_name: str | None = None) -> SeasonGuess | Dict[str, SeasonGuess] | None:
         if user_name is not None:
-            predicate: Callable[[SeasonGuess], bool] = lambda guess: guess.user.name == user_name
-            return find_single_or_none_strict(predicate, self.all_season_guesses())
+            return self.season_guesses_by_user_name().get(user_name)
 
         if user_name is None:
-            guesses_by: Dict[str, SeasonGuess] = dict()
-            guess: SeasonGuess
-
-            for guess in self.all_season_guesses():
-                guesses_by[guess.user.name] = guess
-
-            return guesses_by
+            return self.season_guesses_by_user_name()
 
         raise Exception("season_guesses_by encountered illegal combination of arguments")
 
+    @staticmethod
+    @cached("domain_season_guesses_by_user_name", depends_on=[SEASON_GUESSES, USERS])
+    def season_guesses_by_user_name() -> Dict[str, SeasonGuess]:
+        return index_single_strict(lambda guess: guess.user.name, Model.all_season_guesses())
+
     #
     # Season guess result queries
     #
 
     def season_guess_result_by(self, *, user_name: str) -> SeasonGuessResult | None:
-        predicate: Callable[[SeasonGuessResult], bool] = lambda guess: guess.user.name == user_name
-        return find_single_or_none_strict(predicate, self.all_season_guess_results())
+        return self.season_guess_results_by_user_name().get(user_name)
+
+    @staticmethod
+    @cached("domain_season_guess_results_by_user_name", depends_on=[SEASON_GUESS_RESULTS, USERS])
+    def season_guess_results_by_user_name() -> Dict[str, SeasonGuessResult]:
+        return index_single_strict(lambda result: result.user.name, Model.all_season_guess_results())
 
     #
     # Team queries
@@ -286,7 +358,7 @@ class Model:
         """
         return self.drivers_by(include_inactive=include_inactive)
 
-    @cache.memoize(timeout=None, args_to_ignore=["self"]) # No Cleanup, data added manually
+    @memoized(depends_on=[DRIVERS, TEAMS])
     def drivers_by(self, *, team_name: str | None = None, include_inactive: bool) -> List[Driver] | Dict[str, List[Driver]]:
         if team_name is not None:
             predicate: Callable[[Driver], bool] = lambda driver: driver.team.name == team_name
@@ -314,9 +386,47 @@ class Model:
     # Race queries
     #
 
+    @overload
     def race_by(self, *, race_name: str) -> Race:
-        for race in self.all_races():
-            if race.name == race_name:
-                return race
+        """
+        Returns the race with a specific name.
+        """
+        return self.race_by(race_name=race_name)
+
+    @overload
+    def race_by(self, *, race_number: int) -> Race | None:
+        """
+        Returns the race with a specific number in the calendar, or None, if this race doesn't exist.
+        """
+        return self.race_by(race_number=race_number)
 
-        raise Exception(f"Couldn't find race {race_name}")
\ No newline at end of file
+    def race_by(self, *, race_name: str | None = None, race_number: int | None = None) -> Race | None:
+        if race_name is not None and race_number is None:
+            race: Race | None = self.races_by_name().get(race_name)
+            if race is None:
+                raise Exception(f"Couldn't find race {race_name}")
+
+            return race
+
+        if race_name is None and race_number is not None:
+            return self.races_by_number().get(race_number)
+
+        raise Exception("race_by received an illegal combination of arguments")
+
+    @staticmethod
+    @cached("domain_races_by_name", depends_on=[RACES])
+    def races_by_name() -> Dict[str, Race]:
+        return index_single_strict(lambda race: race.name, Model.all_races())
+
+    @staticmethod
+    @cached("domain_races_by_number", depends_on=[RACES])
+    def races_by_number() -> Dict[int, Race]:
+        return index_single_strict(lambda race: race.number, Model.all_races())
+
+    @staticmethod
+    @cached("domain_race_calendar", depends_on=[RACES])
+    def race_calendar() -> RaceCalendar:
+        """
+        Returns the calendar of all races, which answers date based checks without querying the database.
+        """
+        return RaceCalendar(Model.all_races())
@@ -0,0 +1,46 @@
+from typing import Dict
+
+from formula10.database.model.db_driver import DbDriver
+from formula10.database.model.db_team import DbTeam
+from formula10.domain.model.driver import Driver
+from formula10.domain.model.team import Team
+from formula10 import db
+
+
+class DomainRegistry:
+    """
+    Preloaded lookup tables for entities that are referenced by id from other domain objects.
+    Building it costs a constant number of queries, resolving ids against it costs none.
+    """
+
+    @classmethod
+    def from_db(cls):
+        registry: DomainRegistry = cls()
+
+        db_teams = db.session.query(DbTeam).all()
+        registry.teams = {db_team.id: Team.from_db_team(db_team) for db_team in db_teams}
+
+        db_drivers = db.session.query(DbDriver).all()
+        registry.drivers = {
+            db_driver.id: Driver.from_db_driver(db_driver, registry.team(db_driver.team_id))
+            for db_driver in db_drivers
+        }
+
+        return registry
+
+    teams: Dict[int, Team]
+    drivers: Dict[int, Driver]
+
+    def team(self, team_id: int | str) -> Team:
+        team: Team | None = self.teams.get(int(team_id))
+        if team is None:
+            raise Exception(f"Could not find team with id {team_id} in database")
+
+        return team
+
+    def driver(self, driver_id: int | str) -> Driver:
+        driver: Driver | None = self.drivers.get(int(driver_id))
+        if driver is None:
+            raise Exception(f"Could not find driver with id {driver_id} in database")
+
+        return driver
@@ -0,0 +1,256 @@
+import copy
+import uuid
+from datetime import datetime
+from threading import Lock, RLock
+from typing import Any, Callable, Dict, Hashable, List, Tuple
+from flask import g, has_app_context
+from sqlalchemy import event
+
+from formula10.domain.cache_metrics import record_invalidation
+from formula10.database.sqlite_engine import RoutingSession
+from formula10.database.cache_broadcast_queries import Broadcast, add_broadcast, broadcasts_after, latest_broadcast_id
+from formula10 import ENABLE_SHARED_CACHE, db
+
+
+class CacheDependency:
+    """
+    A cached/memoized method and the entities it reads.
+    Methods that are updated in place after writes (e.g. the points matrices) are copied into the next snapshot instead of being dropped.
+    """
+
+    def __init__(self, name: str, entities: List[str], updated_in_place: bool):
+        self.name = name
+        self.entities = entities
+        self.updated_in_place = updated_in_place
+
+
+class DomainSnapshot:
+    """
+    An immutable state of all domain data under a single version number.
+    It stores the values of all cached/memoized methods (entities, indexes and derived points),
+    values that are missing are computed from the data already contained in the snapshot.
+    """
+
+    def __init__(self, version: int, broadcast_id: int):
+        self.version: int = version
+        self.broadcast_id: int = broadcast_id  # The last broadcast contained in this snapshot (only used with a shared cache)
+        self.values: Dict[Hashable, Tuple[CacheDependency, Any]] = dict()
+        self.created_at: datetime = datetime.now()
+
+        # Concurrent requests add values while a write derives the next snapshot from this one.
+        # Lookups read without it, adding a value and copying the entries take it.
+        self.values_lock: Lock = Lock()
+
+    def store(self, key: Hashable, dependency: CacheDependency, value: Any) -> None:
+        with self.values_lock:
+            self.values[key] = (dependency, value)
+
+    def entries(self) -> List[Tuple[Hashable, Tuple[CacheDependency, Any]]]:
+        """
+        Returns a copy of the stored values, it can be iterated while other requests add values.
+        """
+        with self.values_lock:
+            return list(self.values.items())
+
+    def derive(self, entities: List[str], broadcast_id: int) -> "DomainSnapshot":
+        """
+        Returns a new snapshot that keeps all values not depending on any of the entities.
+        Values that are updated in place are copied, so this snapshot stays unchanged.
+        """
+        snapshot: DomainSnapshot = DomainSnapshot(self.version + 1, broadcast_id)
+
+        for key, (dependency, value) in self.entries():
+            if not any(entity in dependency.entities for entity in entities):
+                snapshot.values[key] = (dependency, value)
+            elif dependency.updated_in_place:
+                snapshot.values[key] = (dependency, copy.deepcopy(value))
+            else:
+                record_invalidation(key)
+
+        return snapshot
+
+
+# The most recent snapshot of this process. Writes replace it by a new snapshot.
+_current: DomainSnapshot | None = None
+_lock: RLock = RLock()
+
+# Identifies this process, so the versions of its snapshots aren't confused with the ones before a restart
+_process_id: str = uuid.uuid4().hex[:8]
+
+# Methods that load entities from the database, they are called when building a snapshot
+_preloaded: List[Callable[[], Any]] = list()
+
+# In place updates of a new snapshot, by name. Writes refer to them by name, so other workers can apply them as well.
+_updates: Dict[str, Callable[..., None]] = dict()
+
+
+def preload(method: Callable[[], Any]) -> None:
+    _preloaded.append(method)
+
+
+def register_update(update: Callable[..., None]) -> None:
+    _updates[update.__name__] = update
+
+
+def pinned_snapshot() -> DomainSnapshot:
+    """
+    Returns the snapshot of the current request. The first call pins the most recent snapshot,
+    so all following calls of this request see the same data.
+    """
+    if "domain_snapshot" not in g:
+        g.domain_snapshot = current_snapshot()
+
+    return g.domain_snapshot
+
+
+def current_snapshot() -> DomainSnapshot:
+    """
+    Returns the most recent snapshot of this process.
+    With a shared cache, the writes broadcast by other workers are applied first.
+    """
+    global _current
+
+    if _current is not None and (not ENABLE_SHARED_CACHE or not has_broadcasts_after(_current.broadcast_id)):
+        return _current
+
+    with _lock:
+        if _current is None:
+            broadcast_id: int = latest_broadcast_id() if ENABLE_SHARED_CACHE else 0
+            _current = build_snapshot(DomainSnapshot(1, broadcast_id))
+        elif ENABLE_SHARED_CACHE:
+            apply_broadcasts()
+
+        return _current
+
+
+def data_version() -> str:
+    """
+    Returns a version string of the pinned snapshot, that changes with every write.
+    With a shared cache, all workers agree on it, because it is the id of the last applied broadcast.
+    """
+    snapshot: DomainSnapshot = pinned_snapshot()
+
+    return f"b{snapshot.broadcast_id}" if ENABLE_SHARED_CACHE else f"{_process_id}-{snapshot.version}"
+
+
+def discard_snapshot() -> None:
+    """
+    Drops the current snapshot of this process, the next request builds a new one from the database.
+    """
+    global _current
+
+    with _lock:
+        _current = None
+
+
+def build_snapshot(snapshot: DomainSnapshot, update: Callable[[], None] | None = None) -> DomainSnapshot:
+    """
+    Loads the entities missing from a new snapshot and applies the in place updates, while the snapshot is pinned.
+    The entities are loaded eagerly, so the snapshot doesn't mix data from before and after later writes.
+    """
+    previous: DomainSnapshot | None = g.get("domain_snapshot")
+    g.domain_snapshot = snapshot
+
+    try:
+        for method in _preloaded:
+            method()
+
+        if update is not None:
+            update()
+    finally:
+        if previous is None:
+            g.pop("domain_snapshot")
+        else:
+            g.domain_snapshot = previous
+
+    return snapshot
+
+
+def stage_write(entities: List[str], update_name: str | None, update_args: List[Any]) -> None:
+    """
+    Records a write of the current request, it has to be called before the write is committed.
+    With a shared cache, the broadcast is added to the session, so it's committed in the same transaction as the write.
+    The snapshot is only replaced by commit_writes, a write that is rolled back (or never committed) isn't applied or broadcast.
+    """
+    # The staged write belongs to the transaction of the write, a rollback drops it (see drop_staged_writes)
+    session: RoutingSession = db.session()
+    if not session.in_transaction():
+        session.begin()
+
+    if ENABLE_SHARED_CACHE:
+        add_broadcast(entities, update_name, update_args)
+
+    g.setdefault("staged_writes", list()).append((entities, update_name, update_args))
+
+
+def commit_writes() -> None:
+    """
+    Commits the session and replaces the snapshot for the writes staged in it, once they are stored.
+    The current request is pinned to the new snapshot afterwards, so it sees its own write.
+    """
+    staged_writes: List[Tuple[List[str], str | None, List[Any]]] = g.pop("staged_writes", list())
+    db.session.commit()
+
+    if len(staged_writes) > 0:
+        replace_snapshot(staged_writes)
+
+
+@event.listens_for(RoutingSession, "after_soft_rollback")
+def drop_staged_writes(session: RoutingSession, previous_transaction: Any) -> None:
+    # The broadcasts of the staged writes were rolled back with them
+    if has_app_context():
+        g.pop("staged_writes", None)
+
+
+def replace_snapshot(writes: List[Tuple[List[str], str | None, List[Any]]]) -> None:
+    """
+    Builds a new snapshot without the values depending on the written entities and swaps it in atomically.
+    With a shared cache, the committed broadcasts are applied in order with the writes of the other workers.
+    """
+    global _current
+
+    with _lock:
+        if ENABLE_SHARED_CACHE:
+            current_snapshot()
+        else:
+            for entities, update_name, update_args in writes:
+                _current = build_snapshot(current_snapshot().derive(entities, 0), bound_update(update_name, update_args))
+
+        g.domain_snapshot = _current
+
+
+#
+# Shared cache
+#
+
+def has_broadcasts_after(broadcast_id: int) -> bool:
+    return latest_broadcast_id() != broadcast_id
+
+
+def apply_broadcasts() -> None:
+    """
+    Applies the writes of all workers that aren't contained in the current snapshot yet, in the order they were made.
+    If some of them were already deleted, the snapshot is rebuilt from scratch instead.
+    """
+    global _current
+    assert _current is not None
+
+    broadcasts: List[Broadcast] | None = broadcasts_after(_current.broadcast_id)
+    if broadcasts is None:
+        _current = build_snapshot(DomainSnapshot(_current.version + 1, latest_broadcast_id()))
+        return
+
+    for broadcast_id, entities, update_name, update_args in broadcasts:
+        _current = build_snapshot(_current.derive(entities, broadcast_id), bound_update(update_name, update_args))
+
+
+def bound_update(update_name: str | None, update_args: List[Any]) -> Callable[[], None] | None:
+    if update_name is None:
+        return None
+
+    if update_name not in _updates:
+        raise Exception(f"Snapshot update \"{update_name}\" isn't registered")
+
+    update: Callable[..., None] = _updates[update_name]
+
+    return lambda: update(*update_args)
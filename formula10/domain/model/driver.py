@@ -1,20 +1,23 @@
 from urllib.parse import quote
 
 from formula10.database.model.db_driver import DbDriver
+from formula10.domain.model.interned import Interned
 from formula10.domain.model.team import NONE_TEAM, Team
 
 
-class Driver:
+class Driver(Interned):
+    __slots__ = ("name", "abbr", "country", "team", "active")
+
     @classmethod
-    def from_db_driver(cls, db_driver: DbDriver):
+    def from_db_driver(cls, db_driver: DbDriver, team: Team):
         driver: Driver = cls()
         driver.id = db_driver.id
         driver.name = db_driver.name
         driver.abbr = db_driver.abbr
         driver.country = db_driver.country_code
-        driver.team = Team.from_db_team(db_driver.team)
+        driver.team = team
         driver.active = db_driver.active
-        return driver
+        return cls.publish(driver)
 
     def to_db_driver(self) -> DbDriver:
         db_driver: DbDriver = DbDriver(id=self.id)
@@ -25,17 +28,6 @@ class Driver:
         db_driver.active = self.active
         return db_driver
 
-    def __eq__(self, __value: object) -> bool:
-        if isinstance(__value, Driver):
-            return self.id == __value.id
-
-        return NotImplemented
-
-    def __hash__(self) -> int:
-        return hash(self.id)
-
-    # This is important to memoize functions getting a Driver as input.
-    # The repr() will be appended to the cache key.
     def __repr__(self) -> str:
         return f"Driver(id={self.id}, name={self.name})"
 
@@ -51,10 +43,11 @@ class Driver:
         return quote(self.name)
 
 
-NONE_DRIVER: Driver = Driver()
-NONE_DRIVER.id = 0
-NONE_DRIVER.name = "None"
-NONE_DRIVER.abbr = "None"
-NONE_DRIVER.country = "NO"
-NONE_DRIVER.team = NONE_TEAM
-NONE_DRIVER.active = True
\ No newline at end of file
+_none_driver: Driver = Driver()
+_none_driver.id = 0
+_none_driver.name = "None"
+_none_driver.abbr = "None"
+_none_driver.country = "NO"
+_none_driver.team = NONE_TEAM
+_none_driver.active = True
+NONE_DRIVER: Driver = Driver.publish(_none_driver)
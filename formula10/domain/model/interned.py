@@ -0,0 +1,102 @@
+from threading import Lock
+from typing import Any, Dict, Tuple, Type, TypeVar
+
+_T = TypeVar("_T", bound="Interned")
+
+# Comparing a new instance to the canonical one and replacing it happens atomically
+_lock: Lock = Lock()
+
+
+class Interned:
+    """
+    Base class of domain objects that exist only once per entity id and state (in this process).
+    Instances are never changed after they were published: Loading an entity builds a new instance, it replaces the
+    canonical instance only if a field changed. Otherwise the existing instance is reused, so unchanged entities are shared.
+    Pinned older snapshots keep the instances they were built with and never see the values of a later write.
+    Copies (and unpickled objects) resolve to the canonical instance as well.
+    """
+    __slots__ = ("id",)
+
+    # The id is the identity of an entity, it may never change for a canonical instance.
+    # Instances of the same entity built before and after a write are equal, equality and hashing only use the id.
+    id: int
+
+    _instances: Dict[int, Any]
+
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        cls._instances = dict()
+
+    @classmethod
+    def publish(cls: Type[_T], instance: _T, replace: bool = True) -> _T:
+        """
+        Returns the canonical instance, if it has the same state as the fully populated instance.
+        Otherwise the instance becomes the canonical one (if replace is set or there isn't one yet) and is returned.
+        """
+        with _lock:
+            canonical: _T | None = cls._instances.get(instance.id)
+            if canonical is not None and canonical.same_state(instance):
+                return canonical
+
+            if canonical is None or replace:
+                cls._instances[instance.id] = instance
+
+            return instance
+
+    def state(self) -> Dict[str, Any]:
+        return {
+            slot: getattr(self, slot)
+            for cls in type(self).__mro__ for slot in getattr(cls, "__slots__", ())
+            if hasattr(self, slot)
+        }
+
+    def same_state(self, other: "Interned") -> bool:
+        """
+        Referenced entities (e.g. the team of a driver) are compared by identity, so a changed team replaces its drivers as well.
+        """
+        state: Dict[str, Any] = self.state()
+        other_state: Dict[str, Any] = other.state()
+        if state.keys() != other_state.keys():
+            return False
+
+        for slot, value in state.items():
+            other_value: Any = other_state[slot]
+            if isinstance(value, Interned) or isinstance(other_value, Interned):
+                if value is not other_value:
+                    return False
+            elif value != other_value:
+                return False
+
+        return True
+
+    def __eq__(self, __value: object) -> bool:
+        if self is __value:
+            return True
+
+        if type(self) is type(__value):
+            return self.id == __value.id  # type: ignore
+
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self.id)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo: Dict[int, Any]):
+        return self
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return restore_interned, (type(self), self.state())
+
+
+def restore_interned(cls: Type[_T], state: Dict[str, Any]) -> _T:
+    """
+    Resolves to the canonical instance, if it has the pickled state. A stale pickled state doesn't replace it.
+    """
+    instance: _T = cls()
+    for slot, value in state.items():
+        setattr(instance, slot, value)
+
+    return cls.publish(instance, replace=False)
@@ -2,9 +2,12 @@ from datetime import datetime
 from urllib.parse import quote
 
 from formula10.database.model.db_race import DbRace
+from formula10.domain.model.interned import Interned
 
 
-class Race:
+class Race(Interned):
+    __slots__ = ("name", "number", "date", "place_to_guess", "quali_date", "has_sprint")
+
     @classmethod
     def from_db_race(cls, db_race: DbRace):
         race: Race = cls()
@@ -15,7 +18,7 @@ class Race:
         race.place_to_guess = db_race.pxx
         race.quali_date = db_race.quali_date
         race.has_sprint = db_race.has_sprint
-        return race
+        return cls.publish(race)
 
     def to_db_race(self) -> DbRace:
         db_race: DbRace = DbRace(id=self.id)
@@ -27,15 +30,6 @@ class Race:
         db_race.has_sprint = self.has_sprint
         return db_race
 
-    def __eq__(self, __value: object) -> bool:
-        if isinstance(__value, Race):
-            return self.id == __value.id
-
-        return NotImplemented
-
-    def __hash__(self) -> int:
-        return hash(self.id)
-
     def __repr__(self) -> str:
         return f"race(\n\tid={self.id}, name={self.name}, number={self.number},\n\tdate={self.date}, quali_date={self.quali_date},\n\thas_sprint={self.has_sprint}, place_to_guess={self.place_to_guess}\n)"
 
@@ -1,17 +1,20 @@
 from formula10.database.model.db_race_guess import DbRaceGuess
+from formula10.domain.domain_registry import DomainRegistry
 from formula10.domain.model.driver import Driver
 from formula10.domain.model.race import Race
 from formula10.domain.model.user import User
 
 
 class RaceGuess:
+    __slots__ = ("user", "race", "pxx_guess", "dnf_guess")
+
     @classmethod
-    def from_db_race_guess(cls, db_race_guess: DbRaceGuess):
+    def from_db_race_guess(cls, db_race_guess: DbRaceGuess, registry: DomainRegistry):
         race_guess: RaceGuess = cls()
         race_guess.user = User.from_db_user(db_race_guess.user)
         race_guess.race = Race.from_db_race(db_race_guess.race)
-        race_guess.pxx_guess = Driver.from_db_driver(db_race_guess.pxx)
-        race_guess.dnf_guess = Driver.from_db_driver(db_race_guess.dnf)
+        race_guess.pxx_guess = registry.driver(db_race_guess.pxx_driver_id)
+        race_guess.dnf_guess = registry.driver(db_race_guess.dnf_driver_id)
         return race_guess
 
     def to_db_race_guess(self) -> DbRaceGuess:
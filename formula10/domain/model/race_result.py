@@ -1,85 +1,113 @@
-import json
-from typing import Dict, List
+from typing import Dict, List, Set
 
-from formula10.database.common_queries import find_single_driver_strict
 from formula10.database.model.db_race_result import DbRaceResult
+from formula10.database.model.db_race_result_entry import DbRaceResultEntry
+from formula10.domain.domain_registry import DomainRegistry
 from formula10.domain.model.driver import NONE_DRIVER, Driver
 from formula10.domain.model.race import Race
 
 
 class RaceResult:
+    __slots__ = (
+        "race", "standing", "initial_dnf", "all_dnfs", "standing_exclusions", "fastest_lap_driver", "sprint_dnfs", "sprint_standing",
+        "positions", "standing_drivers", "initial_dnf_set", "all_dnfs_set", "standing_exclusions_set", "sprint_dnfs_set", "standing_points_strings"
+    )
+
     @classmethod
-    def from_db_race_result(cls, db_race_result: DbRaceResult):
+    def from_db_race_result(cls, db_race_result: DbRaceResult, registry: DomainRegistry):
         race_result: RaceResult = cls()
         race_result.race = Race.from_db_race(db_race_result.race)
-        race_result.fastest_lap_driver = Driver.from_db_driver(db_race_result.fastest_lap_driver)
+        race_result.fastest_lap_driver = registry.driver(db_race_result.fastest_lap_id)
 
-        # Deserialize from json
-        standing: Dict[str, str] = json.loads(db_race_result.pxx_driver_ids_json)
-        initial_dnf: List[str] = json.loads(db_race_result.first_dnf_driver_ids_json)
-        all_dnfs: List[str] = json.loads(db_race_result.dnf_driver_ids_json)
-        standing_exclusions: List[str] = json.loads(db_race_result.excluded_driver_ids_json)
-        sprint_dnfs: List[str] = json.loads(db_race_result.sprint_dnf_driver_ids_json)
-        sprint_standing: Dict[str, str] = json.loads(db_race_result.sprint_points_json)
+        # Populate relationships, the entries are ordered by position to keep the order of the lists
+        entries: List[DbRaceResultEntry] = sorted(db_race_result.entries, key=lambda entry: (entry.position or 0, entry.driver_id))
+        sprint_entries: List[DbRaceResultEntry] = sorted(db_race_result.entries, key=lambda entry: (entry.sprint_position or 0, entry.driver_id))
 
-        # Populate relationships
         race_result.standing = {
-            position: Driver.from_db_driver(find_single_driver_strict(int(driver_id)))
-            for position, driver_id in standing.items()
+            str(entry.position): registry.driver(entry.driver_id)
+            for entry in entries if entry.position is not None
         }
         race_result.initial_dnf = [
-            Driver.from_db_driver(find_single_driver_strict(int(driver_id)))
-            for driver_id in initial_dnf
+            registry.driver(entry.driver_id)
+            for entry in entries if entry.initial_dnf
         ]
         race_result.all_dnfs = [
-            Driver.from_db_driver(find_single_driver_strict(int(driver_id)))
-            for driver_id in all_dnfs
+            registry.driver(entry.driver_id)
+            for entry in entries if entry.dnf
         ]
         race_result.standing_exclusions = [
-            Driver.from_db_driver(find_single_driver_strict(int(driver_id)))
-            for driver_id in standing_exclusions
+            registry.driver(entry.driver_id)
+            for entry in entries if entry.excluded
         ]
         race_result.sprint_dnfs = [
-            Driver.from_db_driver(find_single_driver_strict(int(driver_id)))
-            for driver_id in sprint_dnfs
+            registry.driver(entry.driver_id)
+            for entry in sprint_entries if entry.sprint_dnf
         ]
         race_result.sprint_standing = {
-            position: Driver.from_db_driver(find_single_driver_strict(int(driver_id)))
-            for position, driver_id in sprint_standing.items()
+            str(entry.sprint_position): registry.driver(entry.driver_id)
+            for entry in sprint_entries if entry.sprint_position is not None
         }
 
+        race_result.build_lookups()
+
         return race_result
 
-    def to_db_race_result(self) -> DbRaceResult:
-        # "Unpopulate" relationships, remove none driver
-        standing: Dict[str, str] = {
-            position: driver.name for position, driver in self.standing.items()
+    def build_lookups(self) -> None:
+        """
+        Precomputes the lookups used for scoring and display, so checking a single driver doesn't scan the standing.
+        """
+        self.initial_dnf_set = set(self.initial_dnf)
+        self.all_dnfs_set = set(self.all_dnfs)
+        self.standing_exclusions_set = set(self.standing_exclusions)
+        self.sprint_dnfs_set = set(self.sprint_dnfs)
+
+        self.standing_drivers = set(self.standing.values())
+
+        self.positions = {
+            driver: int(position)
+            for position, driver in self.standing.items()
+            if driver not in self.standing_exclusions_set
         }
-        initial_dnf: List[str] = [
-            str(driver.id) for driver in self.initial_dnf if driver
-        ]
-        all_dnfs: List[str] = [
-            str(driver.id) for driver in self.all_dnfs if driver
-        ]
-        standing_exclusions: List[str] = [
-            str(driver.id) for driver in self.standing_exclusions if driver
-        ]
-        sprint_dnfs: List[str] = [
-            str(driver.id) for driver in self.sprint_dnfs if driver
-        ]
-        sprint_standing: Dict[str, str] = {
-            position: driver.name for position, driver in self.sprint_standing.items()
+
+        points_strings: Dict[int, str] = {
+            0: "10 Points",
+            1: "6 Points",
+            2: "3 Points",
+            3: "1 Points"
+        }
+        self.standing_points_strings = {
+            driver: points_strings.get(abs(self.race.place_to_guess - self.positions[driver]), "0 Points")
+            if driver in self.positions else "0 Points"
+            for driver in self.standing_drivers
         }
 
-        # Serialize to json
+    def to_db_race_result(self) -> DbRaceResult:
         db_race_result: DbRaceResult = DbRaceResult(race_id=self.race.id)
-        db_race_result.pxx_driver_ids_json = json.dumps(standing)
-        db_race_result.first_dnf_driver_ids_json = json.dumps(initial_dnf)
-        db_race_result.dnf_driver_ids_json = json.dumps(all_dnfs)
-        db_race_result.excluded_driver_ids_json = json.dumps(standing_exclusions)
         db_race_result.fastest_lap_id = self.fastest_lap_driver.id
-        db_race_result.sprint_dnf_driver_ids_json = json.dumps(sprint_dnfs)
-        db_race_result.sprint_points_json = json.dumps(sprint_standing)
+
+        # "Unpopulate" relationships
+        entries: Dict[int, DbRaceResultEntry] = dict()
+
+        def entry(driver: Driver) -> DbRaceResultEntry:
+            if driver.id not in entries:
+                entries[driver.id] = DbRaceResultEntry(race_id=self.race.id, driver_id=driver.id)
+
+            return entries[driver.id]
+
+        for position, driver in self.standing.items():
+            entry(driver).position = int(position)
+        for position, driver in self.sprint_standing.items():
+            entry(driver).sprint_position = int(position)
+        for driver in self.initial_dnf:
+            entry(driver).initial_dnf = True
+        for driver in self.all_dnfs:
+            entry(driver).dnf = True
+        for driver in self.standing_exclusions:
+            entry(driver).excluded = True
+        for driver in self.sprint_dnfs:
+            entry(driver).sprint_dnf = True
+
+        db_race_result.entries = list(entries.values())
 
         return db_race_result
 
@@ -102,13 +130,22 @@ class RaceResult:
     sprint_dnfs: List[Driver]
     sprint_standing: Dict[str, Driver]
 
+    # Lookups built from the lists above
+    positions: Dict[Driver, int]  # Classified (not excluded) drivers only
+    standing_drivers: Set[Driver]
+    initial_dnf_set: Set[Driver]
+    all_dnfs_set: Set[Driver]
+    standing_exclusions_set: Set[Driver]
+    sprint_dnfs_set: Set[Driver]
+    standing_points_strings: Dict[Driver, str]
+
     def offset_from_place_to_guess(self, offset: int, respect_nc:bool = True) -> Driver:
         position: str = str(self.race.place_to_guess + offset)
 
         if position not in self.standing:
             raise Exception(f"Position {position} not found in RaceResult.standing")
 
-        if self.standing[position] in self.standing_exclusions and respect_nc:
+        if self.standing[position] in self.standing_exclusions_set and respect_nc:
             return NONE_DRIVER
 
         return self.standing[position]
@@ -117,47 +154,30 @@ class RaceResult:
         if driver == NONE_DRIVER:
             return None
 
-        for position, _driver in self.standing.items():
-            if driver == _driver and driver not in self.standing_exclusions:
-                return int(position)
-
-        return None
+        return self.positions.get(driver)
 
     def driver_standing_position_string(self, driver: Driver) -> str:
         if driver == NONE_DRIVER:
             return ""
 
-        for position, _driver in self.standing.items():
-            if driver == _driver and driver not in self.standing_exclusions:
-                return f" (P{position})"
+        position: int | None = self.positions.get(driver)
+        if position is not None:
+            return f" (P{position})"
 
         return " (NC)"
 
     def driver_standing_points_string(self, driver: Driver) -> str:
-        points_strings: Dict[int, str] = {
-            0: "10 Points",
-            1: "6 Points",
-            2: "3 Points",
-            3: "1 Points"
-        }
-
         if driver == NONE_DRIVER:
-            if self.standing[str(self.race.place_to_guess)] in self.standing_exclusions:
+            if self.standing[str(self.race.place_to_guess)] in self.standing_exclusions_set:
                 return "10 Points"
             else:
                 return "0 Points"
 
-        for position, _driver in self.standing.items():
-            if driver == _driver and driver not in self.standing_exclusions:
-                position_offset: int = abs(self.race.place_to_guess - int(position))
-                if position_offset in points_strings:
-                    return points_strings[position_offset]
-                else:
-                    return "0 Points"
-            elif driver == _driver and driver in self.standing_exclusions:
-                return "0 Points"
+        points_string: str | None = self.standing_points_strings.get(driver)
+        if points_string is None:
+            raise Exception(f"Could not get points string for driver {driver.name}")
 
-        raise Exception(f"Could not get points string for driver {driver.name}")
+        return points_string
 
     def driver_dnf_points_string(self, driver: Driver) -> str:
         if driver == NONE_DRIVER:
@@ -166,11 +186,23 @@ class RaceResult:
             else:
                 return "0 Points"
 
-        if driver in self.initial_dnf:
+        if driver in self.initial_dnf_set:
             return "10 Points"
         else:
             return "0 Points"
 
+    def is_initial_dnf(self, driver: Driver) -> bool:
+        return driver in self.initial_dnf_set
+
+    def is_dnf(self, driver: Driver) -> bool:
+        return driver in self.all_dnfs_set
+
+    def is_excluded(self, driver: Driver) -> bool:
+        return driver in self.standing_exclusions_set
+
+    def is_sprint_dnf(self, driver: Driver) -> bool:
+        return driver in self.sprint_dnfs_set
+
     def ordered_standing_list(self) -> List[Driver]:
         return [
             self.standing[str(position)] for position in range(1, 21)
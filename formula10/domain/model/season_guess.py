@@ -1,23 +1,25 @@
 import json
 from typing import List
-from formula10.database.common_queries import find_single_driver_strict
 from formula10.database.model.db_season_guess import DbSeasonGuess
+from formula10.domain.domain_registry import DomainRegistry
 from formula10.domain.model.driver import Driver
 from formula10.domain.model.team import Team
 from formula10.domain.model.user import User
 
 
 class SeasonGuess:
+    __slots__ = ("user", "hot_take", "p2_wcc", "most_overtakes", "most_dnfs", "most_wdc_gained", "most_wdc_lost", "team_winners", "podiums")
+
     @classmethod
-    def from_db_season_guess(cls, db_season_guess: DbSeasonGuess):
+    def from_db_season_guess(cls, db_season_guess: DbSeasonGuess, registry: DomainRegistry):
         season_guess: SeasonGuess = cls()
         season_guess.user = User.from_db_user(db_season_guess.user)
         season_guess.hot_take = db_season_guess.hot_take if db_season_guess.hot_take is not None else None
-        season_guess.p2_wcc = Team.from_db_team(db_season_guess.p2_team) if db_season_guess.p2_team is not None else None
-        season_guess.most_overtakes = Driver.from_db_driver(db_season_guess.overtake_driver) if db_season_guess.overtake_driver is not None else None
-        season_guess.most_dnfs = Driver.from_db_driver(db_season_guess.dnf_driver) if db_season_guess.dnf_driver is not None else None
-        season_guess.most_wdc_gained = Driver.from_db_driver(db_season_guess.gained_driver) if db_season_guess.gained_driver is not None else None
-        season_guess.most_wdc_lost = Driver.from_db_driver(db_season_guess.lost_driver) if db_season_guess.lost_driver is not None else None
+        season_guess.p2_wcc = registry.team(db_season_guess.p2_team_id) if db_season_guess.p2_team_id is not None else None
+        season_guess.most_overtakes = registry.driver(db_season_guess.overtake_driver_id) if db_season_guess.overtake_driver_id is not None else None
+        season_guess.most_dnfs = registry.driver(db_season_guess.dnf_driver_id) if db_season_guess.dnf_driver_id is not None else None
+        season_guess.most_wdc_gained = registry.driver(db_season_guess.gained_driver_id) if db_season_guess.gained_driver_id is not None else None
+        season_guess.most_wdc_lost = registry.driver(db_season_guess.lost_driver_id) if db_season_guess.lost_driver_id is not None else None
 
         # Deserialize from json
         team_winners: List[str | None] = json.loads(db_season_guess.team_winners_driver_ids_json)
@@ -25,11 +27,11 @@ class SeasonGuess:
 
         # Populate relationships
         season_guess.team_winners = [
-            Driver.from_db_driver(find_single_driver_strict(int(driver_id))) if driver_id is not None else None
+            registry.driver(driver_id) if driver_id is not None else None
             for driver_id in team_winners
         ]
         season_guess.podiums = [
-            Driver.from_db_driver(find_single_driver_strict(int(driver_id)))
+            registry.driver(driver_id)
             for driver_id in podiums
         ]
 
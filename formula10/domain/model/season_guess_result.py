@@ -3,6 +3,8 @@ from formula10.domain.model.user import User
 
 
 class SeasonGuessResult:
+    __slots__ = ("user", "hot_take_correct", "overtakes_correct")
+
     @classmethod
     def from_db_season_guess_result(cls, db_season_guess_result: DbSeasonGuessResult):
         season_guess_result: SeasonGuessResult = cls()
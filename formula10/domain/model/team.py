@@ -1,30 +1,24 @@
 from urllib.parse import quote
 
 from formula10.database.model.db_team import DbTeam
+from formula10.domain.model.interned import Interned
 
 
-class Team:
+class Team(Interned):
+    __slots__ = ("name",)
+
     @classmethod
     def from_db_team(cls, db_team: DbTeam):
         team: Team = cls()
         team.id = db_team.id
         team.name = db_team.name
-        return team
+        return cls.publish(team)
 
     def to_db_team(self) -> DbTeam:
         db_team: DbTeam = DbTeam(id=self.id)
         db_team.name = self.name
         return db_team
 
-    def __eq__(self, __value: object) -> bool:
-        if isinstance(__value, Team):
-            return self.id == __value.id
-
-        return NotImplemented
-
-    def __hash__(self) -> int:
-        return hash(self.id)
-
     id: int
     name: str
 
@@ -32,6 +26,7 @@ class Team:
     def name_sanitized(self) -> str:
         return quote(self.name)
 
-NONE_TEAM: Team = Team()
-NONE_TEAM.id = 0
-NONE_TEAM.name = "None"
\ No newline at end of file
+_none_team: Team = Team()
+_none_team.id = 0
+_none_team.name = "None"
+NONE_TEAM: Team = Team.publish(_none_team)
@@ -1,16 +1,19 @@
 from urllib.parse import quote
 
 from formula10.database.model.db_user import DbUser
+from formula10.domain.model.interned import Interned
 
 
-class User:
+class User(Interned):
+    __slots__ = ("name", "enabled")
+
     @classmethod
     def from_db_user(cls, db_user: DbUser):
         user: User = cls()
         user.id = db_user.id
         user.name = db_user.name
         user.enabled = db_user.enabled
-        return user
+        return cls.publish(user)
 
     def to_db_user(self) -> DbUser:
         db_user: DbUser = DbUser(id=self.id)
@@ -18,15 +21,6 @@ class User:
         db_user.enabled = self.enabled
         return db_user
 
-    def __eq__(self, __value: object) -> bool:
-        if isinstance(__value, User):
-            return self.id == __value.id
-
-        return NotImplemented
-
-    def __hash__(self) -> int:
-        return hash(self.id)
-
     id: int
     name: str
     enabled: bool
@@ -0,0 +1,154 @@
+from typing import Dict, List
+import numpy as np
+
+
+class PointsMatrix:
+    """
+    Dense integer matrix of points per race, with one row for each user/driver/team.
+    Columns start at index 1, like the race numbers, column 0 is always 0.
+    The cumulative sums are kept up to date when single rows/columns/cells are changed.
+    """
+
+    def __init__(self, names: List[str], race_count: int):
+        self.names: List[str] = list(names)
+        self.rows: Dict[str, int] = {name: row for row, name in enumerate(self.names)}
+        self.points: np.ndarray = np.zeros((len(self.names), race_count + 1), dtype=np.int64)
+        self.cumulative: np.ndarray = np.zeros((len(self.names), race_count + 1), dtype=np.int64)
+
+    #
+    # Updates
+    #
+
+    def set_points(self, points: np.ndarray) -> None:
+        """
+        Replaces the whole matrix.
+        """
+        self.points = points.astype(np.int64)
+        self.cumulative = np.cumsum(self.points, axis=1)
+
+    def set_column(self, race_number: int, points: Dict[str, int]) -> None:
+        """
+        Replaces the points of a single race. Rows not contained in points are set to 0.
+        Only the cumulative sums starting at this race are updated.
+        """
+        column: np.ndarray = np.array([points.get(name, 0) for name in self.names], dtype=np.int64)
+        delta: np.ndarray = column - self.points[:, race_number]
+
+        self.points[:, race_number] = column
+        self.cumulative[:, race_number:] += delta[:, np.newaxis]
+
+    def set_cell(self, name: str, race_number: int, points: int) -> None:
+        """
+        Replaces the points of a single row for a single race.
+        """
+        row: int = self.rows[name]
+        delta: int = points - int(self.points[row, race_number])
+
+        self.points[row, race_number] = points
+        self.cumulative[row, race_number:] += delta
+
+    def set_row(self, name: str, points: List[int]) -> None:
+        """
+        Replaces the points of a single row, the row is appended if it doesn't exist yet.
+        """
+        if name not in self.rows:
+            self.rows[name] = len(self.names)
+            self.names.append(name)
+            self.points = np.vstack([self.points, np.zeros((1, self.points.shape[1]), dtype=np.int64)])
+            self.cumulative = np.vstack([self.cumulative, np.zeros((1, self.cumulative.shape[1]), dtype=np.int64)])
+
+        row: int = self.rows[name]
+        self.points[row] = points
+        self.cumulative[row] = np.cumsum(self.points[row])
+
+    def remove_row(self, name: str) -> None:
+        """
+        Removes a single row, if it exists.
+        """
+        if name not in self.rows:
+            return
+
+        row: int = self.rows[name]
+        self.names.pop(row)
+        self.rows = {name: row for row, name in enumerate(self.names)}
+        self.points = np.delete(self.points, row, axis=0)
+        self.cumulative = np.delete(self.cumulative, row, axis=0)
+
+    #
+    # Views
+    #
+
+    def row(self, name: str) -> List[int]:
+        return self.points[self.rows[name]].tolist()
+
+    def cumulative_row(self, name: str) -> List[int]:
+        return self.cumulative[self.rows[name]].tolist()
+
+    def column(self, race_number: int, names: List[str] | None = None) -> Dict[str, int]:
+        if names is None:
+            names = self.names
+
+        return {name: int(self.points[self.rows[name], race_number]) for name in names}
+
+    def cell(self, name: str, race_number: int) -> int:
+        return int(self.points[self.rows[name], race_number])
+
+    def total(self, name: str) -> int:
+        return int(self.cumulative[self.rows[name], -1])
+
+    def totals(self, names: List[str]) -> np.ndarray:
+        """
+        Returns the total points of multiple rows, in the order of names.
+        """
+        return self.cumulative[[self.rows[name] for name in names], -1]
+
+    def as_dict(self, names: List[str] | None = None) -> Dict[str, List[int]]:
+        if names is None:
+            names = self.names
+
+        return {name: self.row(name) for name in names}
+
+    def cumulative_as_dict(self, names: List[str] | None = None) -> Dict[str, List[int]]:
+        if names is None:
+            names = self.names
+
+        return {name: self.cumulative_row(name) for name in names}
+
+
+def sort_order(totals: np.ndarray) -> np.ndarray:
+    """
+    Returns the indices that sort totals in descending order. Equal totals keep their order.
+    """
+    return np.argsort(-totals, kind="stable")
+
+
+def standing_positions(totals: np.ndarray) -> np.ndarray:
+    """
+    Returns the standing position for each total.
+    If multiple totals are equal, a place is shared. In this case, the next total does not occupy the immediate next position.
+    """
+    descending: np.ndarray = np.sort(totals)[::-1]
+
+    # Position = 1 + number of strictly larger totals
+    return np.searchsorted(-descending, -totals, side="left") + 1
+
+
+def standing_by_name(names: List[str], totals: np.ndarray) -> Dict[str, int]:
+    """
+    Returns a dictionary of standing positions, ordered by position.
+    """
+    positions: np.ndarray = standing_positions(totals)
+
+    return {names[index]: int(positions[index]) for index in sort_order(totals)}
+
+
+def standing_by_position(names: List[str], totals: np.ndarray) -> Dict[int, List[str]]:
+    """
+    Returns a dictionary of names for each standing position. Positions that are skipped because of shared places are empty.
+    """
+    standing: Dict[int, List[str]] = {position: list() for position in range(1, len(names) + 1)}
+
+    for name, position in standing_by_name(names, totals).items():
+        standing[position].append(name)
+
+    return standing
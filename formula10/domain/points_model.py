@@ -1,16 +1,19 @@
 import json
-from typing import Any, Callable, Dict, List, overload, Tuple
+from typing import Any, Callable, Dict, List, overload, Set, Tuple
 import numpy as np
 
-from formula10 import cache
+from formula10.domain.cache_dependencies import DRIVERS, RACE_GUESSES, RACE_RESULTS, RACES, SEASON_GUESS_RESULTS, SEASON_GUESSES, TEAMS, USERS, cached, memoized, snapshot_value
 from formula10.domain.domain_model import Model
 from formula10.domain.model.driver import NONE_DRIVER, Driver
+from formula10.domain.model.race import Race
 from formula10.domain.model.race_guess import RaceGuess
 from formula10.domain.model.race_result import RaceResult
 from formula10.domain.model.season_guess import SeasonGuess
 from formula10.domain.model.season_guess_result import SeasonGuessResult
 from formula10.domain.model.team import Team
 from formula10.domain.model.user import User
+from formula10.domain.points_matrix import PointsMatrix, sort_order, standing_by_name, standing_by_position
+from formula10.database.points_queries import stored_driver_points, stored_team_points, stored_user_points
 from formula10.database.validation import find_single_or_none_strict
 
 # Guess points
@@ -132,7 +135,7 @@ def standing_points(race_guess: RaceGuess, race_result: RaceResult) -> int:
 
 
 def dnf_points(race_guess: RaceGuess, race_result: RaceResult) -> int:
-    if race_guess.dnf_guess in race_result.initial_dnf:
+    if race_result.is_initial_dnf(race_guess.dnf_guess):
         return RACE_GUESS_DNF_POINTS
 
     if race_guess.dnf_guess == NONE_DRIVER and len(race_result.initial_dnf) == 0:
@@ -151,123 +154,195 @@ def substitute_points(driver: Driver, race_number: int) -> int:
         return 0
 
 
+def race_guess_points(race_guess: RaceGuess, race_result: RaceResult) -> int:
+    return standing_points(race_guess, race_result) + dnf_points(race_guess, race_result)
+
+
+def driver_race_points(race_result: RaceResult) -> Dict[str, int]:
+    """
+    Returns a dictionary of points per driver for a single race (including fastest lap and sprint).
+    Drivers that didn't score in this race are not contained.
+    """
+    race_number: int = race_result.race.number
+    driver_points: Dict[str, int] = dict()
+
+    for position, driver in race_result.standing.items():
+        driver_points[driver.name] = (
+            DRIVER_RACE_POINTS[int(position)]
+            if int(position) in DRIVER_RACE_POINTS
+            else 0
+        )
+        driver_points[driver.name] += (
+            DRIVER_FASTEST_LAP_POINTS
+            if race_result.fastest_lap_driver == driver
+            and int(position) <= 10
+            else 0
+        )
+        driver_points[driver.name] -= substitute_points(driver, race_number)
+
+    for position, driver in race_result.sprint_standing.items():
+        driver_points[driver.name] = driver_points.get(driver.name, 0) + (
+            DRIVER_SPRINT_POINTS[int(position)]
+            if int(position) in DRIVER_SPRINT_POINTS
+            else 0
+        )
+
+    return driver_points
+
+
+def team_race_points(race_result: RaceResult, driver_points: Dict[str, int]) -> Dict[str, int]:
+    """
+    Returns a dictionary of points per team for a single race, given the points per driver of this race.
+    Only drivers contained in the race standing count towards their team.
+    """
+    team_points: Dict[str, int] = dict()
+
+    for driver in race_result.standing.values():
+        team_points[driver.team.name] = team_points.get(driver.team.name, 0) + driver_points.get(driver.name, 0)
+
+    return team_points
+
+
+def stored_points_matrix(names: List[str], race_count: int, stored_points: List[Tuple[str, int, int]]) -> PointsMatrix:
+    """
+    Builds a points matrix from materialized (name, race number, points) rows. Rows of unknown names are skipped.
+    """
+    matrix: PointsMatrix = PointsMatrix(names, race_count)
+    known_points: List[Tuple[str, int, int]] = [entry for entry in stored_points if entry[0] in matrix.rows]
+
+    points: np.ndarray = np.zeros_like(matrix.points)
+    points[
+        [matrix.rows[name] for name, _, _ in known_points],
+        [race_number for _, race_number, _ in known_points]
+    ] = [race_points for _, _, race_points in known_points]
+    matrix.set_points(points)
+
+    return matrix
+
+
 class PointsModel(Model):
     """
     This class bundles all data + functionality required to do points calculations.
+    The points are stored in dense matrices (see PointsMatrix), the remaining methods are views over those.
     """
 
     def __init__(self):
         Model.__init__(self)
 
-    @cache.cached(
-        timeout=None, key_prefix="points_points_per_step"
-    )  # Clear when adding/updating race results or users
-    def points_per_step(self) -> Dict[str, List[int]]:
+    @cached(
+        "points_user_points", depends_on=[RACE_RESULTS, RACE_GUESSES, USERS, RACES, DRIVERS, TEAMS], updated_in_place=True
+    )  # Updated by update_race_points, update_race_guess_points and update_user_points
+    def user_points(self) -> PointsMatrix:
         """
-        Returns a dictionary of lists, containing points per race for each user.
+        Returns the matrix of points per race for each user, read from the materialized points.
         """
-        points_per_step = dict()
-        for user in self.all_users():
-            points_per_step[user.name] = [0] * (
-                    len(self.all_races()) + 1
-            )  # Start at index 1, like the race numbers
-
-        for race_guess in self.all_race_guesses():
-            user_name: str = race_guess.user.name
-            race_number: int = race_guess.race.number
-            race_result: RaceResult | None = self.race_result_by(
-                race_name=race_guess.race.name
-            )
+        return stored_points_matrix([user.name for user in self.all_users()], len(self.all_races()), stored_user_points())
 
-            if race_result is None:
-                continue
+    @cached(
+        "points_driver_points", depends_on=[RACE_RESULTS, RACES, DRIVERS, TEAMS], updated_in_place=True
+    )  # Updated by update_race_points
+    def driver_points(self) -> PointsMatrix:
+        """
+        Returns the matrix of points per race for each driver (including inactive drivers), read from the materialized points.
+        """
+        return stored_points_matrix(
+            [driver.name for driver in self.all_drivers(include_none=False, include_inactive=True)],
+            len(self.all_races()),
+            stored_driver_points()
+        )
 
-            points_per_step[user_name][race_number] = standing_points(
-                race_guess, race_result
-            ) + dnf_points(race_guess, race_result)
+    @cached(
+        "points_team_points", depends_on=[RACE_RESULTS, RACES, DRIVERS, TEAMS], updated_in_place=True
+    )  # Updated by update_race_points
+    def team_points(self) -> PointsMatrix:
+        """
+        Returns the matrix of points per race for each team, read from the materialized points.
+        """
+        return stored_points_matrix([team.name for team in self.all_teams(include_none=False)], len(self.all_races()), stored_team_points())
 
-        return points_per_step
+    def points_per_step(self) -> Dict[str, List[int]]:
+        """
+        Returns a dictionary of lists, containing points per race for each user.
+        """
+        return self.user_points().as_dict()
 
-    @cache.memoize(
-        timeout=None, args_to_ignore=["self"]
-    )  # Clear when adding/updating race results
     def driver_points_per_step(self, *, include_inactive: bool) -> Dict[str, List[int]]:
         """
         Returns a dictionary of lists, containing points per race for each driver.
         """
-        driver_points_per_step = dict()
-        for driver in self.all_drivers(
-                include_none=False, include_inactive=include_inactive
-        ):
-            driver_points_per_step[driver.name] = [0] * (
-                    len(self.all_races()) + 1
-            )  # Start at index 1, like the race numbers
-
-        for race_result in self.all_race_results():
-            race_number: int = race_result.race.number
-
-            for position, driver in race_result.standing.items():
-                driver_points_per_step[driver.name][race_number] = (
-                    DRIVER_RACE_POINTS[int(position)]
-                    if int(position) in DRIVER_RACE_POINTS
-                    else 0
-                )
-                driver_points_per_step[driver.name][race_number] += (
-                    DRIVER_FASTEST_LAP_POINTS
-                    if race_result.fastest_lap_driver == driver
-                    and int(position) <= 10
-                    else 0
-                )
-                driver_points_per_step[driver.name][race_number] -= substitute_points(driver, race_number)
-
-            for position, driver in race_result.sprint_standing.items():
-                driver_name: str = driver.name
-
-                driver_points_per_step[driver_name][race_number] += (
-                    DRIVER_SPRINT_POINTS[int(position)]
-                    if int(position) in DRIVER_SPRINT_POINTS
-                    else 0
-                )
-
-        return driver_points_per_step
-
-    @cache.cached(timeout=None, key_prefix="points_team_points_per_step")
+        return self.driver_points().as_dict(
+            [driver.name for driver in self.all_drivers(include_none=False, include_inactive=include_inactive)]
+        )
+
     def team_points_per_step(self) -> Dict[str, List[int]]:
         """
         Returns a dictionary of lists, containing points per race for each team.
         """
-        team_points_per_step = dict()
-        for team in self.all_teams(include_none=False):
-            team_points_per_step[team.name] = [0] * (
-                    len(self.all_races()) + 1
-            )  # Start at index 1, like the race numbers
+        return self.team_points().as_dict()
+
+    #
+    # Incremental updates
+    #
+
+    def update_race_points(self, race_name: str) -> None:
+        """
+        Updates the user, driver and team points of a new snapshot after the result of a single race was added/updated.
+        Only the column of this race and the cumulative sums following it are reread.
+        Matrices that weren't computed yet are skipped, they will be built from scratch when they're used.
+        """
+        race: Race = self.race_by(race_name=race_name)
+
+        user_points: PointsMatrix | None = snapshot_value("points_user_points")
+        if user_points is not None:
+            user_points.set_column(race.number, {name: points for name, _, points in stored_user_points(race_id=race.id)})
+
+        driver_points: PointsMatrix | None = snapshot_value("points_driver_points")
+        if driver_points is not None:
+            driver_points.set_column(race.number, {name: points for name, _, points in stored_driver_points(race_id=race.id)})
+
+        team_points: PointsMatrix | None = snapshot_value("points_team_points")
+        if team_points is not None:
+            team_points.set_column(race.number, {name: points for name, _, points in stored_team_points(race_id=race.id)})
+
+    def update_race_guess_points(self, race_name: str, user_name: str) -> None:
+        """
+        Updates the user points of a new snapshot after a single race guess was added/updated/deleted.
+        """
+        user_points: PointsMatrix | None = snapshot_value("points_user_points")
+        if user_points is None or user_name not in user_points.rows:
+            return
 
-        for race_result in self.all_race_results():
-            for driver in race_result.standing.values():
-                team_name: str = driver.team.name
-                race_number: int = race_result.race.number
+        race: Race = self.race_by(race_name=race_name)
+        user: User = self.user_by(user_name=user_name)
 
-                team_points_per_step[team_name][
-                    race_number
-                ] += self.driver_points_per_step(include_inactive=True)[driver.name][
-                    race_number
-                ]
+        user_points.set_cell(user_name, race.number, sum(
+            points for _, _, points in stored_user_points(race_id=race.id, user_id=user.id)
+        ))
+
+    def update_user_points(self, user_name: str) -> None:
+        """
+        Updates the user points of a new snapshot after a single user was added/enabled or disabled.
+        """
+        user_points: PointsMatrix | None = snapshot_value("points_user_points")
+        if user_points is None:
+            return
 
-        return team_points_per_step
+        if user_name not in self.users_by_name():
+            user_points.remove_row(user_name)
+            return
 
-    @cache.cached(timeout=None, key_prefix="points_dnfs")
+        points: List[int] = [0] * (len(self.all_races()) + 1)  # Start at index 1, like the race numbers
+        for _, race_number, race_points in stored_user_points(user_id=self.user_by(user_name=user_name).id):
+            points[race_number] = race_points
+
+        user_points.set_row(user_name, points)
+
+    @cached("points_dnfs", depends_on=[RACE_RESULTS, DRIVERS, TEAMS])
     def dnfs(self) -> Dict[str, int]:
         dnfs = dict()
 
         for driver in self.all_drivers(include_none=False, include_inactive=True):
-            dnfs[driver.name] = 0
-
-        for race_result in self.all_race_results():
-            for driver in race_result.all_dnfs:
-                dnfs[driver.name] += 1
-
-            for driver in race_result.sprint_dnfs:
-                dnfs[driver.name] += 1
+            dnfs[driver.name] = self.dnf_counts().get(driver.id, 0)
 
         return dnfs
 
@@ -275,20 +350,11 @@ class PointsModel(Model):
     # Driver stats
     #
 
-    @cache.cached(
-        timeout=None, key_prefix="points_driver_points_per_step_cumulative"
-    )  # Cleanup when adding/updating race results
     def driver_points_per_step_cumulative(self) -> Dict[str, List[int]]:
         """
         Returns a dictionary of lists, containing cumulative points per race for each driver.
         """
-        points_per_step_cumulative: Dict[str, List[int]] = dict()
-        for driver_name, points in self.driver_points_per_step(
-                include_inactive=True
-        ).items():
-            points_per_step_cumulative[driver_name] = np.cumsum(points).tolist()
-
-        return points_per_step_cumulative
+        return self.driver_points().cumulative_as_dict()
 
     @overload
     def driver_points_by(
@@ -325,9 +391,6 @@ class PointsModel(Model):
             include_inactive=include_inactive,
         )
 
-    @cache.memoize(
-        timeout=None, args_to_ignore=["self"]
-    )  # Cleanup when adding/updating race results
     def driver_points_by(
             self,
             *,
@@ -336,114 +399,56 @@ class PointsModel(Model):
             include_inactive: bool
     ) -> List[int] | Dict[str, int] | int:
         if driver_name is not None and race_name is None:
-            return self.driver_points_per_step(include_inactive=include_inactive)[
-                driver_name
-            ]
+            return self.driver_points().row(driver_name)
 
         if driver_name is None and race_name is not None:
             race_number: int = self.race_by(race_name=race_name).number
-            points_by_race: Dict[str, int] = dict()
-
-            for _driver_name, points in self.driver_points_per_step(
-                    include_inactive=include_inactive
-            ).items():
-                points_by_race[_driver_name] = points[race_number]
 
-            return points_by_race
+            return self.driver_points().column(
+                race_number,
+                [driver.name for driver in self.all_drivers(include_none=False, include_inactive=include_inactive)]
+            )
 
         if driver_name is not None and race_name is not None:
             race_number: int = self.race_by(race_name=race_name).number
 
-            return self.driver_points_per_step(include_inactive=include_inactive)[
-                driver_name
-            ][race_number]
+            return self.driver_points().cell(driver_name, race_number)
 
         raise Exception("driver_points_by received an illegal combination of arguments")
 
-    @cache.memoize(
-        timeout=None, args_to_ignore=["self"]
-    )  # Cleanup when adding/updating race results
     def total_driver_points_by(self, driver_name: str) -> int:
-        return sum(
-            self.driver_points_by(driver_name=driver_name, include_inactive=True)
-        )
+        return self.driver_points().total(driver_name)
 
-    @cache.memoize(
-        timeout=None, args_to_ignore=["self"]
-    )  # Cleanup when adding/updating race results
     def drivers_sorted_by_points(self, *, include_inactive: bool) -> List[Driver]:
-        comparator: Callable[[Driver], int] = (
-            lambda driver: self.total_driver_points_by(driver.name)
-        )
-        return sorted(
-            self.all_drivers(include_none=False, include_inactive=include_inactive),
-            key=comparator,
-            reverse=True,
-        )
+        drivers: List[Driver] = self.all_drivers(include_none=False, include_inactive=include_inactive)
+        totals: np.ndarray = self.driver_points().totals([driver.name for driver in drivers])
 
-    @cache.cached(
-        timeout=None, key_prefix="points_wdc_standing_by_position"
-    )  # Cleanup when adding/updating race results
-    def wdc_standing_by_position(self) -> Dict[int, List[str]]:
-        standing: Dict[int, List[str]] = dict()
+        return [drivers[index] for index in sort_order(totals)]
 
+    def wdc_standing_by_position(self) -> Dict[int, List[str]]:
         if WDC_STANDING_2024 is None:
-            for position in range(
-                    1, len(self.all_drivers(include_none=False, include_inactive=True)) + 1
-            ):
-                standing[position] = list()
-
-            position: int = 1
-            last_points: int = 0
+            drivers: List[Driver] = self.all_drivers(include_none=False, include_inactive=True)
+            names: List[str] = [driver.name for driver in drivers]
 
-            for driver in self.drivers_sorted_by_points(include_inactive=True):
-                points: int = self.total_driver_points_by(driver.name)
-                if points < last_points:
-                    # If multiple drivers have equal points, a place is shared.
-                    # In this case, the next driver does not occupy the immediate next position.
-                    position += len(standing[position])
+            return standing_by_position(names, self.driver_points().totals(names))
 
-                standing[position].append(driver.name)
-                last_points = points
-
-        if WDC_STANDING_2024 is not None:
-            for position in range(1, len(WDC_STANDING_2024) + 1):
-                standing[position] = list()
+        standing: Dict[int, List[str]] = dict()
+        for position in range(1, len(WDC_STANDING_2024) + 1):
+            standing[position] = list()
 
-            for driver, position in WDC_STANDING_2024.items():
-                standing[position] += [driver]
+        for driver, position in WDC_STANDING_2024.items():
+            standing[position] += [driver]
 
         return standing
 
-    @cache.cached(
-        timeout=None, key_prefix="points_wdc_standing_by_driver"
-    )  # Cleanup when adding/updating race results
     def wdc_standing_by_driver(self) -> Dict[str, int]:
-        standing: Dict[str, int] = dict()
-
         if WDC_STANDING_2024 is None:
-            position: int = 1
-            last_points: int = 0
-
-            for driver in self.drivers_sorted_by_points(include_inactive=True):
-                points: int = self.total_driver_points_by(driver.name)
-                if points < last_points:
-                    drivers_with_this_position = 0
-                    for _driver, _position in standing.items():
-                        if _position == position:
-                            drivers_with_this_position += 1
-
-                    # If multiple drivers have equal points, a place is shared.
-                    # In this case, the next driver does not occupy the immediate next position.
-                    position += drivers_with_this_position
-
-                standing[driver.name] = position
-                last_points = points
+            drivers: List[Driver] = self.all_drivers(include_none=False, include_inactive=True)
+            names: List[str] = [driver.name for driver in drivers]
 
-            return standing
+            return standing_by_name(names, self.driver_points().totals(names))
 
-        if WDC_STANDING_2024 is not None:
-            return WDC_STANDING_2024
+        return WDC_STANDING_2024
 
     def wdc_diff_2023_by(self, driver_name: str) -> int:
         if not driver_name in WDC_STANDING_2023:
@@ -453,9 +458,7 @@ class PointsModel(Model):
                 WDC_STANDING_2023[driver_name] - self.wdc_standing_by_driver()[driver_name]
         )
 
-    @cache.cached(
-        timeout=None, key_prefix="points_most_dnf_names"
-    )  # Cleanup when adding/updating race results
+    @cached("points_most_dnf_names", depends_on=[RACE_RESULTS, DRIVERS, TEAMS])
     def most_dnf_names(self) -> List[str]:
         dnf_names: List[str] = list()
         most_dnfs: int = 0
@@ -470,9 +473,7 @@ class PointsModel(Model):
 
         return dnf_names
 
-    @cache.cached(
-        timeout=None, key_prefix="points_most_gained_names"
-    )  # Cleanup when adding/updating race results
+    @cached("points_most_gained_names", depends_on=[RACE_RESULTS, DRIVERS, TEAMS])
     def most_gained_names(self) -> List[str]:
         most_gained_names: List[str] = list()
         most_gained: int = 0
@@ -491,9 +492,7 @@ class PointsModel(Model):
 
         return most_gained_names
 
-    @cache.cached(
-        timeout=None, key_prefix="points_most_lost_names"
-    )  # Cleanup when adding/updating race results
+    @cached("points_most_lost_names", depends_on=[RACE_RESULTS, DRIVERS, TEAMS])
     def most_lost_names(self) -> List[str]:
         most_lost_names: List[str] = list()
         most_lost: int = 100
@@ -516,89 +515,41 @@ class PointsModel(Model):
     # Team points
     #
 
-    @cache.cached(
-        timeout=None, key_prefix="points_team_points_per_step_cumulative"
-    )  # Cleanup when adding/updating race results
     def team_points_per_step_cumulative(self) -> Dict[str, List[int]]:
         """
         Returns a dictionary of lists, containing cumulative points per race for each team.
         """
-        points_per_step_cumulative: Dict[str, List[int]] = dict()
-        for team_name, points in self.team_points_per_step().items():
-            points_per_step_cumulative[team_name] = np.cumsum(points).tolist()
+        return self.team_points().cumulative_as_dict()
 
-        return points_per_step_cumulative
+    @cached("points_team_totals", depends_on=[RACE_RESULTS, RACES, DRIVERS, TEAMS])
+    def team_totals(self) -> np.ndarray:
+        """
+        Returns the total points for each team, in the order of all_teams.
+        """
+        return np.array([
+            self.total_team_points_by(team.name) for team in self.all_teams(include_none=False)
+        ], dtype=np.int64)
 
-    @cache.memoize(
-        timeout=None, args_to_ignore=["self"]
-    )  # Cleanup when adding/updating race results
     def total_team_points_by(self, team_name: str) -> int:
         teammates: List[Driver] = self.drivers_by(
             team_name=team_name, include_inactive=True
         )
-        return sum(
-            sum(self.driver_points_by(driver_name=teammate.name, include_inactive=True))
-            for teammate in teammates
-        )
+        return int(self.driver_points().totals([teammate.name for teammate in teammates]).sum())
 
-    @cache.cached(
-        timeout=None, key_prefix="points_teams_sorted_by_points"
-    )  # Cleanup when adding/updating race results
     def teams_sorted_by_points(self) -> List[Team]:
-        comparator: Callable[[Team], int] = lambda team: self.total_team_points_by(
-            team.name
-        )
-        return sorted(self.all_teams(include_none=False), key=comparator, reverse=True)
-
-    @cache.cached(
-        timeout=None, key_prefix="points_wcc_standing_by_position"
-    )  # Cleanup when adding/updating race results
-    def wcc_standing_by_position(self) -> Dict[int, List[str]]:
-        standing: Dict[int, List[str]] = dict()
+        teams: List[Team] = self.all_teams(include_none=False)
 
-        for position in range(1, len(self.all_teams(include_none=False)) + 1):
-            standing[position] = list()
-
-        position: int = 1
-        last_points: int = 0
+        return [teams[index] for index in sort_order(self.team_totals())]
 
-        for team in self.teams_sorted_by_points():
-            points: int = self.total_team_points_by(team.name)
-            if points < last_points:
-                # If multiple teams have equal points, a place is shared.
-                # In this case, the next team does not occupy the immediate next position.
-                position += len(standing[position])
+    def wcc_standing_by_position(self) -> Dict[int, List[str]]:
+        teams: List[Team] = self.all_teams(include_none=False)
 
-            standing[position].append(team.name)
-            last_points = points
+        return standing_by_position([team.name for team in teams], self.team_totals())
 
-        return standing
-
-    @cache.cached(
-        timeout=None, key_prefix="points_wcc_standing_by_team"
-    )  # Cleanup when adding/updating race results
     def wcc_standing_by_team(self) -> Dict[str, int]:
-        standing: Dict[str, int] = dict()
-
-        position: int = 1
-        last_points: int = 0
-
-        for team in self.teams_sorted_by_points():
-            points: int = self.total_team_points_by(team.name)
-            if points < last_points:
-                teams_with_this_position = 0
-                for _team, _position in standing.items():
-                    if _position == position:
-                        teams_with_this_position += 1
+        teams: List[Team] = self.all_teams(include_none=False)
 
-                # If multiple teams have equal points, a place is shared.
-                # In this case, the next team does not occupy the immediate next position.
-                position += teams_with_this_position
-
-            standing[team.name] = position
-            last_points = points
-
-        return standing
+        return standing_by_name([team.name for team in teams], self.team_totals())
 
     def wcc_diff_2023_by(self, team_name: str) -> int:
         return WCC_STANDING_2023[team_name] - self.wcc_standing_by_team()[team_name]
@@ -611,11 +562,7 @@ class PointsModel(Model):
         """
         Returns a dictionary of lists, containing cumulative points per race for each user.
         """
-        points_per_step_cumulative: Dict[str, List[int]] = dict()
-        for user_name, points in self.points_per_step().items():
-            points_per_step_cumulative[user_name] = np.cumsum(points).tolist()
-
-        return points_per_step_cumulative
+        return self.user_points().cumulative_as_dict()
 
     @overload
     def points_by(self, *, user_name: str) -> List[int]:
@@ -638,28 +585,21 @@ class PointsModel(Model):
         """
         return self.points_by(user_name=user_name, race_name=race_name)
 
-    @cache.memoize(
-        timeout=None, args_to_ignore=["self"]
-    )  # Cleanup when adding/updating race results or users
     def points_by(
             self, *, user_name: str | None = None, race_name: str | None = None
     ) -> List[int] | Dict[str, int] | int:
         if user_name is not None and race_name is None:
-            return self.points_per_step()[user_name]
+            return self.user_points().row(user_name)
 
         if user_name is None and race_name is not None:
             race_number: int = self.race_by(race_name=race_name).number
-            points_by_race: Dict[str, int] = dict()
 
-            for _user_name, points in self.points_per_step().items():
-                points_by_race[_user_name] = points[race_number]
-
-            return points_by_race
+            return self.user_points().column(race_number)
 
         if user_name is not None and race_name is not None:
             race_number: int = self.race_by(race_name=race_name).number
 
-            return self.points_per_step()[user_name][race_number]
+            return self.user_points().cell(user_name, race_number)
 
         raise Exception("points_by received an illegal combination of arguments")
 
@@ -675,21 +615,24 @@ class PointsModel(Model):
                      + int(self.most_lost_correct(user_name=user_name)) * 10)
 
         small_picks = 0
-        guess: SeasonGuess = self.season_guesses_by(user_name=user_name)
+        guess: SeasonGuess | None = self.season_guesses_by(user_name=user_name)
+        if guess is None:
+            return big_picks
 
         for driver in guess.team_winners:
-            if self.is_team_winner(driver):
+            if driver in self.team_winners():
                 small_picks += 3
             else:
                 small_picks -= 3
 
         # NOTE: Not picked drivers that had a podium are also wrong
+        podium_driver_ids: Set[int] = self.podium_driver_ids()
         for driver in self.all_drivers(include_none=False, include_inactive=True):
-            if driver in guess.podiums and self.has_podium(driver):
+            if driver in guess.podiums and driver.id in podium_driver_ids:
                 small_picks += 3
-            elif driver in guess.podiums and not self.has_podium(driver):
+            elif driver in guess.podiums and driver.id not in podium_driver_ids:
                 small_picks -=2
-            elif driver not in guess.podiums and self.has_podium(driver):
+            elif driver not in guess.podiums and driver.id in podium_driver_ids:
                 small_picks -=2
 
         return big_picks + small_picks
@@ -699,50 +642,40 @@ class PointsModel(Model):
         Returns the total number of points for a specific user.
         """
         if include_season:
-            return sum(self.points_by(user_name=user_name)) + self.season_points_by(user_name=user_name)
+            return self.user_points().total(user_name) + self.season_points_by(user_name=user_name)
         else:
-            return sum(self.points_by(user_name=user_name))
+            return self.user_points().total(user_name)
 
-    def users_sorted_by_points(self, *, include_season: bool) -> List[User]:
+    @memoized(depends_on=[RACE_RESULTS, RACE_GUESSES, SEASON_GUESSES, SEASON_GUESS_RESULTS, USERS, RACES, DRIVERS, TEAMS])
+    def user_totals(self, *, include_season: bool) -> np.ndarray:
         """
-        Returns the list of users, sorted by their points from race guesses (in descending order).
+        Returns the total number of points for each user, in the order of all_users.
         """
-        comparator: Callable[[User], int] = lambda user: self.total_points_by(user_name=user.name, include_season=include_season)
-        return sorted(self.all_users(), key=comparator, reverse=True)
+        users: List[User] = self.all_users()
+        totals: np.ndarray = self.user_points().totals([user.name for user in users])
 
-    @cache.cached(
-        timeout=None, key_prefix="points_user_standing"
-    )  # Cleanup when adding/updating race results or users
-    def user_standing(self, *, include_season: bool) -> Dict[str, int]:
-        standing: Dict[str, int] = dict()
-
-        position: int = 1
-        last_points: int = 0
-
-        for user in self.users_sorted_by_points(include_season=include_season):
-            if self.total_points_by(user_name=user.name, include_season=include_season) < last_points:
-                users_with_this_position = 0
-                for _user, _position in standing.items():
-                    if _position == position:
-                        users_with_this_position += 1
+        if include_season:
+            totals = totals + np.array([self.season_points_by(user_name=user.name) for user in users], dtype=np.int64)
 
-                # If multiple users have equal points, a place is shared.
-                # In this case, the next user does not occupy the immediate next position.
-                position += users_with_this_position
+        return totals
 
-            standing[user.name] = position
+    def users_sorted_by_points(self, *, include_season: bool) -> List[User]:
+        """
+        Returns the list of users, sorted by their points from race guesses (in descending order).
+        """
+        users: List[User] = self.all_users()
 
-            last_points = self.total_points_by(user_name=user.name, include_season=include_season)
+        return [users[index] for index in sort_order(self.user_totals(include_season=include_season))]
 
-        return standing
+    @memoized(depends_on=[RACE_RESULTS, RACE_GUESSES, SEASON_GUESSES, SEASON_GUESS_RESULTS, USERS, RACES, DRIVERS, TEAMS])
+    def user_standing(self, *, include_season: bool) -> Dict[str, int]:
+        return standing_by_name([user.name for user in self.all_users()], self.user_totals(include_season=include_season))
 
     def picks_count(self, user_name: str) -> int:
         # Treat standing + dnf picks separately
         return len(self.race_guesses_by(user_name=user_name)) * 2
 
-    @cache.memoize(
-        timeout=None, args_to_ignore=["self"]
-    )  # Cleanup when adding/updating race results
+    @memoized(depends_on=[RACE_GUESSES, RACE_RESULTS, USERS, RACES, DRIVERS, TEAMS])
     def picks_with_points_count(self, user_name: str) -> int:
         count: int = 0
 
@@ -824,9 +757,17 @@ class PointsModel(Model):
 
         return season_guess.most_wdc_lost.name in self.most_lost_names()
 
-    @cache.memoize(
-        timeout=None, args_to_ignore=["self"]
-    )  # Cleanup when adding/updating race results
+    @cached("points_team_winners", depends_on=[RACE_RESULTS, DRIVERS, TEAMS])
+    def team_winners(self) -> Set[Driver]:
+        """
+        Returns the set of drivers that won against their teammates.
+        """
+        return {
+            driver for driver in self.all_drivers(include_none=False, include_inactive=True)
+            if self.is_team_winner(driver)
+        }
+
+    @memoized(depends_on=[RACE_RESULTS, DRIVERS, TEAMS])
     def is_team_winner(self, driver: Driver) -> bool:
         teammates: List[Driver] = self.drivers_by(
             team_name=driver.team.name, include_inactive=True
@@ -837,16 +778,9 @@ class PointsModel(Model):
 
         return driver == winner
 
-    @cache.memoize(
-        timeout=None, args_to_ignore=["self"]
-    )  # Cleanup when adding/updating race results
+    @memoized(depends_on=[RACE_RESULTS])
     def has_podium(self, driver: Driver) -> bool:
-        for race_result in self.all_race_results():
-            position: int | None = race_result.driver_standing_position(driver)
-            if position is not None and position <= 3:
-                return True
-
-        return False
+        return driver.id in self.podium_driver_ids()
 
     #
     # Diagram queries
@@ -861,7 +795,7 @@ class PointsModel(Model):
 
         data["datasets"] = [
             {
-                "data": self.points_per_step_cumulative()[user.name], # + [self.total_points_by(user_name=user.name, include_season=True)],
+                "data": self.user_points().cumulative_row(user.name), # + [self.total_points_by(user_name=user.name, include_season=True)],
                 "label": user.name,
                 "fill": False,
             }
@@ -879,7 +813,7 @@ class PointsModel(Model):
 
         data["datasets"] = [
             {
-                "data": self.driver_points_per_step_cumulative()[driver.name],
+                "data": self.driver_points().cumulative_row(driver.name),
                 "label": driver.abbr,
                 "fill": False,
             }
@@ -897,7 +831,7 @@ class PointsModel(Model):
 
         data["datasets"] = [
             {
-                "data": self.team_points_per_step_cumulative()[team.name],
+                "data": self.team_points().cumulative_row(team.name),
                 "label": team.name,
                 "fill": False,
             }
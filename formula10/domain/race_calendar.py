@@ -0,0 +1,50 @@
+from bisect import bisect_left
+from datetime import datetime
+from typing import Dict, List
+
+from formula10.domain.model.race import Race
+
+
+class RaceCalendar:
+    """
+    The races of the season, sorted by date. Date based checks (deadlines, current race) are answered by bisecting,
+    so they don't need to query the database.
+    """
+
+    def __init__(self, races: List[Race]):
+        self.races: List[Race] = sorted(races, key=lambda race: (race.date, race.number))
+        self.dates: List[datetime] = [race.date for race in self.races]
+        self.races_by_number: List[Race] = sorted(races, key=lambda race: race.number)
+        self.dates_by_id: Dict[int, datetime] = {race.id: race.date for race in races}
+
+    def started_count(self, now: datetime | None = None) -> int:
+        """
+        Returns the number of races that have already started.
+        """
+        return bisect_left(self.dates, now if now is not None else datetime.now())
+
+    def has_started(self, *, race_id: int, now: datetime | None = None) -> bool:
+        date: datetime | None = self.dates_by_id.get(race_id)
+        if date is None:
+            raise Exception(f"Couldn't obtain race with id {race_id} to check date")
+
+        return (now if now is not None else datetime.now()) > date
+
+    def current_race(self, now: datetime | None = None) -> Race | None:
+        """
+        Returns the race that started most recently, or None, if the season hasn't started yet.
+        """
+        started_count: int = self.started_count(now)
+
+        return self.races[started_count - 1] if started_count > 0 else None
+
+    def next_race(self, now: datetime | None = None) -> Race | None:
+        """
+        Returns the next race to start (its date is the next guess deadline), or None, if the season is over.
+        """
+        started_count: int = self.started_count(now)
+
+        return self.races[started_count] if started_count < len(self.races) else None
+
+    def first_race(self) -> Race | None:
+        return self.races_by_number[0] if len(self.races_by_number) > 0 else None
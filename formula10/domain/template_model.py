@@ -1,12 +1,13 @@
 from typing import List, Callable
-from formula10 import ENABLE_TIMING, cache
+from formula10 import ENABLE_TIMING
 
+from formula10.domain.cache_dependencies import RACE_RESULTS, RACES, cached
 from formula10.domain.domain_model import Model
 from formula10.domain.model.driver import Driver
 from formula10.domain.model.race import Race
 from formula10.domain.model.race_result import RaceResult
 from formula10.domain.model.user import User
-from formula10.database.validation import find_first_else_none, find_multiple_strict, find_single_strict, race_has_started
+from formula10.database.validation import find_multiple_strict
 
 
 class TemplateModel(Model):
@@ -29,18 +30,15 @@ class TemplateModel(Model):
         if active_result_race_name is not None:
             self.active_result = self.race_result_by(race_name=active_result_race_name)
 
-    @staticmethod
-    def race_guess_open(race: Race) -> bool:
-        return not race_has_started(race=race) if ENABLE_TIMING else True
+    def race_guess_open(self, race: Race) -> bool:
+        return not self.race_calendar().has_started(race_id=race.id) if ENABLE_TIMING else True
 
-    @staticmethod
-    def season_guess_open() -> bool:
-        return not race_has_started(race_id=1) if ENABLE_TIMING else True
+    def season_guess_open(self) -> bool:
+        return not self.race_calendar().has_started(race_id=1) if ENABLE_TIMING else True
 
     def race_result_open(self, race_name: str) -> bool:
-        predicate: Callable[[Race], bool] = lambda race: race.name == race_name
-        race: Race = find_single_strict(predicate, self.all_races())
-        return race_has_started(race_id=race.id) if ENABLE_TIMING else True
+        race: Race = self.race_by(race_name=race_name)
+        return self.race_calendar().has_started(race_id=race.id) if ENABLE_TIMING else True
 
     def active_user_name_or_everyone(self) -> str:
         return self.active_user.name if self.active_user is not None else "Everyone"
@@ -54,19 +52,17 @@ class TemplateModel(Model):
 
         return self.all_users()
 
-    @cache.cached(timeout=None, key_prefix="template_first_race_without_result") # Cleanup when adding/updating race results
+    @cached("template_first_race_without_result", depends_on=[RACE_RESULTS, RACES])
     def first_race_without_result(self) -> Race | None:
         """
         Returns the first race-object with no associated race result.
         """
         results: List[RaceResult] = self.all_race_results()
         if len(results) == 0:
-            return self.all_races()[-1]  # all_races is sorted descending by number
+            return self.race_calendar().first_race()
 
         most_recent_result: RaceResult = results[0]
-        predicate: Callable[[Race], bool] = lambda race: race.number == most_recent_result.race.number + 1
-
-        return find_first_else_none(predicate, self.all_races())
+        return self.race_by(race_number=most_recent_result.race.number + 1)
 
     @property
     def current_race(self) -> Race | None:
@@ -1,9 +1,12 @@
 # https://docs.fastf1.dev/events.html#event-formats
-from typing import Optional
-
-from fastf1.core import Lap, DriverResult, Session
-from fastf1.events import Event
-from pandas import Timestamp, Timedelta
+from __future__ import annotations
+from typing import TYPE_CHECKING, Optional
+
+# NOTE: The types are only used in annotations, so importing the helpers doesn't load fastf1 and pandas
+if TYPE_CHECKING:
+    from fastf1.core import Lap, DriverResult, Session
+    from fastf1.events import Event
+    from pandas import Timestamp, Timedelta
 
 FASTF1_SESSIONTYPE_NORMAL: str = "conventional"
 FASTF1_SESSIONTYPE_SPRINT: str = "sprint_qualifying"
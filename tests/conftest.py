@@ -0,0 +1,38 @@
+import os
+import shutil
+import tempfile
+from typing import Iterator
+import pytest
+
+# The database is chosen when formula10 is imported, so the environment is set up before the first import
+_directory: str = tempfile.mkdtemp(prefix="formula10-tests-")
+os.environ["DATABASE_URI"] = f"sqlite:///{os.path.join(_directory, 'formula10.db')}"
+os.environ["DISABLE_STATIC_FINGERPRINTS"] = "True"
+
+from formula10.database.synthetic_data import LeagueSettings, generate_league  # noqa: E402
+from formula10.domain.domain_snapshot import discard_snapshot  # noqa: E402
+from formula10 import app, db  # noqa: E402
+
+
+@pytest.fixture(scope="session", autouse=True)
+def league() -> Iterator[None]:
+    """
+    Seeds the temporary database with a small synthetic league: half of the races started, all of them except the last one have a result.
+    """
+    with app.app_context():
+        db.create_all()
+        generate_league(LeagueSettings(users=20, races=8, started_races=4, teams=10, reserve_drivers=2, guess_rate=0.9, seed=1))
+
+    yield
+
+    shutil.rmtree(_directory, ignore_errors=True)
+
+
+@pytest.fixture(autouse=True)
+def fresh_snapshot() -> Iterator[None]:
+    """
+    Every test starts on a domain snapshot built from the database, so cached values of earlier tests don't leak into it.
+    """
+    discard_snapshot()
+    yield
+    discard_snapshot()
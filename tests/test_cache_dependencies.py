@@ -0,0 +1,56 @@
+from typing import Any, Callable, List, Tuple
+import pytest
+
+from formula10.domain.cache_dependencies import ENTITIES, _dependencies, _value_dependencies
+from formula10.domain.domain_model import Model
+from formula10.domain.domain_snapshot import CacheDependency, pinned_snapshot
+from formula10.domain.points_model import PointsModel
+from formula10.domain.template_model import TemplateModel
+from formula10 import app
+
+# Pages that store cached values (rendered pages, fragments and chart data) in the snapshot
+PAGES: List[str] = ["/race/Everyone", "/race/User1", "/season/Everyone", "/graphs", "/stats", "/result/Current", "/user"]
+
+
+def cached_members() -> List[Tuple[str, Callable]]:
+    """
+    Returns the @cached/@memoized methods of the models, they are the members wrapping another function.
+    """
+    members: List[Tuple[str, Callable]] = list()
+    for cls in (Model, PointsModel, TemplateModel):
+        for name, attribute in vars(cls).items():
+            function: Any = attribute.__func__ if isinstance(attribute, (staticmethod, classmethod)) else attribute
+            if hasattr(function, "__wrapped__"):
+                members.append((f"{cls.__name__}.{name}", function))
+
+    return members
+
+
+def assert_declared(name: str, dependency: CacheDependency) -> None:
+    assert len(dependency.entities) > 0, f"{name} doesn't declare the entities it depends on"
+    assert set(dependency.entities) <= set(ENTITIES), f"{name} depends on unknown entities {dependency.entities}"
+
+
+def test_models_have_cached_members() -> None:
+    assert len(cached_members()) > 0
+
+
+@pytest.mark.parametrize("name, function", cached_members())
+def test_cached_member_declares_dependencies(name: str, function: Callable) -> None:
+    assert function in _dependencies, f"{name} is cached without being registered in cache_dependencies"
+    assert_declared(name, _dependencies[function])
+
+
+def test_snapshot_values_declare_dependencies() -> None:
+    client = app.test_client()
+    for page in PAGES:
+        assert client.get(page).status_code == 200, page
+
+    registered: List[CacheDependency] = list(_dependencies.values()) + list(_value_dependencies.values())
+    with app.test_request_context():
+        values = pinned_snapshot().values
+
+    assert len(values) > 0
+    for key, (dependency, _) in values.items():
+        assert dependency in registered, f"{key} was stored with an unregistered dependency"
+        assert_declared(str(key), dependency)
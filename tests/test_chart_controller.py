@@ -0,0 +1,38 @@
+from typing import Dict
+
+from formula10.controller.chart_controller import CHARTS, chart_data_version
+from formula10.domain.cache_dependencies import SEASON_GUESSES, invalidate
+from formula10.domain.domain_snapshot import commit_writes, discard_snapshot
+from formula10 import app
+
+
+def chart_versions() -> Dict[str, str]:
+    with app.test_request_context():
+        return {chart: chart_data_version(chart) for chart in CHARTS}
+
+
+def test_chart_versions_survive_unrelated_writes_and_restarts() -> None:
+    versions: Dict[str, str] = chart_versions()
+
+    # None of the charts depends on the season guesses
+    with app.test_request_context(method="POST"):
+        invalidate(SEASON_GUESSES)
+        commit_writes()
+    assert chart_versions() == versions
+
+    # Like a restart or another worker, the versions only depend on the content
+    discard_snapshot()
+    assert chart_versions() == versions
+
+
+def test_chart_urls() -> None:
+    client = app.test_client()
+
+    for chart, version in chart_versions().items():
+        response = client.get(f"/chart/{version}/{chart}.json")
+        assert response.status_code == 200
+        assert "immutable" in response.headers["Cache-Control"]
+
+        outdated = client.get(f"/chart/outdated/{chart}.json")
+        assert outdated.status_code == 302
+        assert outdated.location == f"/chart/{version}/{chart}.json"
@@ -0,0 +1,39 @@
+from typing import Dict, Set
+import pytest
+
+from formula10.database.query_stats import recorded_queries
+from formula10.domain.domain_model import Model
+from formula10.domain.domain_snapshot import pinned_snapshot
+from formula10 import app
+
+# The number of queries each loader issues, independent of the number of rows
+LOADER_QUERIES: Dict[str, int] = {
+    "registry": 2,  # Teams, drivers
+    "all_users": 1,
+    "all_race_results": 2,  # Results joined with their races, the standings of all results
+    "all_race_guesses": 2,  # Guesses joined with their users, the distinct races
+    "all_season_guesses": 1,
+    "all_season_guess_results": 1,
+    "all_races": 1,
+}
+
+
+@pytest.mark.parametrize("loader, queries", LOADER_QUERIES.items())
+def test_loader_queries(loader: str, queries: int) -> None:
+    with app.test_request_context():
+        # Builds the snapshot, so the loaders find the registry they resolve ids with
+        pinned_snapshot()
+
+        with recorded_queries() as stats:
+            # Calls the loader itself, not the value cached in the snapshot
+            result = getattr(Model, loader).__wrapped__()
+
+    assert stats.count == queries, stats.summary()
+    assert result is not None
+
+
+def test_loaders_cover_every_preloaded_method() -> None:
+    preloaded: Set[str] = {name for name in vars(Model) if name == "registry" or name.startswith("all_")}
+    preloaded -= {"all_drivers", "all_teams"}  # Resolved from the registry, they don't query
+
+    assert preloaded == set(LOADER_QUERIES)
@@ -0,0 +1,118 @@
+import threading
+from typing import List
+
+from flask import g
+import pytest
+
+from formula10.domain.cache_dependencies import RACE_GUESSES, cached_value, invalidate
+from formula10.database.cache_broadcast_queries import latest_broadcast_id
+from formula10.domain.domain_snapshot import commit_writes, current_snapshot, discard_snapshot
+from formula10 import app, db
+
+READER_THREADS: int = 4
+WRITES: int = 20
+
+
+def store_values_while_writing() -> List[BaseException]:
+    """
+    Stores new values from reader threads (like concurrent GET requests) while the main thread invalidates (like a POST request).
+    Returns the errors raised by either side.
+    """
+    errors: List[BaseException] = list()
+    stop: threading.Event = threading.Event()
+
+    def reader(number: int) -> None:
+        try:
+            index: int = 0
+            while not stop.is_set():
+                with app.test_request_context():
+                    g.domain_snapshot = current_snapshot()
+                    for _ in range(1000):
+                        cached_value(("test", number, index), lambda: index, depends_on=[RACE_GUESSES])
+                        index += 1
+        except BaseException as error:
+            errors.append(error)
+
+    threads: List[threading.Thread] = [threading.Thread(target=reader, args=(number,)) for number in range(READER_THREADS)]
+    for thread in threads:
+        thread.start()
+
+    try:
+        for _ in range(WRITES):
+            # Writes are made by POST requests, GET requests use the read-only connection
+            with app.test_request_context(method="POST"):
+                invalidate(RACE_GUESSES)
+                commit_writes()
+    except BaseException as error:
+        errors.append(error)
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+    return errors
+
+
+def snapshot_version() -> int:
+    with app.test_request_context():
+        return current_snapshot().version
+
+
+@pytest.mark.parametrize("shared_cache", [False, True], ids=["local", "shared"])
+def test_invalidate_while_requests_store_values(shared_cache: bool, monkeypatch: pytest.MonkeyPatch) -> None:
+    # With a shared cache, the write is broadcast and applied by apply_broadcasts, it derives the next snapshot as well
+    monkeypatch.setattr("formula10.domain.domain_snapshot.ENABLE_SHARED_CACHE", shared_cache)
+    discard_snapshot()
+
+    version: int = snapshot_version()
+
+    assert store_values_while_writing() == []
+    assert snapshot_version() == version + WRITES
+
+
+def latest_broadcast() -> int:
+    with app.app_context():
+        return latest_broadcast_id()
+
+
+@pytest.mark.parametrize("shared_cache", [False, True], ids=["local", "shared"])
+def test_rolled_back_write_isnt_applied(shared_cache: bool, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("formula10.domain.domain_snapshot.ENABLE_SHARED_CACHE", shared_cache)
+    discard_snapshot()
+    version: int = snapshot_version()
+    broadcast: int = latest_broadcast()
+
+    with app.test_request_context(method="POST"):
+        invalidate(RACE_GUESSES)
+        db.session.rollback()
+        commit_writes()
+
+    assert snapshot_version() == version
+    assert latest_broadcast() == broadcast
+
+
+@pytest.mark.parametrize("shared_cache", [False, True], ids=["local", "shared"])
+def test_rejected_post_isnt_applied(shared_cache: bool, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("formula10.domain.domain_snapshot.ENABLE_SHARED_CACHE", shared_cache)
+    discard_snapshot()
+    version: int = snapshot_version()
+    broadcast: int = latest_broadcast()
+
+    # The picks are missing, update_race_guess rejects the write
+    response = app.test_client().post("/race-guess/Race%201/User1", data=dict())
+
+    assert response.status_code == 302 and response.location == "/error"
+    assert snapshot_version() == version
+    assert latest_broadcast() == broadcast
+
+
+def test_committed_write_is_broadcast(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("formula10.domain.domain_snapshot.ENABLE_SHARED_CACHE", True)
+    discard_snapshot()
+    broadcast: int = latest_broadcast()
+
+    with app.test_request_context(method="POST"):
+        invalidate(RACE_GUESSES)
+        commit_writes()
+
+    assert latest_broadcast() == broadcast + 1
@@ -0,0 +1,56 @@
+import pickle
+
+from formula10.database.model.db_driver import DbDriver
+from formula10.database.model.db_team import DbTeam
+from formula10.database.model.db_user import DbUser
+from formula10.domain.model.driver import Driver
+from formula10.domain.model.team import Team
+from formula10.domain.model.user import User
+
+
+def db_user(name: str, enabled: bool = True) -> DbUser:
+    user: DbUser = DbUser(id=1000)
+    user.name = name
+    user.enabled = enabled
+    return user
+
+
+def test_unchanged_entity_reuses_the_canonical_instance() -> None:
+    assert User.from_db_user(db_user("Interned")) is User.from_db_user(db_user("Interned"))
+
+
+def test_changed_entity_doesnt_change_older_instances() -> None:
+    before: User = User.from_db_user(db_user("Interned"))
+    after: User = User.from_db_user(db_user("Interned", enabled=False))
+
+    assert after is not before
+    assert before.enabled and not after.enabled
+    assert before == after and hash(before) == hash(after)
+    assert User.from_db_user(db_user("Interned", enabled=False)) is after
+
+
+def test_changed_team_replaces_its_drivers() -> None:
+    driver: DbDriver = DbDriver(id=1000)
+    driver.name = "Interned"
+    driver.abbr = "INT"
+    driver.country_code = "NO"
+    driver.active = True
+    team: DbTeam = DbTeam(id=1000)
+    team.name = "Before"
+    before: Driver = Driver.from_db_driver(driver, Team.from_db_team(team))
+
+    team.name = "After"
+    after: Driver = Driver.from_db_driver(driver, Team.from_db_team(team))
+
+    assert after is not before
+    assert (before.team.name, after.team.name) == ("Before", "After")
+
+
+def test_unpickling_resolves_to_the_canonical_instance() -> None:
+    user: User = User.from_db_user(db_user("Pickled"))
+    stale: bytes = pickle.dumps(user)
+    changed: User = User.from_db_user(db_user("Renamed"))
+
+    assert pickle.loads(pickle.dumps(changed)) is changed
+    assert pickle.loads(stale).name == "Pickled"
+    assert User.from_db_user(db_user("Renamed")) is changed
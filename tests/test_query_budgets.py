@@ -0,0 +1,32 @@
+import logging
+import pytest
+
+from formula10.database.query_stats import QUERY_BUDGETS, assert_query_budgets, recorded_queries
+from formula10.domain.domain_snapshot import discard_snapshot
+from formula10 import app
+
+
+def test_pages_stay_within_query_budgets() -> None:
+    # Every page is rendered on a freshly built snapshot, the budgets include building it
+    assert_query_budgets(app.test_client(), QUERY_BUDGETS, discard_snapshot)
+
+
+def test_warm_pages_dont_query() -> None:
+    client = app.test_client()
+    for url in QUERY_BUDGETS:
+        client.get(url)
+
+    for url in QUERY_BUDGETS:
+        with recorded_queries() as stats:
+            client.get(url)
+
+        assert stats.count == 0, f"GET {url} queried on a warm snapshot: {stats.summary()}"
+
+
+def test_query_counts_are_logged(caplog: pytest.LogCaptureFixture) -> None:
+    discard_snapshot()
+    app.test_client().get("/rules")
+
+    # Emitted without debug mode, at the default QUERY_LOG_LEVEL
+    assert app.logger.isEnabledFor(logging.INFO)
+    assert any(record.levelno == logging.INFO and record.getMessage().startswith("GET /rules: ") for record in caplog.records)
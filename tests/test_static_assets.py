@@ -0,0 +1,38 @@
+import os
+from typing import Iterator
+import pytest
+from flask import url_for
+
+from formula10.controller.static_controller import build_static_assets, load_static_assets
+from formula10 import app
+
+
+@pytest.fixture(autouse=True)
+def unregistered_assets(tmp_path) -> Iterator[None]:
+    """
+    The tests run without fingerprints, the registered assets are dropped again afterwards.
+    """
+    yield
+    load_static_assets(str(tmp_path / "empty"))
+
+
+def test_loading_doesnt_write_the_build(tmp_path) -> None:
+    build_directory: str = str(tmp_path / "static")
+
+    assert load_static_assets(build_directory) == 0
+    assert not os.path.exists(build_directory)
+
+
+def test_built_assets_are_served_fingerprinted(tmp_path) -> None:
+    build_directory: str = str(tmp_path / "static")
+    build_static_assets(build_directory)
+
+    assert load_static_assets(build_directory) > 0
+    with app.test_request_context():
+        url: str = url_for("static", filename="style/grid.css")
+
+    assert url != "/static/style/grid.css"
+    response = app.test_client().get(url, headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.content_encoding == "gzip"
+    assert response.cache_control.immutable
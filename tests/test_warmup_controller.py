@@ -0,0 +1,15 @@
+import click
+
+from formula10.controller.warmup_controller import serves_requests
+
+
+def test_only_servers_warm_up() -> None:
+    # A WSGI server imports the app without a click context
+    assert serves_requests()
+
+    with click.Context(click.Command("run")):
+        assert serves_requests()
+
+    for command in ["build-static", "generate-data", "routes"]:
+        with click.Context(click.Command(command)):
+            assert not serves_requests(), command